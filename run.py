@@ -13,16 +13,20 @@ from typing import TextIO, TypeVar
 import uvicorn
 from pydantic import TypeAdapter
 
+from voicevox_engine.admission_scheduler import AdmissionScheduler
 from voicevox_engine.app.application import generate_app
 from voicevox_engine.cancellable_engine import CancellableEngine
 from voicevox_engine.core.core_initializer import initialize_cores
 from voicevox_engine.engine_manifest import load_manifest
 from voicevox_engine.library.library_manager import LibraryManager
+from voicevox_engine.metrics import MetricsRegistry, enable_metrics, flatten_stats
 from voicevox_engine.preset.preset_manager import PresetManager
+from voicevox_engine.request_profiler import RequestProfiler
 from voicevox_engine.setting.model import CorsPolicyMode
 from voicevox_engine.setting.setting_manager import USER_SETTING_PATH, SettingHandler
 from voicevox_engine.tts_pipeline.song_engine import make_song_engines_from_cores
 from voicevox_engine.tts_pipeline.tts_engine import make_tts_engines_from_cores
+from voicevox_engine.tts_pipeline.wave_cache import WaveCache
 from voicevox_engine.user_dict.user_dict_manager import UserDictionary
 from voicevox_engine.utility.path_utility import (
     engine_manifest_path,
@@ -36,6 +40,8 @@ from voicevox_engine.utility.path_utility import (
 _DEFAULT_HOST = "localhost"
 _DEFAULT_PORT = 50021
 
+_MIB = 1024 * 1024
+
 
 def decide_boolean_from_env(env_name: str) -> bool:
     """
@@ -179,6 +185,10 @@ class _CLIArgs:
     enable_mock: bool
     enable_cancellable_synthesis: bool
     init_processes: int
+    max_processes: int | None
+    process_idle_timeout: float
+    standby_processes: int
+    cancellable_shared_memory_size: int
     load_all_models: bool
     cpu_num_threads: int | None
     output_log_utf8: bool
@@ -187,6 +197,20 @@ class _CLIArgs:
     setting_file: Path
     preset_file: Path | None
     disable_mutable_api: bool
+    wave_cache_size: int
+    wave_cache_dir: Path | None
+    wave_cache_disk_size: int
+    core_batch_window: float
+    core_max_batch_size: int
+    multi_synthesis_workers: int
+    max_concurrent_synthesis: int | None
+    model_memory_budget: int | None
+    core_instances: int
+    lazy_core_loading: bool
+    enable_metrics: bool
+    request_trace_log: Path | None
+    enable_server_timing: bool
+    profile_sample_rate: float
 
 
 _cli_args_adapter = TypeAdapter(_CLIArgs)
@@ -249,11 +273,81 @@ def read_cli_arguments(envs: Envs) -> _CLIArgs:
         default=2,
         help="cancellable_synthesis機能の初期化時に生成するプロセス数です。",
     )
+    parser.add_argument(
+        "--max_processes",
+        type=int,
+        default=None,
+        help=(
+            "cancellable_synthesis機能で同時に起動するプロセス数の上限です。"
+            "空きプロセスが無い状態でリクエストが来た場合、この数までプロセスを追加で起動します。"
+            "指定しない場合は--init_processesと同じ値となり、プロセスを追加で起動しません。"
+        ),
+    )
+    parser.add_argument(
+        "--process_idle_timeout",
+        type=float,
+        default=300.0,
+        help=(
+            "cancellable_synthesis機能で追加で起動したプロセスを、待機状態が続いた場合に終了するまでの時間（秒）です。"
+            "デフォルトは300。"
+        ),
+    )
+    parser.add_argument(
+        "--standby_processes",
+        type=int,
+        default=0,
+        help=(
+            "cancellable_synthesis機能で常に起動しておく予備プロセスの数です。"
+            "キャンセルで終了したプロセスの作り直しや追加の起動の際に、起動を待たずに予備プロセスを利用します。"
+            "デフォルトは0。"
+        ),
+    )
+    parser.add_argument(
+        "--cancellable_shared_memory_size",
+        type=int,
+        default=16,
+        help=(
+            "cancellable_synthesis機能の各プロセスが音声波形の受け渡しに用いる共有メモリの容量（MiB）です。"
+            "共有メモリに収まらない音声波形はプロセス間通信で受け渡されます。"
+            "0の場合は共有メモリを使いません。デフォルトは16。"
+        ),
+    )
     parser.add_argument(
         "--load_all_models",
         action="store_true",
         help="起動時に全ての音声合成モデルを読み込みます。",
     )
+    parser.add_argument(
+        "--model_memory_budget",
+        type=int,
+        default=None,
+        help=(
+            "コアのインスタンスごとに音声合成モデルが使うメモリの上限（MiB）です。"
+            "上限を超える場合、最も長く使われていないスタイルのモデルから解放します。"
+            "コアがモデルの個別の解放に対応していない場合は、コアを初期化し直して解放します（5 分に 1 回まで）。"
+            "指定しない場合はモデルを解放しません。"
+        ),
+    )
+
+    parser.add_argument(
+        "--lazy_core_loading",
+        action="store_true",
+        help=(
+            "前回の起動時にキャッシュした情報を用いてコアを登録し、コアの初期化を初回の利用まで遅らせます。"
+            "キャッシュが無い場合やコアが更新されていた場合は、起動時にコアを初期化してキャッシュします。"
+            "v0.12 より前のコアは常に起動時に初期化します。"
+        ),
+    )
+    parser.add_argument(
+        "--core_instances",
+        type=int,
+        default=1,
+        help=(
+            "コアごとに生成するインスタンス数です。インスタンスごとに推論を並列に実行します。"
+            "0の場合、--cpu_num_threads（インスタンスごとのスレッド数）とCPUのコア数から決めます。"
+            "1以外の場合、--cpu_num_threads を指定しなければCPUのコア数をインスタンス数で分けます。デフォルトは1。"
+        ),
+    )
 
     # 引数へcpu_num_threadsの指定がなければ、環境変数をロールします。
     # 環境変数にもない場合は、Noneのままとします。
@@ -326,6 +420,115 @@ def read_cli_arguments(envs: Envs) -> _CLIArgs:
         ),
     )
 
+    parser.add_argument(
+        "--wave_cache_size",
+        type=int,
+        default=0,
+        help=(
+            "合成した音声波形をメモリ上にキャッシュする容量（MiB）です。"
+            "同じ音声合成用のクエリとスタイルによる合成が再度要求された場合、キャッシュされた音声波形が使われます。"
+            "0の場合はキャッシュしません。デフォルトは0。"
+        ),
+    )
+
+    parser.add_argument(
+        "--wave_cache_dir",
+        type=Path,
+        default=None,
+        help=(
+            "合成した音声波形をディスク上にキャッシュするディレクトリパスです。"
+            "--wave_cache_disk_size と併せて指定します。"
+        ),
+    )
+
+    parser.add_argument(
+        "--wave_cache_disk_size",
+        type=int,
+        default=1024,
+        help="合成した音声波形をディスク上にキャッシュする容量（MiB）です。デフォルトは1024。",
+    )
+
+    parser.add_argument(
+        "--core_batch_window",
+        type=float,
+        default=0.0,
+        help=(
+            "並行した推論呼び出しをまとめるために待つ最大時間（ミリ秒）です。"
+            "同じスタイルに対する推論呼び出しがまとめて実行されます。デフォルトは0。"
+        ),
+    )
+
+    parser.add_argument(
+        "--core_max_batch_size",
+        type=int,
+        default=1,
+        help="まとめて実行する推論呼び出し数の上限です。デフォルトは1。",
+    )
+
+    parser.add_argument(
+        "--multi_synthesis_workers",
+        type=int,
+        default=1,
+        help=(
+            "multi_synthesis の 1 リクエストあたりで並行して音声合成するワーカー数です。"
+            "--enable_cancellable_synthesis が指定された場合、キャンセル可能な音声合成用のプロセスで合成されます。"
+            "デフォルトは1。"
+        ),
+    )
+
+    parser.add_argument(
+        "--max_concurrent_synthesis",
+        type=int,
+        default=None,
+        help=(
+            "音声合成関連のリクエストを同時に処理する数の上限です。"
+            "指定した場合、上限を超えたリクエストは X-Priority-Class ヘッダーで指定された優先度クラスの重みに基づいて順に処理され、"
+            "X-Deadline-Ms ヘッダーで指定された期限までに処理を終えられないリクエストには 503 を返します。"
+            "指定しない場合は同時に処理する数を制限しません。"
+        ),
+    )
+
+    parser.add_argument(
+        "--enable_metrics",
+        action="store_true",
+        help=(
+            "処理段階ごとの所要時間やキャッシュなどの統計情報を計測し、/metrics で Prometheus テキスト形式により公開します。"
+            "--enable_cancellable_synthesis が指定された場合、キャンセル可能な音声合成用のプロセス内の処理段階は計測されません。"
+        ),
+    )
+
+    parser.add_argument(
+        "--request_trace_log",
+        type=Path,
+        default=None,
+        help=(
+            "リクエストごとの処理段階の開始時刻と所要時間を JSON Lines 形式で書き出すログファイルのパスです。"
+            "ログは 10MiB ごとに切り替わり、古いものから 5 つまで残されます。"
+            "指定しない場合は書き出しません。"
+        ),
+    )
+
+    parser.add_argument(
+        "--enable_server_timing",
+        action="store_true",
+        help=(
+            "音声合成用のクエリの作成と音声合成の API で、処理段階ごとの所要時間を Server-Timing ヘッダーとして返します。"
+            "ヘッダーは CORS で許可されたオリジンからも参照できます。"
+        ),
+    )
+
+    parser.add_argument(
+        "--profile_sample_rate",
+        type=float,
+        default=0.0,
+        help=(
+            "プロファイリングの対象とするリクエストの割合です。0 以上 1 以下で指定します。"
+            "対象のリクエストの処理中にスタックを採取し、API ごとに collapsed stack 形式で集計したプロファイルを"
+            "保存ディレクトリの profiles フォルダに書き出します。"
+            "起動後も /profiler API で変更できます。デフォルトは0（無効）。"
+        ),
+    )
+
     args_dict = vars(parser.parse_args())
 
     # NOTE: 複数個の同名引数に基づいてリスト化されるため `CLIArgs` で複数形にリネームされている
@@ -354,6 +557,10 @@ def main() -> None:
 
     use_gpu = select_first_not_none([args.use_gpu, envs.use_gpu])
 
+    metrics_registry: MetricsRegistry | None = None
+    if args.enable_metrics:
+        metrics_registry = enable_metrics()
+
     core_manager = initialize_cores(
         use_gpu=use_gpu,
         voicelib_dirs=args.voicelib_dirs,
@@ -362,8 +569,31 @@ def main() -> None:
         cpu_num_threads=args.cpu_num_threads,
         enable_mock=args.enable_mock,
         load_all_models=args.load_all_models,
+        batch_window_sec=args.core_batch_window / 1000,
+        max_batch_size=args.core_max_batch_size,
+        model_memory_budget_bytes=(
+            None
+            if args.model_memory_budget is None
+            else args.model_memory_budget * _MIB
+        ),
+        core_instances=args.core_instances,
+        lazy_load=args.lazy_core_loading,
     )
-    tts_engines = make_tts_engines_from_cores(core_manager)
+
+    wave_cache: WaveCache | None = None
+    if args.wave_cache_size > 0 or args.wave_cache_dir is not None:
+        wave_cache = WaveCache(
+            max_memory_bytes=args.wave_cache_size * _MIB,
+            disk_dir=args.wave_cache_dir,
+            max_disk_bytes=args.wave_cache_disk_size * _MIB,
+        )
+
+    tts_engines = make_tts_engines_from_cores(core_manager, wave_cache)
+    if metrics_registry is not None and wave_cache is not None:
+        wave_cache_stats = wave_cache.stats
+        metrics_registry.register_collector(
+            lambda: flatten_stats("voicevox_wave_cache", wave_cache_stats())
+        )
     song_engines = make_song_engines_from_cores(core_manager)
     assert len(tts_engines.versions()) != 0, "音声合成エンジンがありません。"
     assert len(song_engines.versions()) != 0, "音声合成エンジンがありません。"
@@ -378,6 +608,10 @@ def main() -> None:
             runtime_dirs=args.runtime_dirs,
             cpu_num_threads=args.cpu_num_threads,
             enable_mock=args.enable_mock,
+            shared_memory_size=args.cancellable_shared_memory_size * _MIB,
+            max_processes=args.max_processes,
+            idle_timeout=args.process_idle_timeout,
+            standby_processes=args.standby_processes,
         )
 
     setting_loader = SettingHandler(args.setting_file)
@@ -429,6 +663,14 @@ def main() -> None:
 
     disable_mutable_api = args.disable_mutable_api or envs.disable_mutable_api
 
+    admission_scheduler = None
+    if args.max_concurrent_synthesis is not None:
+        admission_scheduler = AdmissionScheduler(args.max_concurrent_synthesis)
+
+    request_profiler = RequestProfiler(
+        get_save_dir() / "profiles", sample_rate=args.profile_sample_rate
+    )
+
     # ASGI に準拠した VOICEVOX ENGINE アプリケーションを生成する
     app = generate_app(
         tts_engines,
@@ -444,6 +686,12 @@ def main() -> None:
         cors_policy_mode,
         allow_origin,
         disable_mutable_api=disable_mutable_api,
+        multi_synthesis_workers=args.multi_synthesis_workers,
+        admission_scheduler=admission_scheduler,
+        metrics_registry=metrics_registry,
+        request_trace_log=args.request_trace_log,
+        request_profiler=request_profiler,
+        enable_server_timing=args.enable_server_timing,
     )
 
     # VOICEVOX ENGINE サーバーを起動
@@ -1,5 +1,8 @@
 """VOICEVOX ENGINE へアクセス可能なクライアントの生成"""
 
+import atexit
+import shutil
+import tempfile
 import warnings
 from pathlib import Path
 from typing import Literal, assert_never
@@ -15,7 +18,10 @@ from voicevox_engine.preset.preset_manager import PresetManager
 from voicevox_engine.setting.setting_manager import SettingHandler
 from voicevox_engine.tts_pipeline.song_engine import make_song_engines_from_cores
 from voicevox_engine.tts_pipeline.tts_engine import make_tts_engines_from_cores
-from voicevox_engine.user_dict.user_dict_manager import UserDictionary
+from voicevox_engine.user_dict.user_dict_manager import (
+    DEFAULT_DICT_PATH,
+    UserDictionary,
+)
 from voicevox_engine.utility.path_utility import engine_manifest_path, get_save_dir
 
 
@@ -50,7 +56,42 @@ def _generate_engine_fake_server(root_dir: Path) -> TestClient:
     return TestClient(app)
 
 
-ServerType = Literal["localhost", "fake"]
+def _generate_engine_mock_server() -> TestClient:
+    core_manager = initialize_cores(use_gpu=False, enable_mock=True, cpu_num_threads=1)
+    tts_engines = make_tts_engines_from_cores(core_manager)
+    song_engines = make_song_engines_from_cores(core_manager)
+
+    # ベンチマーク中の変更が実環境へ及ばないよう、隔離された設定・プリセット・ユーザー辞書を用いる
+    tmp_dir = Path(tempfile.mkdtemp(prefix="voicevox_benchmark_"))
+    atexit.register(shutil.rmtree, tmp_dir, ignore_errors=True)
+    setting_loader = SettingHandler(tmp_dir / "not_exist.yaml")
+    preset_manager = PresetManager(tmp_dir / "presets.yaml")
+    user_dict = UserDictionary(
+        default_dict_path=DEFAULT_DICT_PATH, user_dict_path=tmp_dir / "user_dict.json"
+    )
+
+    engine_manifest = load_manifest(engine_manifest_path())
+    library_manager = LibraryManager(
+        tmp_dir / "installed_libraries",
+        engine_manifest.supported_vvlib_manifest_version,
+        engine_manifest.brand_name,
+        engine_manifest.name,
+        engine_manifest.uuid,
+    )
+    app = generate_app(
+        tts_engines=tts_engines,
+        song_engines=song_engines,
+        core_manager=core_manager,
+        setting_loader=setting_loader,
+        preset_manager=preset_manager,
+        user_dict=user_dict,
+        engine_manifest=engine_manifest,
+        library_manager=library_manager,
+    )
+    return TestClient(app)
+
+
+ServerType = Literal["localhost", "fake", "mock"]
 
 
 def generate_client(
@@ -61,6 +102,7 @@ def generate_client(
 
     `server=localhost` では http://localhost:50021 へのクライアントを生成する。
     `server=fake` ではネットワークを介さずレスポンスを返す疑似サーバーを生成する。
+    `server=mock` ではモックのコアを用いた疑似サーバーを生成する。`root_dir` は用いない。
     """
     if server == "fake":
         if root_dir is None:
@@ -68,6 +110,8 @@ def generate_client(
             warnings.warn(warn_msg, stacklevel=2)
             root_dir = Path("VOICEVOX/vv-engine")
         return _generate_engine_fake_server(root_dir)
+    elif server == "mock":
+        return _generate_engine_mock_server()
     elif server == "localhost":
         return httpx2.Client(base_url="http://localhost:50021")
     else:
@@ -0,0 +1,268 @@
+"""同時リクエスト数ごとのスループットとレイテンシの測定"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, TypeAlias
+
+import httpx2
+from fastapi.testclient import TestClient
+
+from test.benchmark.engine_preparation import ServerType, generate_client
+
+_SPEAKER = 0
+_TEXT = "今日はいい天気ですね。"
+_LONG_TEXT = (
+    "吾輩は猫である。名前はまだ無い。どこで生れたかとんと見当がつかぬ。"
+    "何でも薄暗いじめじめした所でニャーニャー泣いていた事だけは記憶している。"
+)
+
+Client: TypeAlias = TestClient | httpx2.Client
+
+
+@dataclass(frozen=True)
+class LatencySummary:
+    """リクエストのレイテンシの要約"""
+
+    requests: int  # 成功したリクエスト数
+    errors: int  # 失敗したリクエスト数
+    p50_sec: float
+    p95_sec: float
+    p99_sec: float
+
+
+@dataclass(frozen=True)
+class LoadResult:
+    """1 つの同時リクエスト数における計測結果"""
+
+    concurrency: int
+    elapsed_sec: float
+    requests_per_sec: float  # 成功したリクエストのスループット
+    total: LatencySummary
+    per_request: dict[str, LatencySummary]  # リクエストの種類ごとの要約
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    """昇順に並んだ値の百分位数を最近傍順位法で求める。値が無い場合は NaN を返す。"""
+    if len(sorted_values) == 0:
+        return math.nan
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def _summarize(latencies: list[float], errors: int) -> LatencySummary:
+    """成功したリクエストのレイテンシとエラー数から要約を生成する。"""
+    values = sorted(latencies)
+    return LatencySummary(
+        requests=len(values),
+        errors=errors,
+        p50_sec=_percentile(values, 50),
+        p95_sec=_percentile(values, 95),
+        p99_sec=_percentile(values, 99),
+    )
+
+
+def _build_requests(client: Client, names: list[str]) -> dict[str, Callable[[], None]]:
+    """
+    負荷として送信するリクエストを種類ごとに生成する。クエリなどの準備は計測に含まない。
+
+    `cancellable_synthesis` は `--enable_cancellable_synthesis` 付きで起動したエンジンでのみ利用できる。
+    """
+
+    def post(url: str, **kwargs: Any) -> httpx2.Response:
+        response = client.post(url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def audio_query(text: str) -> dict[str, Any]:
+        params = {"text": text, "speaker": _SPEAKER}
+        query: dict[str, Any] = post("/audio_query", params=params).json()
+        return query
+
+    def synthesizer(url: str, text: str) -> Callable[[], None]:
+        query = audio_query(text)
+
+        def execute() -> None:
+            post(url, params={"speaker": _SPEAKER}, json=query)
+
+        return execute
+
+    def analyzer() -> Callable[[], None]:
+        def execute() -> None:
+            audio_query(_TEXT)
+
+        return execute
+
+    factories: dict[str, Callable[[], Callable[[], None]]] = {
+        "audio_query": analyzer,
+        "synthesis": lambda: synthesizer("/synthesis", _TEXT),
+        "synthesis_long": lambda: synthesizer("/synthesis", _LONG_TEXT),
+        "cancellable_synthesis": lambda: synthesizer("/cancellable_synthesis", _TEXT),
+    }
+    unknown = set(names) - set(factories)
+    if len(unknown) > 0:
+        raise ValueError(f"未対応のリクエストです: {', '.join(sorted(unknown))}")
+    return {name: factories[name]() for name in names}
+
+
+def _run_level(
+    requests: dict[str, Callable[[], None]],
+    weights: dict[str, float],
+    concurrency: int,
+    duration_sec: float,
+    seed: int,
+) -> LoadResult:
+    """
+    指定数のワーカーから一定時間リクエストを送り続け、計測結果を返す。
+
+    各ワーカーは直前のリクエストの完了を待ってから、重みに従って選んだ次のリクエストを送信する。
+    """
+    names = list(weights)
+    weight_values = [weights[name] for name in names]
+    latencies: dict[str, list[float]] = {name: [] for name in names}
+    errors: dict[str, int] = dict.fromkeys(names, 0)
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(concurrency + 1)
+    deadline = 0.0
+
+    def work(worker_id: int) -> None:
+        rng = random.Random(seed + worker_id)
+        start_barrier.wait()
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weight_values)[0]
+            start = time.perf_counter()
+            try:
+                requests[name]()
+            except Exception:
+                with lock:
+                    errors[name] += 1
+                continue
+            latency = time.perf_counter() - start
+            with lock:
+                latencies[name].append(latency)
+
+    workers = [
+        threading.Thread(target=work, args=(i,), daemon=True)
+        for i in range(concurrency)
+    ]
+    for worker in workers:
+        worker.start()
+    start = time.perf_counter()
+    deadline = start + duration_sec
+    start_barrier.wait()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    all_latencies = [latency for values in latencies.values() for latency in values]
+    return LoadResult(
+        concurrency=concurrency,
+        elapsed_sec=elapsed,
+        requests_per_sec=len(all_latencies) / elapsed,
+        total=_summarize(all_latencies, sum(errors.values())),
+        per_request={name: _summarize(latencies[name], errors[name]) for name in names},
+    )
+
+
+def benchmark_concurrency(
+    server: ServerType,
+    concurrencies: list[int],
+    mix: dict[str, float],
+    duration_sec: float = 10.0,
+    root_dir: Path | None = None,
+    seed: int = 0,
+) -> list[LoadResult]:
+    """
+    同時リクエスト数ごとのスループットとレイテンシを測定する。
+
+    Parameters
+    ----------
+    server : ServerType
+        負荷をかけるエンジンの種類
+    concurrencies : list[int]
+        計測する同時リクエスト数の一覧
+    mix : dict[str, float]
+        リクエストの種類ごとの送信比率
+    duration_sec : float
+        1 つの同時リクエスト数あたりの計測時間（秒）
+    root_dir : Path | None
+        `server=fake` で用いるエンジンのディレクトリ
+    seed : int
+        リクエストの種類を選ぶ乱数のシード
+    """
+    client = generate_client(server, root_dir)
+    # NOTE: 疑似サーバーは 1 つのイベントループで全リクエストを処理させるため、起動した状態で用いる
+    with client:
+        requests = _build_requests(client, list(mix))
+        for execute in requests.values():
+            execute()  # ウォームアップ
+        return [
+            _run_level(requests, mix, concurrency, duration_sec, seed)
+            for concurrency in concurrencies
+        ]
+
+
+def _parse_mix(text: str) -> dict[str, float]:
+    """`synthesis=3,audio_query=1` 形式のリクエストの送信比率を読み込む。"""
+    mix: dict[str, float] = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = float(weight) if weight != "" else 1.0
+    return mix
+
+
+if __name__ == "__main__":
+    # 実行コマンドは `python -m test.benchmark.load.concurrency` である。
+    # `server="localhost"` の場合、本ベンチマーク実行に先立ってエンジン起動が必要である。
+    # `--output` で同時リクエスト数ごとの計測結果を JSON として保存でき、グラフの描画などに利用できる。
+    # 例: `python -m test.benchmark.load.concurrency --concurrency=1,2,4,8 --mix=synthesis=3,audio_query=1 --output=load.json`
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--voicevox_dir", type=Path)
+    parser.add_argument(
+        "--server", choices=["mock", "fake", "localhost"], default="mock"
+    )
+    parser.add_argument(
+        "--concurrency", default="1,2,4,8", help="計測する同時リクエスト数の一覧"
+    )
+    parser.add_argument(
+        "--mix",
+        default="synthesis=3,audio_query=1",
+        help="リクエストの種類ごとの送信比率",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="同時リクエスト数ごとの計測時間"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="計測結果の保存先")
+    args = parser.parse_args()
+
+    results = benchmark_concurrency(
+        server=args.server,
+        concurrencies=[int(c) for c in args.concurrency.split(",")],
+        mix=_parse_mix(args.mix),
+        duration_sec=args.duration,
+        root_dir=args.voicevox_dir,
+        seed=args.seed,
+    )
+    for result in results:
+        total = result.total
+        print(
+            f"concurrency {result.concurrency}: {result.requests_per_sec:.2f} req/s, "
+            f"p50 {total.p50_sec:.4f} sec, p95 {total.p95_sec:.4f} sec, "
+            f"p99 {total.p99_sec:.4f} sec, errors {total.errors}"
+        )
+    if args.output is not None:
+        contents = {
+            "server": args.server,
+            "mix": _parse_mix(args.mix),
+            "duration_sec": args.duration,
+            "results": [asdict(result) for result in results],
+        }
+        args.output.write_text(json.dumps(contents, indent=2) + "\n")
@@ -0,0 +1,264 @@
+"""音声合成などの主要な API の処理にかかる時間の測定"""
+
+import argparse
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeAlias
+
+import httpx2
+from fastapi.testclient import TestClient
+
+from test.benchmark.engine_preparation import ServerType, generate_client
+from test.benchmark.speed.utility import (
+    BenchmarkResult,
+    benchmark_samples,
+    find_regressions,
+    load_results,
+    save_results,
+)
+from voicevox_engine.tts_pipeline.accent_phrase_cache import accent_phrase_cache
+
+_SPEAKER = 0
+_SING_QUERY_SPEAKER = 7  # 歌唱用クエリを生成できるスタイル
+_FRAME_SYNTHESIS_SPEAKER = 4  # フレームごとの音声合成ができるスタイル
+
+# 短い文のコーパス。1 回の計測で全ての文を処理する
+_SHORT_TEXTS = [
+    "こんにちは。",
+    "今日はいい天気ですね。",
+    "音声合成のテストです。",
+    "明日の予定を教えてください。",
+    "ありがとうございました。",
+]
+
+# 長い文のコーパス。段落を繰り返して長文とする
+_LONG_PARAGRAPH = (
+    "吾輩は猫である。名前はまだ無い。どこで生れたかとんと見当がつかぬ。"
+    "何でも薄暗いじめじめした所でニャーニャー泣いていた事だけは記憶している。"
+    "吾輩はここで始めて人間というものを見た。"
+)
+_LONG_TEXT = _LONG_PARAGRAPH * 4
+
+_SYNTHESIS_TEXTS = {
+    "short": _SHORT_TEXTS[1],
+    "medium": _LONG_PARAGRAPH,
+    "long": _LONG_TEXT,
+}
+_SAMPLING_RATES = [24000, 48000]
+
+_N_SCORE_NOTES = 200
+_N_MULTI_SYNTHESIS_QUERIES = 8
+
+Client: TypeAlias = TestClient | httpx2.Client
+
+
+@dataclass(frozen=True)
+class _Case:
+    """1 つのベンチマーク"""
+
+    name: str
+    execute: Callable[[], None]
+    setup: Callable[[], None] | None = None
+
+
+def _post(client: Client, url: str, **kwargs: Any) -> httpx2.Response:
+    """POST リクエストを送信し、エラーレスポンスの場合は例外を送出する。"""
+    response = client.post(url, **kwargs)
+    response.raise_for_status()
+    return response
+
+
+def _audio_query(client: Client, text: str) -> dict[str, Any]:
+    """音声合成用のクエリを生成する。"""
+    response = _post(client, "/audio_query", params={"text": text, "speaker": _SPEAKER})
+    query: dict[str, Any] = response.json()
+    return query
+
+
+def _gen_score(n_notes: int) -> dict[str, Any]:
+    """指定数の音符からなる、前後に休符を置いた楽譜を生成する。"""
+    lyrics = ["ど", "れ", "み", "ふぁ", "そ", "ら", "し"]
+    notes: list[dict[str, Any]] = [{"key": None, "frame_length": 15, "lyric": ""}]
+    for i in range(n_notes):
+        notes.append(
+            {
+                "key": 60 + i % 12,
+                "frame_length": 20 + i % 3 * 5,
+                "lyric": lyrics[i % len(lyrics)],
+            }
+        )
+    notes.append({"key": None, "frame_length": 15, "lyric": ""})
+    return {"notes": notes}
+
+
+def _build_cases(client: Client) -> list[_Case]:
+    """計測するベンチマークを生成する。クエリなどの準備は計測に含まない。"""
+    # NOTE: 疑似サーバーではテキスト解析結果のキャッシュを毎回破棄し、テキスト解析の時間も計測する
+    invalidate_cache = (
+        accent_phrase_cache.invalidate if isinstance(client, TestClient) else None
+    )
+    cases: list[_Case] = []
+
+    def audio_query_short() -> None:
+        for text in _SHORT_TEXTS:
+            _audio_query(client, text)
+
+    def audio_query_long() -> None:
+        _audio_query(client, _LONG_TEXT)
+
+    cases.append(_Case("audio_query/short", audio_query_short, invalidate_cache))
+    cases.append(_Case("audio_query/long", audio_query_long, invalidate_cache))
+
+    for length, text in _SYNTHESIS_TEXTS.items():
+        for sampling_rate in _SAMPLING_RATES:
+            query = _audio_query(client, text) | {"outputSamplingRate": sampling_rate}
+
+            def synthesis(query: dict[str, Any] = query) -> None:
+                _post(client, "/synthesis", params={"speaker": _SPEAKER}, json=query)
+
+            cases.append(_Case(f"synthesis/{length}/{sampling_rate}", synthesis))
+
+    score = _gen_score(_N_SCORE_NOTES)
+    frame_query = _post(
+        client,
+        "/sing_frame_audio_query",
+        params={"speaker": _SING_QUERY_SPEAKER},
+        json=score,
+    ).json()
+
+    def sing_frame_audio_query() -> None:
+        _post(
+            client,
+            "/sing_frame_audio_query",
+            params={"speaker": _SING_QUERY_SPEAKER},
+            json=score,
+        )
+
+    def frame_synthesis() -> None:
+        _post(
+            client,
+            "/frame_synthesis",
+            params={"speaker": _FRAME_SYNTHESIS_SPEAKER},
+            json=frame_query,
+        )
+
+    cases.append(_Case("sing_frame_audio_query/long", sing_frame_audio_query))
+    cases.append(_Case("frame_synthesis/long", frame_synthesis))
+
+    morphing_query = _audio_query(client, _LONG_PARAGRAPH)
+
+    def synthesis_morphing() -> None:
+        _post(
+            client,
+            "/synthesis_morphing",
+            params={
+                "base_speaker": _SPEAKER,
+                "target_speaker": _SPEAKER,
+                "morph_rate": 0.5,
+            },
+            json=morphing_query,
+        )
+
+    cases.append(_Case("synthesis_morphing/medium", synthesis_morphing))
+
+    multi_queries = [
+        _audio_query(client, _SHORT_TEXTS[i % len(_SHORT_TEXTS)])
+        for i in range(_N_MULTI_SYNTHESIS_QUERIES)
+    ]
+
+    def multi_synthesis() -> None:
+        _post(
+            client, "/multi_synthesis", params={"speaker": _SPEAKER}, json=multi_queries
+        )
+
+    cases.append(_Case("multi_synthesis", multi_synthesis))
+
+    def user_dict_mutation() -> None:
+        """単語の追加・変更・削除を 1 回ずつ行う。各操作で辞書が再構築される。"""
+        word = {
+            "surface": "ベンチマーク",
+            "pronunciation": "ベンチマーク",
+            "accent_type": 1,
+            "word_type": "PROPER_NOUN",
+        }
+        word_uuid = _post(client, "/user_dict_word", params=word).json()
+        client.put(
+            f"/user_dict_word/{word_uuid}", params=word | {"priority": 8}
+        ).raise_for_status()
+        client.delete(f"/user_dict_word/{word_uuid}").raise_for_status()
+
+    # NOTE: 実行中のエンジンのユーザー辞書を変更しないよう、疑似サーバーでのみ計測する
+    if isinstance(client, TestClient):
+        cases.append(_Case("user_dict_word/mutation", user_dict_mutation))
+
+    return cases
+
+
+def benchmark_api(
+    server: ServerType,
+    root_dir: Path | None = None,
+    n_repeat: int = 10,
+    sec_sleep: float = 1.0,
+) -> list[BenchmarkResult]:
+    """主要な API の処理にかかる時間を測定する。"""
+    client = generate_client(server, root_dir)
+    results: list[BenchmarkResult] = []
+    for case in _build_cases(client):
+        case.execute()  # ウォームアップ
+        samples = benchmark_samples(case.execute, n_repeat, sec_sleep, case.setup)
+        results.append(BenchmarkResult.from_samples(case.name, samples))
+    return results
+
+
+if __name__ == "__main__":
+    # 実行コマンドは `python -m test.benchmark.speed.api` である。
+    # `--output` で計測結果を JSON として保存し、以降の計測で `--baseline` に指定すると遅くなった API を検出できる。
+    # 例: `python -m test.benchmark.speed.api --output=baseline.json`
+    #     `python -m test.benchmark.speed.api --baseline=baseline.json`
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--voicevox_dir", type=Path)
+    parser.add_argument(
+        "--server", choices=["mock", "fake", "localhost"], default="mock"
+    )
+    parser.add_argument("--n_repeat", type=int, default=10)
+    parser.add_argument("--sec_sleep", type=float, default=0.1)
+    parser.add_argument("--output", type=Path, help="計測結果の保存先")
+    parser.add_argument("--baseline", type=Path, help="比較対象とする計測結果")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="許容する実行時間の中央値の増加率",
+    )
+    args = parser.parse_args()
+
+    results = benchmark_api(
+        server=args.server,
+        root_dir=args.voicevox_dir,
+        n_repeat=args.n_repeat,
+        sec_sleep=args.sec_sleep,
+    )
+    for result in results:
+        print(
+            f"`{result.name}`: median {result.median_sec:.4f} sec, "
+            f"mean {result.mean_sec:.4f} sec"
+        )
+    if args.output is not None:
+        save_results(results, args.output)
+
+    if args.baseline is not None:
+        regressions = find_regressions(
+            results, load_results(args.baseline), args.threshold
+        )
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression.name}: "
+                f"{regression.baseline_sec:.4f} sec -> {regression.current_sec:.4f} sec "
+                f"(x{regression.ratio:.2f})",
+                file=sys.stderr,
+            )
+        if len(regressions) > 0:
+            sys.exit(1)
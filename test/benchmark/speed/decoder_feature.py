@@ -0,0 +1,91 @@
+"""音声合成用のクエリからデコーダー入力特徴量への変換にかかる時間の測定"""
+
+import argparse
+
+from test.benchmark.speed.utility import benchmark_time
+from voicevox_engine.model import AudioQuery
+from voicevox_engine.tts_pipeline.model import AccentPhrase, Mora
+from voicevox_engine.tts_pipeline.tts_engine import _query_to_decoder_feature
+
+
+def _gen_query(n_accent_phrase: int) -> AudioQuery:
+    """「こんにちは、」を指定回数繰り返した音声合成用のクエリを生成する。"""
+    accent_phrase = AccentPhrase(
+        moras=[
+            Mora(
+                text="コ",
+                consonant="k",
+                consonant_length=0.05,
+                vowel="o",
+                vowel_length=0.08,
+                pitch=5.8,
+            ),
+            Mora(text="ン", vowel="N", vowel_length=0.06, pitch=5.9),
+            Mora(
+                text="ニ",
+                consonant="n",
+                consonant_length=0.04,
+                vowel="i",
+                vowel_length=0.07,
+                pitch=6.0,
+            ),
+            Mora(
+                text="チ",
+                consonant="ch",
+                consonant_length=0.06,
+                vowel="i",
+                vowel_length=0.05,
+                pitch=6.0,
+            ),
+            Mora(
+                text="ワ",
+                consonant="w",
+                consonant_length=0.05,
+                vowel="a",
+                vowel_length=0.1,
+                pitch=5.7,
+            ),
+        ],
+        accent=5,
+        pause_mora=Mora(text="、", vowel="pau", vowel_length=0.3, pitch=0.0),
+    )
+    return AudioQuery(
+        accent_phrases=[accent_phrase] * n_accent_phrase,
+        speedScale=1.1,
+        pitchScale=0.05,
+        intonationScale=1.2,
+        volumeScale=1.0,
+        prePhonemeLength=0.1,
+        postPhonemeLength=0.1,
+        pauseLength=None,
+        pauseLengthScale=0.8,
+        outputSamplingRate=24000,
+        outputStereo=False,
+    )
+
+
+def benchmark_query_to_decoder_feature(n_accent_phrase: int, n_call: int) -> float:
+    """`_query_to_decoder_feature()` の 1 回あたりの実行時間を測定する。"""
+    query = _gen_query(n_accent_phrase)
+
+    def execute() -> None:
+        """計測対象となる処理を実行する"""
+        for _ in range(n_call):
+            _query_to_decoder_feature(query)
+
+    average_time = benchmark_time(execute, n_repeat=10, sec_sleep=0.0)
+    return average_time / n_call
+
+
+if __name__ == "__main__":
+    # 実行コマンドは `python -m test.benchmark.speed.decoder_feature` である。
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_call", type=int, default=100)
+    args = parser.parse_args()
+    n_call: int = args.n_call
+
+    for n_accent_phrase in [1, 10, 100]:
+        result = benchmark_query_to_decoder_feature(n_accent_phrase, n_call)
+        n_mora = n_accent_phrase * 6
+        print(f"`_query_to_decoder_feature()` {n_mora} moras: {result * 1000:.4f} ms")
@@ -0,0 +1,78 @@
+"""フルコンテキストラベルの解析にかかる時間の測定"""
+
+import argparse
+import re
+from typing import Any
+
+from test.benchmark.speed.utility import benchmark_time
+from voicevox_engine.tts_pipeline.njd_feature_processor import (
+    text_to_full_context_labels,
+)
+from voicevox_engine.tts_pipeline.text_analyzer import _Label
+
+_PARAGRAPH = (
+    "吾輩は猫である。名前はまだ無い。"
+    "どこで生れたかとんと見当がつかぬ。"
+    "何でも薄暗いじめじめした所でニャーニャー泣いていた事だけは記憶している。"
+    "吾輩はここで始めて人間というものを見た。"
+)
+
+
+def _parse_labels_legacy(features: list[str]) -> list[dict[str, Any]]:
+    """比較用に、全属性を非コンパイルの正規表現で抽出する従来の方式でラベルを解析する。"""
+    labels = []
+    for feature in features:
+        result = re.search(
+            r"^(?P<p1>.+?)\^(?P<p2>.+?)\-(?P<p3>.+?)\+(?P<p4>.+?)\=(?P<p5>.+?)"
+            r"/A\:(?P<a1>.+?)\+(?P<a2>.+?)\+(?P<a3>.+?)"
+            r"/B\:(?P<b1>.+?)\-(?P<b2>.+?)\_(?P<b3>.+?)"
+            r"/C\:(?P<c1>.+?)\_(?P<c2>.+?)\+(?P<c3>.+?)"
+            r"/D\:(?P<d1>.+?)\+(?P<d2>.+?)\_(?P<d3>.+?)"
+            r"/E\:(?P<e1>.+?)\_(?P<e2>.+?)\!(?P<e3>.+?)\_(?P<e4>.+?)\-(?P<e5>.+?)"
+            r"/F\:(?P<f1>.+?)\_(?P<f2>.+?)\#(?P<f3>.+?)\_(?P<f4>.+?)\@(?P<f5>.+?)\_(?P<f6>.+?)\|(?P<f7>.+?)\_(?P<f8>.+?)"
+            r"/G\:(?P<g1>.+?)\_(?P<g2>.+?)\%(?P<g3>.+?)\_(?P<g4>.+?)\_(?P<g5>.+?)"
+            r"/H\:(?P<h1>.+?)\_(?P<h2>.+?)"
+            r"/I\:(?P<i1>.+?)\-(?P<i2>.+?)\@(?P<i3>.+?)\+(?P<i4>.+?)\&(?P<i5>.+?)\-(?P<i6>.+?)\|(?P<i7>.+?)\+(?P<i8>.+?)"
+            r"/J\:(?P<j1>.+?)\_(?P<j2>.+?)"
+            r"/K\:(?P<k1>.+?)\+(?P<k2>.+?)\-(?P<k3>.+?)$",
+            feature,
+        )
+        if result is None:
+            raise ValueError(feature)
+        labels.append(result.groupdict())
+    return labels
+
+
+def benchmark_label_parser(n_paragraph: int, n_call: int) -> tuple[float, float]:
+    """従来方式と `_Label.from_features()` それぞれの 1 回あたりの解析時間を測定する。"""
+    features = text_to_full_context_labels(_PARAGRAPH * n_paragraph, False)
+
+    def execute_legacy() -> None:
+        """計測対象となる処理を実行する"""
+        for _ in range(n_call):
+            _parse_labels_legacy(features)
+
+    def execute() -> None:
+        """計測対象となる処理を実行する"""
+        for _ in range(n_call):
+            _Label.from_features(features)
+
+    legacy_time = benchmark_time(execute_legacy, n_repeat=10, sec_sleep=0.0)
+    current_time = benchmark_time(execute, n_repeat=10, sec_sleep=0.0)
+    return legacy_time / n_call, current_time / n_call
+
+
+if __name__ == "__main__":
+    # 実行コマンドは `python -m test.benchmark.speed.label_parser` である。
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_call", type=int, default=20)
+    args = parser.parse_args()
+    n_call: int = args.n_call
+
+    for n_paragraph in [1, 10]:
+        legacy, current = benchmark_label_parser(n_paragraph, n_call)
+        print(f"{n_paragraph} paragraph(s), legacy: {legacy * 1000:.4f} ms")
+        print(
+            f"{n_paragraph} paragraph(s), `_Label.from_features()`: {current * 1000:.4f} ms"
+        )
@@ -1,19 +1,135 @@
 """速度ベンチマーク用のユーティリティ"""
 
+import json
+import statistics
 import time
 from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
 
 
-def benchmark_time(
-    target_function: Callable[[], None], n_repeat: int, sec_sleep: float = 1.0
-) -> float:
-    """対象関数の平均実行時間を計測する。"""
+def benchmark_samples(
+    target_function: Callable[[], None],
+    n_repeat: int,
+    sec_sleep: float = 1.0,
+    setup: Callable[[], None] | None = None,
+) -> list[float]:
+    """
+    対象関数の実行時間を指定回数計測し、各回の実行時間を返す。
+
+    Parameters
+    ----------
+    target_function : Callable[[], None]
+        計測対象の関数
+    n_repeat : int
+        計測回数
+    sec_sleep : float
+        各回の計測後に待機する時間（秒）
+    setup : Callable[[], None] | None
+        各回の計測前に実行する関数。実行時間は計測に含まれない
+    """
     scores: list[float] = []
     for _ in range(n_repeat):
+        if setup is not None:
+            setup()
         start = time.perf_counter()
         target_function()
         end = time.perf_counter()
         scores += [end - start]
         time.sleep(sec_sleep)
+    return scores
+
+
+def benchmark_time(
+    target_function: Callable[[], None], n_repeat: int, sec_sleep: float = 1.0
+) -> float:
+    """対象関数の平均実行時間を計測する。"""
+    scores = benchmark_samples(target_function, n_repeat, sec_sleep)
     average = sum(scores) / len(scores)
     return average
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """1 つのベンチマークの計測結果"""
+
+    name: str
+    n_repeat: int
+    mean_sec: float
+    median_sec: float
+    min_sec: float
+    max_sec: float
+
+    @classmethod
+    def from_samples(cls, name: str, samples: list[float]) -> "BenchmarkResult":
+        """各回の実行時間から計測結果を生成する。"""
+        return cls(
+            name=name,
+            n_repeat=len(samples),
+            mean_sec=statistics.fmean(samples),
+            median_sec=statistics.median(samples),
+            min_sec=min(samples),
+            max_sec=max(samples),
+        )
+
+
+@dataclass(frozen=True)
+class Regression:
+    """ベースラインより遅くなったベンチマーク"""
+
+    name: str
+    baseline_sec: float
+    current_sec: float
+
+    @property
+    def ratio(self) -> float:
+        """ベースラインに対する実行時間の比。"""
+        return self.current_sec / self.baseline_sec
+
+
+def save_results(results: list[BenchmarkResult], path: Path) -> None:
+    """計測結果を JSON ファイルへ保存する。"""
+    contents = {"results": [asdict(result) for result in results]}
+    path.write_text(json.dumps(contents, ensure_ascii=False, indent=2) + "\n")
+
+
+def load_results(path: Path) -> list[BenchmarkResult]:
+    """JSON ファイルへ保存された計測結果を読み込む。"""
+    contents = json.loads(path.read_text())
+    return [BenchmarkResult(**result) for result in contents["results"]]
+
+
+def find_regressions(
+    results: list[BenchmarkResult],
+    baseline: list[BenchmarkResult],
+    threshold: float,
+) -> list[Regression]:
+    """
+    ベースラインと比べて実行時間の中央値が閾値を超えて増えたベンチマークを列挙する。
+
+    ベースラインに存在しないベンチマークは比較しない。
+
+    Parameters
+    ----------
+    results : list[BenchmarkResult]
+        今回の計測結果
+    baseline : list[BenchmarkResult]
+        比較対象となる過去の計測結果
+    threshold : float
+        許容する実行時間の増加率。0.1 の場合は 10% を超えて遅くなったものを列挙する
+    """
+    baseline_by_name = {result.name: result for result in baseline}
+    regressions: list[Regression] = []
+    for result in results:
+        base = baseline_by_name.get(result.name)
+        if base is None or base.median_sec <= 0:
+            continue
+        if result.median_sec > base.median_sec * (1 + threshold):
+            regressions.append(
+                Regression(
+                    name=result.name,
+                    baseline_sec=base.median_sec,
+                    current_sec=result.median_sec,
+                )
+            )
+    return regressions
@@ -0,0 +1,54 @@
+"""/cancellable_synthesis_morphing API のテスト。"""
+
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+from test.e2e.single_api.utils import gen_mora
+from voicevox_engine.app.application import generate_app
+from voicevox_engine.cancellable_engine import CancellableEngine
+
+
+def test_post_cancellable_synthesis_morphing_200(
+    app_params: dict[str, Any], client: TestClient
+) -> None:
+    """/synthesis_morphing と同じ音声が得られる。"""
+    app_params["cancellable_engine"] = CancellableEngine(
+        init_processes=1,
+        use_gpu=False,
+        enable_mock=True,
+    )
+    cancellable_client = TestClient(generate_app(**app_params))
+    query = {
+        "accent_phrases": [
+            {
+                "moras": [
+                    gen_mora("テ", "t", 0.1, "e", 0.1, 5.0),
+                    gen_mora("ス", "s", 0.1, "U", 0.1, 0.0),
+                    gen_mora("ト", "t", 0.1, "o", 0.1, 5.0),
+                ],
+                "accent": 1,
+                "pause_mora": None,
+                "is_interrogative": False,
+            }
+        ],
+        "speedScale": 1.0,
+        "pitchScale": 0.0,
+        "intonationScale": 1.0,
+        "volumeScale": 1.0,
+        "prePhonemeLength": 0.1,
+        "postPhonemeLength": 0.1,
+        "pauseLength": None,
+        "pauseLengthScale": 1.0,
+        "outputSamplingRate": 24000,
+        "outputStereo": False,
+    }
+    params = {"base_speaker": 0, "target_speaker": 0, "morph_rate": 0.8}
+    response = cancellable_client.post(
+        "/cancellable_synthesis_morphing", params=params, json=query
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/wav"
+
+    expected = client.post("/synthesis_morphing", params=params, json=query)
+    assert response.read() == expected.read()
@@ -0,0 +1,22 @@
+"""/audio_query_batch API のテスト。"""
+
+from fastapi.testclient import TestClient
+
+
+def test_post_audio_query_batch_200(client: TestClient) -> None:
+    """まとめて作成したクエリはテキストごとに /audio_query で作成したクエリと一致する。"""
+    texts = ["テストです", "こんにちは、ヒホです。", "", "Voivo"]
+    response = client.post("/audio_query_batch", params={"speaker": 0}, json=texts)
+    assert response.status_code == 200
+
+    expected = [
+        client.post("/audio_query", params={"text": text, "speaker": 0}).json()
+        for text in texts
+    ]
+    assert response.json() == expected
+
+
+def test_post_audio_query_batch_empty_200(client: TestClient) -> None:
+    response = client.post("/audio_query_batch", params={"speaker": 0}, json=[])
+    assert response.status_code == 200
+    assert response.json() == []
@@ -0,0 +1,70 @@
+"""/cancellable_frame_synthesis API のテスト。"""
+
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from voicevox_engine.app.application import generate_app
+from voicevox_engine.cancellable_engine import CancellableEngine
+
+
+@pytest.fixture
+def cancellable_client(app_params: dict[str, Any]) -> TestClient:
+    app_params["cancellable_engine"] = CancellableEngine(
+        init_processes=1,
+        use_gpu=False,
+        enable_mock=True,
+    )
+    cancellable_app = generate_app(**app_params)
+    return TestClient(cancellable_app)
+
+
+def _gen_frame_query(phoneme: str) -> dict[str, Any]:
+    return {
+        "f0": [0.0, 0.0, 46.6, 46.6, 46.6, 46.6, 0.0, 0.0],
+        "volume": [0.0, 0.0, 0.33, 0.33, 0.33, 0.33, 0.0, 0.0],
+        "phonemes": [
+            {"phoneme": "pau", "frame_length": 2},
+            {"phoneme": "t", "frame_length": 2},
+            {"phoneme": phoneme, "frame_length": 2},
+            {"phoneme": "pau", "frame_length": 2},
+        ],
+        "volumeScale": 1.0,
+        "outputSamplingRate": 24000,
+        "outputStereo": False,
+    }
+
+
+def test_post_cancellable_frame_synthesis_200(
+    cancellable_client: TestClient, client: TestClient
+) -> None:
+    """/frame_synthesis と同じ音声が得られる。"""
+    query = _gen_frame_query("e")
+    response = cancellable_client.post(
+        "/cancellable_frame_synthesis", params={"speaker": 4}, json=query
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/wav"
+
+    expected = client.post("/frame_synthesis", params={"speaker": 4}, json=query)
+    assert response.read() == expected.read()
+
+
+def test_post_cancellable_frame_synthesis_400(cancellable_client: TestClient) -> None:
+    """不正な入力ではサブプロセスのエラーが 400 として返される。"""
+    query = _gen_frame_query("invalid")
+    response = cancellable_client.post(
+        "/cancellable_frame_synthesis", params={"speaker": 4}, json=query
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "phoneme invalid is not valid"}
+
+
+def test_post_cancellable_frame_synthesis_404(client: TestClient) -> None:
+    """キャンセル可能な合成が無効な場合は 404 が返される。"""
+    query = _gen_frame_query("e")
+    response = client.post(
+        "/cancellable_frame_synthesis", params={"speaker": 4}, json=query
+    )
+    assert response.status_code == 404
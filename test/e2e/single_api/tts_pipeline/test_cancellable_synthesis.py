@@ -61,4 +61,53 @@ def test_post_cancellable_synthesis_200(
     assert snapshot == hash_wave_floats_from_wav_bytes(response.read())
 
 
+@pytest.mark.parametrize("shared_memory_size", [0, 1024, 16 * 1024 * 1024])
+@pytest.mark.parametrize("output_stereo", [False, True])
+def test_post_cancellable_synthesis_wave_transfer_200(
+    app_params: dict[str, Any],
+    client: TestClient,
+    shared_memory_size: int,
+    output_stereo: bool,
+) -> None:
+    """共有メモリの有無や容量に依らず、/synthesis と同じ音声が得られる。"""
+    app_params["cancellable_engine"] = CancellableEngine(
+        init_processes=1,
+        use_gpu=False,
+        enable_mock=True,
+        shared_memory_size=shared_memory_size,
+    )
+    cancellable_client = TestClient(generate_app(**app_params))
+    query = {
+        "accent_phrases": [
+            {
+                "moras": [
+                    gen_mora("テ", "t", 0.1, "e", 0.1, 5.0),
+                    gen_mora("ス", "s", 0.1, "U", 0.1, 0.0),
+                    gen_mora("ト", "t", 0.1, "o", 0.1, 5.0),
+                ],
+                "accent": 1,
+                "pause_mora": None,
+                "is_interrogative": False,
+            }
+        ],
+        "speedScale": 1.0,
+        "pitchScale": 0.0,
+        "intonationScale": 1.0,
+        "volumeScale": 1.0,
+        "prePhonemeLength": 0.1,
+        "postPhonemeLength": 0.1,
+        "pauseLength": None,
+        "pauseLengthScale": 1.0,
+        "outputSamplingRate": 44100,
+        "outputStereo": output_stereo,
+    }
+    response = cancellable_client.post(
+        "/cancellable_synthesis", params={"speaker": 0}, json=query
+    )
+    assert response.status_code == 200
+
+    expected = client.post("/synthesis", params={"speaker": 0}, json=query)
+    assert response.read() == expected.read()
+
+
 # TODO: キャンセルするテストを追加する
@@ -0,0 +1,29 @@
+"""/pin_speaker・/unpin_speaker・/model_residency API のテスト。"""
+
+from fastapi.testclient import TestClient
+
+
+def test_pin_and_unpin_speaker(client: TestClient) -> None:
+    response = client.post("/pin_speaker", params={"speaker": 0})
+    assert response.status_code == 204
+    response = client.get("/model_residency")
+    assert response.status_code == 200
+    styles = {s["style_id"]: s for s in response.json()["styles"]}
+    assert styles[0]["pinned"] is True
+
+    response = client.post("/unpin_speaker", params={"speaker": 0})
+    assert response.status_code == 204
+    response = client.get("/model_residency")
+    styles = {s["style_id"]: s for s in response.json()["styles"]}
+    assert styles[0]["pinned"] is False
+
+
+def test_get_model_residency_200(client: TestClient) -> None:
+    response = client.get("/model_residency")
+    assert response.status_code == 200
+    assert response.json()["memory_budget_bytes"] is None
+
+
+def test_pin_speaker_with_not_found_style_422(client: TestClient) -> None:
+    response = client.post("/pin_speaker", params={"speaker": 9999})
+    assert response.status_code == 422
@@ -2,12 +2,14 @@
 
 import io
 import zipfile
+from typing import Any
 
 from fastapi.testclient import TestClient
 from syrupy.assertion import SnapshotAssertion
 
 from test.e2e.single_api.utils import gen_mora
 from test.utility import hash_wave_floats_from_wav_bytes
+from voicevox_engine.app.application import generate_app
 
 
 def test_post_multi_synthesis_200(
@@ -76,3 +78,49 @@ def test_post_multi_synthesis_200(
         wav_files = (zip_file.read(name) for name in zip_file.namelist())
         for wav in wav_files:
             assert snapshot == hash_wave_floats_from_wav_bytes(wav)
+
+
+def _gen_query(n_mora: int, output_sampling_rate: int = 24000) -> dict[str, Any]:
+    return {
+        "accent_phrases": [
+            {
+                "moras": [gen_mora("テ", "t", 0.1, "e", 0.1, 5.0)] * n_mora,
+                "accent": 1,
+                "pause_mora": None,
+                "is_interrogative": False,
+            }
+        ],
+        "speedScale": 1.0,
+        "pitchScale": 0.0,
+        "intonationScale": 1.0,
+        "volumeScale": 1.0,
+        "prePhonemeLength": 0.1,
+        "postPhonemeLength": 0.1,
+        "pauseLength": None,
+        "pauseLengthScale": 1.0,
+        "outputSamplingRate": output_sampling_rate,
+        "outputStereo": False,
+    }
+
+
+def test_post_multi_synthesis_parallel_workers_200(
+    app_params: dict[str, Any],
+) -> None:
+    """複数のワーカーで合成しても、ZIP のエントリはクエリの順に /synthesis の結果と一致する。"""
+    client = TestClient(generate_app(**app_params, multi_synthesis_workers=3))
+    queries = [_gen_query(n_mora) for n_mora in range(1, 8)]
+
+    response = client.post("/multi_synthesis", params={"speaker": 0}, json=queries)
+    assert response.status_code == 200
+
+    with zipfile.ZipFile(io.BytesIO(response.read()), "r") as zip_file:
+        assert zip_file.namelist() == [f"{i:03}.wav" for i in range(1, 8)]
+        for name, query in zip(zip_file.namelist(), queries, strict=True):
+            wav = client.post("/synthesis", params={"speaker": 0}, json=query).read()
+            assert zip_file.read(name) == wav
+
+
+def test_post_multi_synthesis_different_sampling_rate_422(client: TestClient) -> None:
+    queries = [_gen_query(1), _gen_query(1, output_sampling_rate=44100)]
+    response = client.post("/multi_synthesis", params={"speaker": 0}, json=queries)
+    assert response.status_code == 422
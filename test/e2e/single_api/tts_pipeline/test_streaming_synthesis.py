@@ -0,0 +1,73 @@
+"""/streaming_synthesis API のテスト。"""
+
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+from test.e2e.single_api.utils import gen_mora
+
+
+def _gen_query() -> dict[str, Any]:
+    return {
+        "accent_phrases": [
+            {
+                "moras": [
+                    gen_mora("テ", "t", 2.3, "e", 0.8, 3.3),
+                    gen_mora("ス", "s", 2.1, "U", 0.3, 0.0),
+                    gen_mora("ト", "t", 2.3, "o", 1.8, 4.1),
+                ],
+                "accent": 1,
+                "pause_mora": None,
+                "is_interrogative": False,
+            }
+        ],
+        "speedScale": 1.0,
+        "pitchScale": 1.0,
+        "intonationScale": 1.0,
+        "volumeScale": 1.0,
+        "prePhonemeLength": 0.1,
+        "postPhonemeLength": 0.1,
+        "pauseLength": None,
+        "pauseLengthScale": 1.0,
+        "outputSamplingRate": 24000,
+        "outputStereo": False,
+        "kana": "テ'_スト",
+    }
+
+
+def test_post_streaming_synthesis_200(client: TestClient) -> None:
+    query = _gen_query()
+    response = client.post("/streaming_synthesis", params={"speaker": 0}, json=query)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/wav"
+
+    # PCM が /synthesis と一致する
+    synthesis_response = client.post("/synthesis", params={"speaker": 0}, json=query)
+    wav_header_size = 44
+    assert response.read()[:4] == b"RIFF"
+    assert (
+        response.read()[wav_header_size:] == synthesis_response.read()[wav_header_size:]
+    )
+
+
+def test_post_streaming_synthesis_pcm_200(client: TestClient) -> None:
+    query = _gen_query()
+    response = client.post(
+        "/streaming_synthesis",
+        params={"speaker": 0, "audio_format": "pcm"},
+        json=query,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/L16;rate=24000;channels=1"
+
+    # PCM が /synthesis と一致する
+    synthesis_response = client.post("/synthesis", params={"speaker": 0}, json=query)
+    wav_header_size = 44
+    assert response.read() == synthesis_response.read()[wav_header_size:]
+
+
+def test_post_streaming_synthesis_invalid_style_422(client: TestClient) -> None:
+    response = client.post(
+        "/streaming_synthesis", params={"speaker": 99999}, json=_gen_query()
+    )
+    assert response.status_code == 422
@@ -0,0 +1,51 @@
+"""音声合成リクエストの受け付け制御のテスト。"""
+
+import asyncio
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+from voicevox_engine.admission_scheduler import AdmissionScheduler
+from voicevox_engine.app.application import generate_app
+
+
+def test_admission_control_503(app_params: dict[str, Any]) -> None:
+    """期限までに受け付けられないリクエストには Retry-After 付きの 503 が返される。"""
+    scheduler = AdmissionScheduler(max_concurrency=1)
+    client = TestClient(generate_app(**app_params, admission_scheduler=scheduler))
+
+    # 枠が空いていればリクエストは処理される
+    response = client.post("/audio_query", params={"text": "テスト", "speaker": 0})
+    assert response.status_code == 200
+
+    # 枠が埋まっている間、期限付きのリクエストは拒否される
+    ticket = asyncio.run(scheduler.acquire("normal"))
+    response = client.post(
+        "/audio_query",
+        params={"text": "テスト", "speaker": 0},
+        headers={"X-Priority-Class": "interactive", "X-Deadline-Ms": "50"},
+    )
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    scheduler.release(ticket)
+
+    # 受け付け制御の対象外の API は枠に依らず処理される
+    ticket = asyncio.run(scheduler.acquire("normal"))
+    response = client.get("/version")
+    assert response.status_code == 200
+    scheduler.release(ticket)
+
+    stats = scheduler.stats()
+    assert stats.running == 0
+    assert stats.classes["interactive"].rejected == 1
+    assert stats.classes["normal"].admitted == 3
+
+
+def test_admission_control_disabled_ignores_headers(client: TestClient) -> None:
+    """受け付け制御が無効な場合、優先度や期限のヘッダーは検証されずに無視される。"""
+    response = client.post(
+        "/audio_query",
+        params={"text": "テスト", "speaker": 0},
+        headers={"X-Priority-Class": "high", "X-Deadline-Ms": "not-a-number"},
+    )
+    assert response.status_code == 200
@@ -0,0 +1,47 @@
+"""/metrics API のテスト。"""
+
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+from voicevox_engine.app.application import generate_app
+from voicevox_engine.metrics import disable_metrics, enable_metrics
+
+
+def test_metrics_disabled_404(client: TestClient) -> None:
+    """計測が有効化されていない場合、/metrics は公開されない。"""
+    response = client.get("/metrics")
+    assert response.status_code == 404
+
+
+def test_metrics_stage_timings(app_params: dict[str, Any]) -> None:
+    """計測を有効化すると、音声合成の処理段階ごとの所要時間と統計情報が Prometheus テキスト形式で公開される。"""
+    client = TestClient(generate_app(**app_params, metrics_registry=enable_metrics()))
+    try:
+        query = client.post(
+            "/audio_query", params={"text": "テストです", "speaker": 0}
+        ).json()
+        response = client.post("/synthesis", params={"speaker": 0}, json=query)
+        assert response.status_code == 200
+
+        response = client.get("/metrics")
+    finally:
+        disable_metrics()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    for stage in ["yukarin_s", "yukarin_sa", "decode", "postprocess"]:
+        assert any(
+            line.startswith("voicevox_stage_duration_seconds_count")
+            and f'stage="{stage}",style_id="0",core_version="' in line
+            for line in lines
+        ), stage
+    assert any(
+        line.startswith('voicevox_stage_duration_seconds_count{stage="wav_encoding"}')
+        for line in lines
+    )
+    assert any(line.startswith("voicevox_accent_phrase_cache_hits") for line in lines)
+    assert any(
+        line.startswith("voicevox_core_scheduler_deduplicated_calls") for line in lines
+    )
@@ -0,0 +1,32 @@
+"""/profiler API のテスト。"""
+
+from pathlib import Path
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+from voicevox_engine.app.application import generate_app
+from voicevox_engine.request_profiler import RequestProfiler
+
+
+def test_profiler_enable_via_api(app_params: dict[str, Any], tmp_path: Path) -> None:
+    """API でプロファイリングを有効化すると、以降のリクエストがプロファイリングの対象となる。"""
+    profiler = RequestProfiler(tmp_path / "profiles")
+    client = TestClient(generate_app(**app_params, request_profiler=profiler))
+
+    response = client.get("/profiler")
+    assert response.status_code == 200
+    assert response.json()["sample_rate"] == 0.0
+
+    client.post("/audio_query", params={"text": "テストです", "speaker": 0})
+    assert profiler.stats().profiled_requests == 0
+
+    response = client.put("/profiler", params={"sample_rate": 1.0})
+    assert response.status_code == 204
+    client.post("/audio_query", params={"text": "テストです", "speaker": 0})
+    response = client.get("/profiler")
+    # NOTE: 状態の取得リクエスト自身も対象となる
+    assert response.json()["profiled_requests"] >= 1
+
+    response = client.put("/profiler", params={"sample_rate": 2.0})
+    assert response.status_code == 422
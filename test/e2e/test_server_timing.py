@@ -0,0 +1,75 @@
+"""Server-Timing ヘッダーとリクエストごとの処理段階のログのテスト。"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+from voicevox_engine.app.application import generate_app
+from voicevox_engine.tts_pipeline.accent_phrase_cache import accent_phrase_cache
+
+
+def test_server_timing_header(app_params: dict[str, Any]) -> None:
+    """有効化された場合、処理段階を持つ API は Server-Timing ヘッダーで段階ごとの所要時間を返す。"""
+    client = TestClient(generate_app(**app_params, enable_server_timing=True))
+    # NOTE: テキスト解析の結果がキャッシュされていると解析の処理段階が実行されない
+    accent_phrase_cache.invalidate()
+    response = client.post("/audio_query", params={"text": "テストです", "speaker": 0})
+    assert response.status_code == 200
+    stages = [m.split(";")[0] for m in response.headers["Server-Timing"].split(", ")]
+    assert stages[:4] == ["text_analysis", "label_parsing", "yukarin_s", "yukarin_sa"]
+    assert stages[-1] == "total"
+
+    response = client.post("/synthesis", params={"speaker": 0}, json=response.json())
+    assert response.status_code == 200
+    stages = [m.split(";")[0] for m in response.headers["Server-Timing"].split(", ")]
+    assert stages == ["decode", "postprocess", "wav_encoding", "total"]
+
+    response = client.get("/version")
+    assert "Server-Timing" not in response.headers
+
+    origin = "http://localhost:3000"
+    response = client.post(
+        "/audio_query",
+        params={"text": "テストです", "speaker": 0},
+        headers={"Origin": origin},
+    )
+    assert response.headers["Access-Control-Expose-Headers"] == "Server-Timing"
+
+
+def test_server_timing_header_disabled_by_default(client: TestClient) -> None:
+    """有効化されていない場合、Server-Timing ヘッダーを返さず、CORS でも公開しない。"""
+    accent_phrase_cache.invalidate()
+    response = client.post(
+        "/audio_query",
+        params={"text": "テストです", "speaker": 0},
+        headers={"Origin": "http://localhost:3000"},
+    )
+    assert response.status_code == 200
+    assert "Server-Timing" not in response.headers
+    assert "Access-Control-Expose-Headers" not in response.headers
+
+
+def test_request_trace_log(app_params: dict[str, Any], tmp_path: Path) -> None:
+    """ログが指定された場合、処理段階を持つリクエストごとに全ての処理段階が 1 行ずつ書き出される。"""
+    log_path = tmp_path / "trace" / "request_trace.log"
+    client = TestClient(generate_app(**app_params, request_trace_log=log_path))
+
+    accent_phrase_cache.invalidate()
+    client.get("/version")
+    response = client.post("/audio_query", params={"text": "テストです", "speaker": 0})
+    assert response.status_code == 200
+    assert "Server-Timing" not in response.headers
+
+    entries = [json.loads(line) for line in log_path.read_text("utf-8").splitlines()]
+    assert len(entries) == 1
+    assert entries[0]["path"] == "/audio_query"
+    assert entries[0]["status"] == 200
+    stages = entries[0]["stages"]
+    assert [stage["stage"] for stage in stages][:2] == [
+        "text_analysis",
+        "label_parsing",
+    ]
+    assert stages[2]["style_id"] == 0
+    assert all(not stage["failed"] for stage in stages)
@@ -0,0 +1,105 @@
+"""AdmissionScheduler のテスト"""
+
+import asyncio
+
+import pytest
+
+from voicevox_engine.admission_scheduler import (
+    AdmissionRejected,
+    AdmissionScheduler,
+    PriorityClass,
+)
+
+
+def test_admission_scheduler_weighted_fair_order() -> None:
+    """空きを待つリクエストは、重みの大きい優先度クラスほど先に受け付けられる。"""
+    # Inputs
+    scheduler = AdmissionScheduler(max_concurrency=1)
+    arrivals: list[PriorityClass] = ["batch", "batch", "interactive", "interactive"]
+    admitted: list[PriorityClass] = []
+
+    async def wait_and_run(priority_class: PriorityClass) -> None:
+        ticket = await scheduler.acquire(priority_class)
+        admitted.append(priority_class)
+        await asyncio.sleep(0)
+        scheduler.release(ticket)
+
+    async def run_all() -> None:
+        # NOTE: 1 件目が枠を占有している間に、残りのリクエストが空きを待つ
+        first = await scheduler.acquire("normal")
+        tasks = [asyncio.create_task(wait_and_run(c)) for c in arrivals]
+        while scheduler.stats().classes["batch"].queued < 2:
+            await asyncio.sleep(0)
+        while scheduler.stats().classes["interactive"].queued < 2:
+            await asyncio.sleep(0)
+        scheduler.release(first)
+        await asyncio.gather(*tasks)
+
+    # Outputs
+    asyncio.run(run_all())
+    stats = scheduler.stats()
+
+    # Tests
+    assert admitted == ["interactive", "interactive", "batch", "batch"]
+    assert stats.running == 0
+    assert stats.classes["batch"].admitted == 2
+    assert stats.classes["batch"].queue_wait_seconds_total > 0
+    assert stats.classes["normal"].max_queue_wait_seconds == 0
+
+
+def test_admission_scheduler_reject_early() -> None:
+    """処理時間の見積もりから期限に間に合わないリクエストは、待たずに拒否される。"""
+    # Inputs
+    scheduler = AdmissionScheduler(max_concurrency=1)
+
+    async def run() -> AdmissionRejected:
+        ticket = await scheduler.acquire("normal")
+        await asyncio.sleep(0.1)
+        scheduler.release(ticket)
+
+        ticket = await scheduler.acquire("normal")
+        try:
+            with pytest.raises(AdmissionRejected) as e:
+                await scheduler.acquire("interactive", deadline_sec=0.05)
+        finally:
+            scheduler.release(ticket)
+        return e.value
+
+    # Outputs
+    rejected = asyncio.run(run())
+    stats = scheduler.stats()
+
+    # Tests
+    assert rejected.retry_after > 0
+    assert stats.classes["interactive"].rejected == 1
+    assert stats.classes["interactive"].queued == 0
+
+
+def test_admission_scheduler_reject_on_deadline() -> None:
+    """空きを待つ間に期限を過ぎたリクエストは拒否され、待ち行列から取り除かれる。"""
+    # Inputs
+    scheduler = AdmissionScheduler(max_concurrency=1)
+
+    async def run() -> None:
+        ticket = await scheduler.acquire("normal")
+        try:
+            with pytest.raises(AdmissionRejected):
+                await scheduler.acquire("batch", deadline_sec=0.05)
+        finally:
+            scheduler.release(ticket)
+
+    # Outputs
+    asyncio.run(run())
+    stats = scheduler.stats()
+
+    # Tests
+    assert stats.running == 0
+    assert stats.classes["batch"].rejected == 1
+    assert stats.classes["batch"].queued == 0
+    assert stats.classes["batch"].admitted == 0
+
+
+def test_admission_scheduler_invalid_max_concurrency() -> None:
+    """同時に処理するリクエスト数の上限は 1 以上でなければならない。"""
+    with pytest.raises(ValueError, match="max_concurrency"):
+        AdmissionScheduler(max_concurrency=0)
@@ -0,0 +1,357 @@
+"""CancellableEngine のテスト"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from unittest.mock import MagicMock
+
+import psutil
+import pytest
+from fastapi import Request
+from starlette.types import Message
+
+from voicevox_engine.cancellable_engine import (
+    CancellableEngine,
+    CancellableEngineInternalError,
+    _receive_wave,
+)
+from voicevox_engine.metas.metas import StyleId
+from voicevox_engine.model import AudioQuery
+from voicevox_engine.tts_pipeline.model import AccentPhrase, Mora
+
+
+def _gen_query() -> AudioQuery:
+    mora = Mora(
+        text="テ",
+        consonant="t",
+        consonant_length=0.1,
+        vowel="e",
+        vowel_length=0.1,
+        pitch=5.0,
+    )
+    return AudioQuery(
+        accent_phrases=[AccentPhrase(moras=[mora], accent=1)],
+        speedScale=1.0,
+        pitchScale=0.0,
+        intonationScale=1.0,
+        volumeScale=1.0,
+        prePhonemeLength=0.1,
+        postPhonemeLength=0.1,
+        pauseLength=None,
+        pauseLengthScale=1.0,
+        outputSamplingRate=24000,
+        outputStereo=False,
+    )
+
+
+# プロセスプールの状態の変化を待つ時間の上限（秒）
+_WAIT_TIMEOUT = 60.0
+
+
+def _gen_long_query() -> AudioQuery:
+    """中止までに合成が終わらないよう、長い音声用のクエリを生成する。"""
+    query = _gen_query()
+    query.accent_phrases = query.accent_phrases * 1000
+    return query
+
+
+def _gen_busy_query() -> AudioQuery:
+    """他のリクエストが空きプロセスを待ち始めるまでに合成が終わらないよう、数秒かかる音声用のクエリを生成する。"""
+    query = _gen_query()
+    query.accent_phrases = query.accent_phrases * 300
+    return query
+
+
+def _child_pids() -> set[int]:
+    """このプロセスから起動されたプロセスの PID を取得する。"""
+    return {child.pid for child in psutil.Process().children()}
+
+
+def test_cancellable_engine_scale_out_and_reap() -> None:
+    """空きプロセスを待つリクエストがあるとプロセスが追加で起動され、待機時間を超過すると終了される。"""
+    # Inputs
+    engine = CancellableEngine(
+        init_processes=1,
+        use_gpu=False,
+        enable_mock=True,
+        max_processes=2,
+        idle_timeout=1.0,
+    )
+    query = _gen_query()
+
+    def synthesize(_: int) -> bytes | memoryview:
+        return engine.synthesize_wave(query, StyleId(0), True, MagicMock(), "0.0.0")
+
+    # Outputs
+    # NOTE: 最初のプロセスの起動中に 2 件のリクエストが空きを待つため、プロセスが追加で起動される
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        wavs = list(executor.map(synthesize, range(2)))
+    # NOTE: 追加のプロセスが起動し終える前に、最初のプロセスが両方のリクエストを処理しうる
+    scaled_stats = engine.wait_for_stats(lambda s: s.starting == 0, _WAIT_TIMEOUT)
+    reaped_stats = engine.wait_for_stats(lambda s: s.reaped > 0, _WAIT_TIMEOUT)
+
+    # Tests
+    assert all(len(wav) > 0 for wav in wavs)
+    assert scaled_stats.spawned == 2
+    assert scaled_stats.active == 0
+    assert scaled_stats.idle == 2
+    assert scaled_stats.queued == 0
+    assert scaled_stats.spawn_seconds_total > 0
+    assert reaped_stats.reaped == 1
+    assert reaped_stats.idle == 1
+
+
+def test_cancellable_engine_invalid_max_processes() -> None:
+    """最大プロセス数は初期プロセス数以上でなければならない。"""
+    with pytest.raises(ValueError, match="max_processes"):
+        CancellableEngine(init_processes=2, use_gpu=False, max_processes=1)
+
+
+def test_cancellable_engine_wait_for_stats_timeout() -> None:
+    """プロセスプールの状態が待機時間の上限までに条件を満たさない場合はエラーとなる。"""
+    # Inputs
+    engine = CancellableEngine(init_processes=1, use_gpu=False, enable_mock=True)
+    engine.wait_for_stats(lambda s: s.idle == 1, _WAIT_TIMEOUT)
+
+    # Tests
+    with pytest.raises(TimeoutError):
+        engine.wait_for_stats(lambda s: s.idle == 2, timeout=0.1)
+
+
+def test_cancellable_engine_promote_standby() -> None:
+    """キャンセルで終了したプロセスは、起動済みの予備プロセスで即座に置き換えられる。"""
+    # Inputs
+    engine = CancellableEngine(
+        init_processes=1,
+        use_gpu=False,
+        enable_mock=True,
+        standby_processes=1,
+    )
+    query = _gen_long_query()
+    engine.wait_for_stats(lambda s: s.idle == 1 and s.standby == 1, _WAIT_TIMEOUT)
+
+    async def synthesize_and_cancel() -> None:
+        synthesis = asyncio.create_task(
+            engine.synthesize_wave_async(query, StyleId(0), True, MagicMock(), "0.0.0")
+        )
+        await asyncio.to_thread(
+            engine.wait_for_stats, lambda s: s.active == 1, _WAIT_TIMEOUT
+        )
+        synthesis.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await synthesis
+
+    # Outputs
+    asyncio.run(synthesize_and_cancel())
+    promoted_stats = engine.stats()
+    replenished_stats = engine.wait_for_stats(lambda s: s.standby == 1, _WAIT_TIMEOUT)
+
+    # Tests
+    assert promoted_stats.promoted == 1
+    assert promoted_stats.idle == 1
+    assert promoted_stats.starting == 0
+    assert replenished_stats.standby == 1
+
+
+def test_cancellable_engine_cancel_on_disconnection() -> None:
+    """監視中のリクエストが切断されると、そのリクエストの音声合成が即座に中止される。"""
+    # Inputs
+    engine = CancellableEngine(init_processes=1, use_gpu=False, enable_mock=True)
+    query = _gen_long_query()
+    disconnected = asyncio.Event()
+
+    async def receive() -> Message:
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def synthesize_and_disconnect() -> None:
+        request = Request({"type": "http"}, receive)
+        async with engine.watch_disconnection(request):
+            synthesis = asyncio.create_task(
+                asyncio.to_thread(
+                    engine.synthesize_wave, query, StyleId(0), True, request, "0.0.0"
+                )
+            )
+            await asyncio.to_thread(
+                engine.wait_for_stats, lambda s: s.active == 1, _WAIT_TIMEOUT
+            )
+            disconnected.set()
+            with pytest.raises(CancellableEngineInternalError):
+                await synthesis
+
+    # Outputs
+    asyncio.run(synthesize_and_disconnect())
+    stats = engine.stats()
+
+    # Tests
+    assert stats.cancelled == 1
+    assert stats.active == 0
+    assert stats.last_cancel_latency_seconds is not None
+    assert stats.last_cancel_latency_seconds < 1.0
+
+
+def test_cancellable_engine_disconnect_while_queued() -> None:
+    """空きプロセスを待つ間に切断されたリクエストは、取得したプロセスを終了せずに待機中プールへ戻す。"""
+    # Inputs
+    engine = CancellableEngine(init_processes=1, use_gpu=False, enable_mock=True)
+    engine.wait_for_stats(lambda s: s.idle == 1, _WAIT_TIMEOUT)
+    busy_query = _gen_busy_query()
+    query = _gen_query()
+    true_pids = _child_pids()
+    disconnected = asyncio.Event()
+
+    async def receive() -> Message:
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def disconnect_while_queued() -> None:
+        busy = asyncio.create_task(
+            asyncio.to_thread(
+                engine.synthesize_wave,
+                busy_query,
+                StyleId(0),
+                True,
+                MagicMock(),
+                "0.0.0",
+            )
+        )
+        await asyncio.to_thread(
+            engine.wait_for_stats, lambda s: s.active == 1, _WAIT_TIMEOUT
+        )
+        request = Request({"type": "http"}, receive)
+        async with engine.watch_disconnection(request):
+            queued = asyncio.create_task(
+                asyncio.to_thread(
+                    engine.synthesize_wave, query, StyleId(0), True, request, "0.0.0"
+                )
+            )
+            await asyncio.to_thread(
+                engine.wait_for_stats, lambda s: s.queued == 1, _WAIT_TIMEOUT
+            )
+            disconnected.set()
+            with pytest.raises(CancellableEngineInternalError):
+                await queued
+        await busy
+
+    # Outputs
+    asyncio.run(disconnect_while_queued())
+    stats = engine.wait_for_stats(lambda s: s.active == 0, _WAIT_TIMEOUT)
+
+    # Tests
+    assert stats.idle == 1
+    assert stats.spawned == 1
+    assert _child_pids() == true_pids
+
+
+def test_cancellable_engine_synthesize_wave_async() -> None:
+    """非同期版の音声合成は、空きプロセスを待つ多数のリクエストを同期版と同じ結果で処理する。"""
+    # Inputs
+    engine = CancellableEngine(init_processes=1, use_gpu=False, enable_mock=True)
+    query = _gen_query()
+    true_wav = engine.synthesize_wave(query, StyleId(0), True, MagicMock(), "0.0.0")
+
+    async def synthesize_all() -> list[bytes | memoryview]:
+        return await asyncio.gather(
+            *(
+                engine.synthesize_wave_async(
+                    query, StyleId(0), True, MagicMock(), "0.0.0"
+                )
+                for _ in range(20)
+            )
+        )
+
+    # Outputs
+    wavs = asyncio.run(synthesize_all())
+    stats = engine.stats()
+
+    # Tests
+    assert all(bytes(wav) == bytes(true_wav) for wav in wavs)
+    assert stats.active == 0
+    assert stats.idle == 1
+    assert stats.queued == 0
+
+
+def test_cancellable_engine_synthesize_wave_async_disconnect_while_queued() -> None:
+    """非同期版でも、空きプロセスを待つ間に切断されたリクエストは取得したプロセスを待機中プールへ戻す。"""
+    # Inputs
+    engine = CancellableEngine(init_processes=1, use_gpu=False, enable_mock=True)
+    engine.wait_for_stats(lambda s: s.idle == 1, _WAIT_TIMEOUT)
+    busy_query = _gen_busy_query()
+    query = _gen_query()
+    true_pids = _child_pids()
+    disconnected = asyncio.Event()
+
+    async def receive() -> Message:
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def disconnect_while_queued() -> None:
+        busy = asyncio.create_task(
+            engine.synthesize_wave_async(
+                busy_query, StyleId(0), True, MagicMock(), "0.0.0"
+            )
+        )
+        await asyncio.to_thread(
+            engine.wait_for_stats, lambda s: s.active == 1, _WAIT_TIMEOUT
+        )
+        request = Request({"type": "http"}, receive)
+        async with engine.watch_disconnection(request):
+            queued = asyncio.create_task(
+                engine.synthesize_wave_async(query, StyleId(0), True, request, "0.0.0")
+            )
+            await asyncio.to_thread(
+                engine.wait_for_stats, lambda s: s.queued == 1, _WAIT_TIMEOUT
+            )
+            disconnected.set()
+            with pytest.raises(CancellableEngineInternalError):
+                await queued
+        await busy
+
+    # Outputs
+    asyncio.run(disconnect_while_queued())
+    stats = engine.wait_for_stats(lambda s: s.active == 0, _WAIT_TIMEOUT)
+
+    # Tests
+    assert stats.idle == 1
+    assert stats.spawned == 1
+    assert _child_pids() == true_pids
+
+
+def test_cancellable_engine_synthesize_wave_async_cancel() -> None:
+    """非同期版の音声合成が取り消されると、音声合成を行っていたプロセスが終了される。"""
+    # Inputs
+    engine = CancellableEngine(init_processes=1, use_gpu=False, enable_mock=True)
+    query = _gen_long_query()
+
+    async def synthesize_and_cancel() -> None:
+        synthesis = asyncio.create_task(
+            engine.synthesize_wave_async(query, StyleId(0), True, MagicMock(), "0.0.0")
+        )
+        await asyncio.to_thread(
+            engine.wait_for_stats, lambda s: s.active == 1, _WAIT_TIMEOUT
+        )
+        synthesis.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await synthesis
+
+    # Outputs
+    asyncio.run(synthesize_and_cancel())
+    cancelled_stats = engine.stats()
+    respawned_stats = engine.wait_for_stats(lambda s: s.idle == 1, _WAIT_TIMEOUT)
+
+    # Tests
+    assert cancelled_stats.active == 0
+    assert respawned_stats.idle == 1
+    assert respawned_stats.spawned == 2
+
+
+def test_receive_wave_from_closed_shared_memory() -> None:
+    """切断による中止で閉じられた共有メモリからは、音声波形を受け取らずにエラーを送出する。"""
+    # Inputs
+    shared_memory = SharedMemory(create=True, size=1024)
+    shared_memory.close()
+    shared_memory.unlink()
+
+    # Tests
+    with pytest.raises(CancellableEngineInternalError, match="共有メモリ"):
+        _receive_wave(MagicMock(), shared_memory, ((100,), True))
@@ -0,0 +1,73 @@
+"""CoreAdapter のテスト"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from numpy.typing import NDArray
+
+from voicevox_engine.core.core_adapter import CoreAdapter
+from voicevox_engine.dev.core.mock import MockCoreWrapper
+from voicevox_engine.metas.metas import StyleId
+from voicevox_engine.metrics import StageSpan, trace_request
+
+
+class _BlockingCore(MockCoreWrapper):
+    """全インスタンスの推論が同時に実行されるまで推論を終えないコア"""
+
+    def __init__(self, barrier: threading.Barrier) -> None:
+        super().__init__()
+        self._barrier = barrier
+
+    def yukarin_s_forward(
+        self,
+        length: int,
+        phoneme_list: NDArray[np.int64],
+        style_id: NDArray[np.int64],
+    ) -> NDArray[np.float32]:
+        self._barrier.wait(timeout=5)
+        return super().yukarin_s_forward(length, phoneme_list, style_id)
+
+
+def test_core_adapter_run_inference_in_parallel_on_instances() -> None:
+    """複数のインスタンスを持つ場合、並行した推論呼び出しは別々のインスタンスで同時に実行される。"""
+    # Inputs
+    n_instances = 3
+    barrier = threading.Barrier(n_instances)
+    core = CoreAdapter([_BlockingCore(barrier) for _ in range(n_instances)])
+    phoneme_list = np.array([1, 2, 3], dtype=np.int64)
+    # Outputs
+    with ThreadPoolExecutor(n_instances) as executor:
+        futures = [
+            executor.submit(core.safe_yukarin_s_forward, phoneme_list, StyleId(0))
+            for _ in range(n_instances)
+        ]
+        results = [future.result(timeout=10) for future in futures]
+    # Tests
+    assert core.n_instances == n_instances
+    for result in results:
+        np.testing.assert_array_equal(result, results[0])
+
+
+def test_core_adapter_stage_timer_excludes_batch_window() -> None:
+    """推論の所要時間は、取りまとめの待ち時間を含まず、呼び出し元のリクエストに記録される。"""
+    # Inputs
+    batch_window_sec = 0.5
+    core = CoreAdapter(
+        MockCoreWrapper(), batch_window_sec=batch_window_sec, max_batch_size=3
+    )
+
+    def run(phoneme: int) -> list[StageSpan]:
+        with trace_request() as trace:
+            phoneme_list = np.array([phoneme], dtype=np.int64)
+            core.safe_yukarin_s_forward(phoneme_list, StyleId(0))
+        return trace.spans()
+
+    # Outputs
+    with ThreadPoolExecutor(2) as executor:
+        futures = [executor.submit(run, phoneme) for phoneme in (1, 2)]
+        spans = [future.result(timeout=10) for future in futures]
+    # Tests
+    for request_spans in spans:
+        assert [span.stage for span in request_spans] == ["yukarin_s"]
+        assert request_spans[0].seconds < batch_window_sec
@@ -1,5 +1,7 @@
 """`core_initializer.py` のテスト"""
 
+import os
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
@@ -8,8 +10,12 @@ from voicevox_engine.core.core_adapter import CoreAdapter
 from voicevox_engine.core.core_initializer import (
     CoreManager,
     CoreNotFound,
+    _CoreManifestCache,
     _determine_default_cpu_num_threads,
+    determine_core_pool_size,
+    initialize_cores,
 )
+from voicevox_engine.core.core_wrapper import LazyCoreWrapper, OldCoreError
 from voicevox_engine.dev.core.mock import MockCoreWrapper
 
 
@@ -153,3 +159,205 @@ def test_determine_default_cpu_num_threads(
 
     # Test
     assert expected == cpu_num_threads
+
+
+@pytest.mark.parametrize(
+    ("core_instances", "cpu_num_threads", "expected"),
+    [
+        (4, None, (4, 2)),
+        (3, 0, (3, 2)),
+        (0, 4, (2, 4)),
+        (0, None, (4, 2)),
+        (2, 2, (2, 2)),
+    ],
+)
+def test_determine_core_pool_size(
+    core_instances: int, cpu_num_threads: int | None, expected: tuple[int, int]
+) -> None:
+    """determine_core_pool_size() でインスタンス数と推論スレッド数を物理コア数に収まるよう決定できる。"""
+    # Outputs
+    with patch(
+        "psutil.cpu_count",
+        side_effect=lambda logical=True: 16 if logical else 8,
+    ):
+        pool_size = determine_core_pool_size(core_instances, cpu_num_threads)
+
+    # Test
+    assert expected == pool_size
+
+
+def test_initialize_cores_with_core_instances() -> None:
+    """initialize_cores() で指定された数のインスタンスを持つコアを生成できる。"""
+    # Outputs
+    core_manager = initialize_cores(
+        use_gpu=False, enable_mock=True, cpu_num_threads=1, core_instances=3
+    )
+    core = core_manager.get_core(core_manager.latest_version())
+
+    # Test
+    assert core.n_instances == 3
+
+
+def test_core_manifest_cache_round_trip(tmp_path: Path) -> None:
+    """_CoreManifestCache でコアの情報を保存・復元でき、コアが更新されると無効になる。"""
+    # Inputs
+    core_dir = tmp_path / "core"
+    core_dir.mkdir()
+    (core_dir / "libvoicevox_core.so").write_bytes(b"v1")
+    cache_path = tmp_path / "core_manifest_cache.json"
+    core = MockCoreWrapper()
+    # Outputs
+    cache = _CoreManifestCache(cache_path)
+    cache.put(core_dir, False, core)
+    cache.save()
+    restored = _CoreManifestCache(cache_path)
+    manifest = restored.get(core_dir, False)
+    manifest_gpu = restored.get(core_dir, True)
+    (core_dir / "libvoicevox_core.so").write_bytes(b"v2-updated")
+    manifest_updated = restored.get(core_dir, False)
+
+    # Test
+    assert manifest is not None
+    assert manifest.metas == core.metas()
+    assert manifest.supported_devices == core.supported_devices()
+    assert manifest_gpu is None
+    assert manifest_updated is None
+
+
+def test_lazy_core_wrapper_does_not_load_core_for_metas(tmp_path: Path) -> None:
+    """LazyCoreWrapper はキャラクターメタ情報の取得ではコアを読み込まない。"""
+    # Inputs
+    metas = MockCoreWrapper().metas()
+    core = LazyCoreWrapper(False, tmp_path, metas=metas, supported_devices=None)
+    # Outputs
+    version = CoreAdapter(core).version
+
+    # Test
+    assert version == "mock"
+    assert not core.is_loaded
+    assert not core.is_model_loaded(0)
+    with pytest.raises(OldCoreError):
+        core.supported_devices()
+
+
+def test_initialize_cores_skip_duplicated_version(tmp_path: Path) -> None:
+    """initialize_cores() は並列に読み込んだコアを指定順に登録し、バージョンが重複するコアを読み飛ばす。"""
+    # Inputs
+    voicelib_dirs = [tmp_path / "core1", tmp_path / "core2"]
+    created_cores: dict[Path, MockCoreWrapper] = {}
+
+    def create_core(use_gpu: bool, core_dir: Path, *args: object) -> MockCoreWrapper:
+        return created_cores.setdefault(core_dir, MockCoreWrapper())
+
+    # Outputs
+    with (
+        patch(
+            "voicevox_engine.core.core_initializer.CoreWrapper",
+            side_effect=create_core,
+        ),
+        patch(
+            "voicevox_engine.core.core_initializer.get_save_dir",
+            return_value=tmp_path,
+        ),
+        pytest.warns(UserWarning, match="version duplication"),
+    ):
+        core_manager = initialize_cores(
+            use_gpu=False,
+            voicelib_dirs=voicelib_dirs,
+            cpu_num_threads=1,
+            enable_mock=False,
+        )
+
+    # Test
+    assert core_manager.versions() == ["mock"]
+    assert (
+        core_manager.get_core("mock").core is created_cores[voicelib_dirs[0].resolve()]
+    )
+
+
+def test_initialize_cores_resolve_relative_voicelib_dirs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """initialize_cores() は、並行した初期化がカレントディレクトリを変更しても、相対パスで指定されたコアを読み込める。"""
+    # Inputs
+    for name in ("core1", "core2", "save"):
+        (tmp_path / name).mkdir()
+    monkeypatch.chdir(tmp_path)
+    voicelib_dirs = [Path("core1"), Path("core2")]
+    core_dirs: list[Path] = []
+
+    def create_core(use_gpu: bool, core_dir: Path, *args: object) -> MockCoreWrapper:
+        if not core_dir.is_dir():
+            raise RuntimeError("コアが見つかりません")
+        core_dirs.append(core_dir)
+        # NOTE: v0.12 より前のコアの初期化と同様に、カレントディレクトリを変更する
+        os.chdir(core_dir)
+        return MockCoreWrapper()
+
+    # Outputs
+    with (
+        patch(
+            "voicevox_engine.core.core_initializer.CoreWrapper",
+            side_effect=create_core,
+        ),
+        patch(
+            "voicevox_engine.core.core_initializer.get_save_dir",
+            return_value=tmp_path / "save",
+        ),
+        pytest.warns(UserWarning, match="version duplication"),
+    ):
+        initialize_cores(
+            use_gpu=False,
+            voicelib_dirs=voicelib_dirs,
+            cpu_num_threads=1,
+            enable_mock=False,
+        )
+
+    # Test
+    assert (tmp_path / "core1").resolve() in core_dirs
+    assert (tmp_path / "core2").resolve() in core_dirs
+
+
+@pytest.mark.parametrize(
+    ("version_0_12_or_later", "expected_lazy"), [(True, True), (False, False)]
+)
+def test_initialize_cores_lazy_load_only_version_0_12_or_later(
+    tmp_path: Path, version_0_12_or_later: bool, expected_lazy: bool
+) -> None:
+    """initialize_cores() はキャッシュがあっても v0.12 より前のコアを起動時に初期化する。"""
+    # Inputs
+    core_dir = tmp_path / "core"
+    core_dir.mkdir()
+    (core_dir / "libvoicevox_core.so").write_bytes(b"v1")
+    cache = _CoreManifestCache(tmp_path / "core_manifest_cache.json")
+    cache.put(core_dir, False, MockCoreWrapper())
+    cache.save()
+
+    # Outputs
+    with (
+        patch(
+            "voicevox_engine.core.core_initializer.CoreWrapper",
+            side_effect=lambda *args, **kwargs: MockCoreWrapper(),
+        ) as core_wrapper,
+        patch(
+            "voicevox_engine.core.core_initializer.is_core_version_0_12_or_later",
+            return_value=version_0_12_or_later,
+        ),
+        patch(
+            "voicevox_engine.core.core_initializer.get_save_dir",
+            return_value=tmp_path,
+        ),
+    ):
+        core_manager = initialize_cores(
+            use_gpu=False,
+            voicelib_dirs=[core_dir],
+            cpu_num_threads=1,
+            enable_mock=False,
+            lazy_load=True,
+        )
+
+    # Test
+    core = core_manager.get_core("mock").core
+    assert isinstance(core, LazyCoreWrapper) == expected_lazy
+    initialized_dirs = [call.args[1] for call in core_wrapper.call_args_list]
+    assert (core_dir in initialized_dirs) != expected_lazy
@@ -0,0 +1,70 @@
+"""CoreScheduler のテスト"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from voicevox_engine.core.core_scheduler import CoreScheduler
+
+
+def test_core_scheduler_run_sequentially() -> None:
+    """まとめる設定が無い場合、呼び出しは 1 件ずつ実行される。"""
+    # Inputs
+    scheduler = CoreScheduler(threading.Lock())
+    # Outputs
+    results = [scheduler.run("group", lambda i=i: i * 2) for i in range(3)]  # type: ignore[misc]
+    stats = scheduler.stats()
+    # Tests
+    assert results == [0, 2, 4]
+    assert stats.batch_size_histogram == {1: 3}
+    assert stats.queue_depth_histogram == {1: 3}
+
+
+def test_core_scheduler_coalesce_concurrent_calls() -> None:
+    """並行した同一グループの呼び出しはまとめて実行され、入力が一致する呼び出しは 1 回だけ推論される。"""
+    # Inputs
+    mutex = threading.Lock()
+    scheduler = CoreScheduler(mutex, batch_window_sec=5.0, max_batch_size=4)
+    n_inference = 0
+
+    def infer(x: int) -> np.ndarray:
+        nonlocal n_inference
+        assert mutex.locked()
+        n_inference += 1
+        return np.array([x])
+
+    def submit(x: int) -> np.ndarray:
+        inputs = np.array([x % 2])
+        return scheduler.run("group", lambda: infer(x % 2), (inputs,))
+
+    # Outputs
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(submit, range(4)))
+    stats = scheduler.stats()
+    # Tests
+    assert [int(result[0]) for result in results] == [0, 1, 0, 1]
+    assert n_inference == 2
+    assert stats.batch_size_histogram == {4: 1}
+    assert stats.deduplicated_calls == 2
+    assert sum(stats.queue_depth_histogram.values()) == 4
+
+
+def test_core_scheduler_propagate_exception() -> None:
+    """推論中の例外は呼び出し元へ送出される。"""
+    # Inputs
+    scheduler = CoreScheduler(threading.Lock(), max_batch_size=2)
+
+    def infer() -> None:
+        raise RuntimeError("推論に失敗しました")
+
+    # Tests
+    with pytest.raises(RuntimeError, match="推論に失敗しました"):
+        scheduler.run("group", infer)
+
+
+def test_core_scheduler_invalid_max_batch_size() -> None:
+    """まとめて実行する呼び出し数の上限は 1 以上でなければならない。"""
+    with pytest.raises(ValueError, match="max_batch_size"):
+        CoreScheduler(threading.Lock(), max_batch_size=0)
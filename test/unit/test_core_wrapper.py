@@ -0,0 +1,72 @@
+"""コアラッパーのテスト"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from voicevox_engine.core.core_wrapper import _copy_core_dll
+
+
+def _make_core_dir(tmp_path: Path) -> Path:
+    """コアと、コアが参照するファイルやディレクトリを配置したディレクトリを作成する。"""
+    core_dir = tmp_path / "core"
+    (core_dir / "model").mkdir(parents=True)
+    (core_dir / "model" / "metas.json").write_text("[]")
+    (core_dir / "runtime.dll").write_bytes(b"runtime")
+    (core_dir / "core.dll").write_bytes(b"core")
+    return core_dir
+
+
+def _assert_copied(copy_path: Path, core_dir: Path) -> None:
+    assert copy_path.parent != core_dir
+    assert copy_path.read_bytes() == b"core"
+    assert (copy_path.parent / "runtime.dll").read_bytes() == b"runtime"
+    assert (copy_path.parent / "model" / "metas.json").read_text() == "[]"
+
+
+def test_copy_core_dll(tmp_path: Path) -> None:
+    """コアの複製の隣に、同じディレクトリの他の項目が配置される。"""
+    # Inputs
+    core_dir = _make_core_dir(tmp_path)
+    # Outputs
+    copy_path = _copy_core_dll(core_dir / "core.dll")
+    # Tests
+    _assert_copied(copy_path, core_dir)
+
+
+def test_copy_core_dll_without_symlink(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """シンボリックリンクを作成できない場合、ハードリンクか複製が配置される。"""
+
+    # Inputs
+    def fail_symlink(*args: object, **kwargs: object) -> None:
+        # NOTE: Windows で権限が無い場合の WinError 1314 を模擬する
+        raise OSError("A required privilege is not held by the client")
+
+    core_dir = _make_core_dir(tmp_path)
+    monkeypatch.setattr(Path, "symlink_to", fail_symlink)
+    # Outputs
+    copy_path = _copy_core_dll(core_dir / "core.dll")
+    # Tests
+    _assert_copied(copy_path, core_dir)
+    assert not (copy_path.parent / "runtime.dll").is_symlink()
+
+
+def test_copy_core_dll_without_link(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """シンボリックリンクもハードリンクも作成できない場合、複製が配置される。"""
+
+    # Inputs
+    def fail_link(*args: object, **kwargs: object) -> None:
+        raise OSError("link is not supported")
+
+    core_dir = _make_core_dir(tmp_path)
+    monkeypatch.setattr(Path, "symlink_to", fail_link)
+    monkeypatch.setattr(os, "link", fail_link)
+    # Outputs
+    copy_path = _copy_core_dll(core_dir / "core.dll")
+    # Tests
+    _assert_copied(copy_path, core_dir)
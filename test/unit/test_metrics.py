@@ -0,0 +1,124 @@
+"""計測値の集計のテスト"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+import pytest
+
+from voicevox_engine.metrics import (
+    MetricSample,
+    MetricsRegistry,
+    disable_metrics,
+    enable_metrics,
+    flatten_stats,
+    stage_timer,
+    trace_request,
+)
+
+
+@pytest.fixture
+def metrics_enabled() -> Iterator[MetricsRegistry]:
+    """計測を有効化し、テスト後に無効化する。"""
+    yield enable_metrics()
+    disable_metrics()
+
+
+def test_render_stage_histogram() -> None:
+    """処理段階の所要時間は、ラベル付きの累積ヒストグラムとして出力される。"""
+    # Inputs
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.observe_stage("decode", 0.05, style_id=1, core_version="0.15.0")
+    registry.observe_stage("decode", 0.5, style_id=1, core_version="0.15.0")
+    registry.observe_stage("decode", 2.0, style_id=1, core_version="0.15.0")
+    registry.observe_stage("wav_encoding", 0.1)
+    # Expects
+    label = 'stage="decode",style_id="1",core_version="0.15.0"'
+    true_lines = [
+        "# TYPE voicevox_stage_duration_seconds histogram",
+        f'voicevox_stage_duration_seconds_bucket{{{label},le="0.1"}} 1',
+        f'voicevox_stage_duration_seconds_bucket{{{label},le="1"}} 2',
+        f'voicevox_stage_duration_seconds_bucket{{{label},le="+Inf"}} 3',
+        f"voicevox_stage_duration_seconds_sum{{{label}}} 2.55",
+        f"voicevox_stage_duration_seconds_count{{{label}}} 3",
+        # NOTE: 境界と等しい観測値はその境界のバケットに含まれ、不明なラベルは省略される
+        'voicevox_stage_duration_seconds_bucket{stage="wav_encoding",le="0.1"} 1',
+    ]
+    # Outputs
+    lines = registry.render().splitlines()
+    # Test
+    for true_line in true_lines:
+        assert true_line in lines
+
+
+def test_render_collected_stats() -> None:
+    """登録された収集関数が返す統計情報は、出力のたびに収集される。"""
+
+    @dataclass(frozen=True)
+    class _Stats:
+        hits: int
+        ratio: float
+        enabled: bool
+        last: float | None
+        histogram: dict[int, int]
+
+    # Inputs
+    registry = MetricsRegistry()
+    stats = [_Stats(1, 0.5, True, None, {1: 2})]
+    registry.register_collector(lambda: flatten_stats("test", stats[0]))
+    registry.register_collector(
+        lambda: [MetricSample("test_label", 1, {"name": 'a"b'})]
+    )
+    # Outputs
+    first = registry.render().splitlines()
+    stats[0] = _Stats(2, 0.5, False, 1.0, {})
+    second = registry.render().splitlines()
+    # Test
+    assert "test_hits 1" in first
+    assert "test_ratio 0.5" in first
+    assert "test_enabled 1" in first
+    assert not any(line.startswith("test_last") for line in first)
+    assert not any(line.startswith("test_histogram") for line in first)
+    assert 'test_label{name="a\\"b"} 1' in first
+    assert "test_hits 2" in second
+    assert "test_enabled 0" in second
+    assert "test_last 1" in second
+
+
+def test_stage_timer_disabled() -> None:
+    """計測が無効な場合、計測しないコンテキストマネージャーが使い回される。"""
+    disable_metrics()
+    assert stage_timer("decode", 1, "0.15.0") is stage_timer("wav_encoding")
+
+
+def test_stage_timer_records_failure(metrics_enabled: MetricsRegistry) -> None:
+    """例外で中断された処理段階は、所要時間ではなく失敗回数として記録される。"""
+    # Outputs
+    with stage_timer("decode", 1, "0.15.0"):
+        pass
+    with pytest.raises(RuntimeError):
+        with stage_timer("decode", 1, "0.15.0"):
+            raise RuntimeError()
+    lines = metrics_enabled.render().splitlines()
+    # Test
+    label = 'stage="decode",style_id="1",core_version="0.15.0"'
+    assert f"voicevox_stage_duration_seconds_count{{{label}}} 1" in lines
+    assert f"voicevox_stage_failures_total{{{label}}} 1" in lines
+
+
+def test_request_trace_server_timing() -> None:
+    """リクエスト内の処理段階は、段階ごとに所要時間を合計した Server-Timing ヘッダー値になる。"""
+    # Outputs
+    with trace_request() as trace:
+        with stage_timer("yukarin_s", 1, "0.15.0"):
+            pass
+        with stage_timer("decode", 1, "0.15.0"):
+            pass
+        with stage_timer("decode", 1, "0.15.0"):
+            pass
+    with stage_timer("decode", 1, "0.15.0"):
+        pass
+    # Test
+    assert [span.stage for span in trace.spans()] == ["yukarin_s", "decode", "decode"]
+    metrics = trace.server_timing().split(", ")
+    assert [metric.split(";")[0] for metric in metrics] == ["yukarin_s", "decode"]
+    assert metrics[1].endswith(';desc="x2"')
@@ -0,0 +1,166 @@
+"""ModelResidencyManager のテスト"""
+
+import pytest
+
+from voicevox_engine.core.core_wrapper import OldCoreError
+from voicevox_engine.core.model_residency import ModelResidencyManager
+from voicevox_engine.dev.core.mock import MockCoreWrapper
+from voicevox_engine.metas.metas import StyleId
+
+_MODEL_BYTES = 100
+
+
+class _ResidencyCore(MockCoreWrapper):
+    """モデルの読み込み状態とメモリ使用量を模擬するコア"""
+
+    def __init__(self, supports_unload: bool) -> None:
+        super().__init__()
+        self.supports_unload = supports_unload
+        self.loaded: set[int] = set()
+        self.n_reinitialize = 0
+
+    @property
+    def memory_usage(self) -> int:
+        return len(self.loaded) * _MODEL_BYTES
+
+    def load_model(self, style_id: int) -> None:
+        self.loaded.add(style_id)
+
+    def unload_model(self, style_id: int) -> None:
+        if not self.supports_unload:
+            raise OldCoreError
+        self.loaded.discard(style_id)
+
+    def is_model_loaded(self, style_id: int) -> bool:
+        return style_id in self.loaded
+
+    def reinitialize(self) -> None:
+        self.n_reinitialize += 1
+        self.loaded.clear()
+
+
+def _make_manager(
+    supports_unload: bool,
+    memory_budget_bytes: int | None,
+    min_recycle_interval_sec: float = 0.0,
+) -> tuple[_ResidencyCore, ModelResidencyManager]:
+    core = _ResidencyCore(supports_unload)
+    manager = ModelResidencyManager(
+        core,
+        memory_budget_bytes,
+        memory_usage=lambda: core.memory_usage,
+        min_recycle_interval_sec=min_recycle_interval_sec,
+    )
+    return core, manager
+
+
+def test_model_residency_without_budget() -> None:
+    """上限が無い場合、読み込んだモデルは解放されず、その大きさが記録される。"""
+    # Inputs
+    core, manager = _make_manager(supports_unload=True, memory_budget_bytes=None)
+    # Outputs
+    for style_id in range(3):
+        manager.ensure_loaded(StyleId(style_id))
+    stats = manager.stats()
+    # Tests
+    assert core.loaded == {0, 1, 2}
+    assert stats.resident_bytes == 3 * _MODEL_BYTES
+    assert [s.style_id for s in stats.styles] == [0, 1, 2]
+    assert stats.evictions == 0
+
+
+def test_model_residency_evict_least_recently_used() -> None:
+    """上限を超える場合、最も長く利用されていないスタイルのモデルから解放される。"""
+    # Inputs
+    core, manager = _make_manager(
+        supports_unload=True, memory_budget_bytes=2 * _MODEL_BYTES
+    )
+    manager.ensure_loaded(StyleId(0))
+    manager.ensure_loaded(StyleId(1))
+    manager.ensure_loaded(StyleId(0))
+    # Outputs
+    manager.ensure_loaded(StyleId(2))
+    stats = manager.stats()
+    # Tests
+    assert core.loaded == {0, 2}
+    assert stats.resident_bytes == 2 * _MODEL_BYTES
+    assert stats.evictions == 1
+
+
+def test_model_residency_pinned_style_is_not_evicted() -> None:
+    """固定されたスタイルのモデルは、より長く利用されていなくても解放されない。"""
+    # Inputs
+    core, manager = _make_manager(
+        supports_unload=True, memory_budget_bytes=2 * _MODEL_BYTES
+    )
+    manager.pin(StyleId(0))
+    manager.ensure_loaded(StyleId(1))
+    # Outputs
+    manager.ensure_loaded(StyleId(2))
+    stats = manager.stats()
+    # Tests
+    assert core.loaded == {0, 2}
+    assert [(s.style_id, s.pinned) for s in stats.styles] == [(0, True), (2, False)]
+
+
+def test_model_residency_recycle_core_without_unload() -> None:
+    """コアがモデルの個別の解放に対応していない場合、コアを再初期化し固定されたスタイルを読み込み直す。"""
+    # Inputs
+    core, manager = _make_manager(
+        supports_unload=False, memory_budget_bytes=2 * _MODEL_BYTES
+    )
+    manager.pin(StyleId(0))
+    manager.ensure_loaded(StyleId(1))
+    # Outputs
+    with pytest.warns(UserWarning, match="再初期化"):
+        manager.ensure_loaded(StyleId(2))
+    stats = manager.stats()
+    # Tests
+    assert core.n_reinitialize == 1
+    assert core.loaded == {0, 2}
+    assert stats.recycles == 1
+    assert [s.style_id for s in stats.styles] == [0, 2]
+
+
+def test_model_residency_recycle_at_most_once_per_interval() -> None:
+    """コアの再初期化は最短間隔の間に 1 回までで、それまでは上限の超過を許容する。"""
+    # Inputs
+    core, manager = _make_manager(
+        supports_unload=False,
+        memory_budget_bytes=2 * _MODEL_BYTES,
+        min_recycle_interval_sec=3600.0,
+    )
+    manager.ensure_loaded(StyleId(0))
+    manager.ensure_loaded(StyleId(1))
+    # Outputs
+    with pytest.warns(UserWarning, match="再初期化"):
+        manager.ensure_loaded(StyleId(2))
+    for style_id in range(3, 6):
+        manager.ensure_loaded(StyleId(style_id))
+    stats = manager.stats()
+    # Tests
+    assert core.n_reinitialize == 1
+    assert core.loaded == {2, 3, 4, 5}
+    assert stats.recycles == 1
+
+
+def test_model_residency_ignores_noisy_memory_usage() -> None:
+    """他の処理によるメモリ使用量の一時的な増加は、モデルの大きさの概算に影響しない。"""
+    # Inputs
+    core = _ResidencyCore(supports_unload=True)
+    noise = {
+        1: 10 * _MODEL_BYTES
+    }  # スタイル 1 の読み込み中に他の処理がメモリを確保する
+
+    def memory_usage() -> int:
+        return core.memory_usage + sum(noise.get(s, 0) for s in core.loaded)
+
+    manager = ModelResidencyManager(core, 3 * _MODEL_BYTES, memory_usage=memory_usage)
+    # Outputs
+    for style_id in range(3):
+        manager.ensure_loaded(StyleId(style_id))
+    stats = manager.stats()
+    # Tests
+    assert core.loaded == {0, 1, 2}
+    assert stats.evictions == 0
+    assert stats.resident_bytes == 3 * _MODEL_BYTES
@@ -0,0 +1,56 @@
+"""RequestProfiler のテスト"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from voicevox_engine.request_profiler import RequestProfiler
+
+
+def _slow_endpoint(stop: threading.Event) -> None:
+    """停止されるまで処理を続ける API の関数。"""
+    while not stop.is_set():
+        time.sleep(0.001)
+
+
+def test_request_profiler_writes_collapsed_stacks(tmp_path: Path) -> None:
+    """対象のリクエストの処理中に API の関数を含むスタックが採取され、API ごとのファイルへ書き出される。"""
+    # Inputs
+    profiler = RequestProfiler(tmp_path, sample_rate=1.0, interval_sec=0.001)
+    scope: dict[str, Any] = {"type": "http", "method": "POST", "path": "/synthesis"}
+    stop = threading.Event()
+    worker = threading.Thread(target=_slow_endpoint, args=(stop,))
+
+    # Outputs
+    assert profiler.should_profile()
+    request_id = profiler.begin(scope)
+    # NOTE: ルーティングによってエンドポイントが設定されるまではスタックを採取しない
+    scope["endpoint"] = _slow_endpoint
+    worker.start()
+    deadline = time.monotonic() + 10
+    while profiler.stats().samples < 3 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    stop.set()
+    worker.join()
+    profiler.end(request_id)
+
+    # Test
+    lines = (tmp_path / "POST_synthesis.collapsed").read_text("utf-8").splitlines()
+    assert len(lines) > 0
+    stack, count = lines[0].rsplit(" ", 1)
+    assert "_slow_endpoint (test_request_profiler.py:" in stack
+    assert int(count) > 0
+    stats = profiler.stats()
+    assert stats.profiled_requests == 1
+    assert stats.samples >= 3
+
+
+def test_request_profiler_sample_rate() -> None:
+    """割合が 0 の場合はどのリクエストも対象とせず、範囲外の割合は拒否される。"""
+    profiler = RequestProfiler(Path("unused"))
+    assert not any(profiler.should_profile() for _ in range(100))
+    with pytest.raises(ValueError, match="sample_rate"):
+        profiler.set_sample_rate(1.5)
@@ -0,0 +1,98 @@
+"""テキスト解析結果キャッシュのテスト"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from test.unit.tts_pipeline.tts_utils import gen_mora
+from voicevox_engine.dev.core.mock import MockCoreWrapper
+from voicevox_engine.metas.metas import StyleId
+from voicevox_engine.tts_pipeline import njd_feature_processor
+from voicevox_engine.tts_pipeline import tts_engine as tts_engine_module
+from voicevox_engine.tts_pipeline.accent_phrase_cache import (
+    AccentPhraseCache,
+    accent_phrase_cache,
+)
+from voicevox_engine.tts_pipeline.model import AccentPhrase
+from voicevox_engine.tts_pipeline.tts_engine import TTSEngine
+
+
+def _gen_accent_phrases() -> list[AccentPhrase]:
+    return [
+        AccentPhrase(
+            moras=[
+                gen_mora("コ", "k", 0.0, "o", 0.0, 0.0),
+                gen_mora("ン", None, None, "N", 0.0, 0.0),
+            ],
+            accent=1,
+            pause_mora=None,
+        ),
+    ]
+
+
+def test_accent_phrase_cache_returns_copy() -> None:
+    """キャッシュされたアクセント句系列への変更はキャッシュに影響しない。"""
+    # Inputs
+    cache = AccentPhraseCache()
+    cache.put("コン", False, cache.generation, _gen_accent_phrases())
+    accent_phrases = cache.get("コン", False, cache.generation)
+    assert accent_phrases is not None
+    accent_phrases[0].moras[0].pitch = 5.0
+    # Outputs
+    result = cache.get("コン", False, cache.generation)
+    # Tests
+    assert result == _gen_accent_phrases()
+    assert cache.stats().hits == 2
+
+
+def test_accent_phrase_cache_invalidate() -> None:
+    """辞書の更新により世代が進み、古い解析結果は破棄されキャッシュもされない。"""
+    # Inputs
+    cache = AccentPhraseCache()
+    old_generation = cache.generation
+    cache.put("コン", False, old_generation, _gen_accent_phrases())
+    # Outputs
+    cache.invalidate()
+    cache.put("コン", True, old_generation, _gen_accent_phrases())
+    # Tests
+    assert cache.generation == old_generation + 1
+    assert cache.get("コン", False, old_generation) is None
+    assert cache.get("コン", True, cache.generation) is None
+    assert cache.stats().entries == 0
+
+
+def test_accent_phrase_cache_eviction() -> None:
+    """上限を超えると最も長く使われていない解析結果から追い出す。"""
+    # Inputs
+    cache = AccentPhraseCache(max_entries=2)
+    cache.put("あ", False, cache.generation, _gen_accent_phrases())
+    cache.put("い", False, cache.generation, _gen_accent_phrases())
+    cache.get("あ", False, cache.generation)
+    cache.put("う", False, cache.generation, _gen_accent_phrases())
+    # Tests
+    assert cache.get("あ", False, cache.generation) is not None
+    assert cache.get("い", False, cache.generation) is None
+    assert cache.stats().evictions == 1
+
+
+def test_create_accent_phrases_skips_text_analysis_on_hit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """キャッシュにヒットした `TTSEngine.create_accent_phrases()` はテキスト解析を実行しない。"""
+    # Inputs
+    text_to_full_context_labels = MagicMock(
+        wraps=njd_feature_processor.text_to_full_context_labels
+    )
+    monkeypatch.setattr(
+        tts_engine_module, "text_to_full_context_labels", text_to_full_context_labels
+    )
+    accent_phrase_cache.invalidate()
+    tts_engine = TTSEngine(MockCoreWrapper())
+    # Outputs
+    result_1 = tts_engine.create_accent_phrases("テスト", StyleId(1), False)
+    result_2 = tts_engine.create_accent_phrases("テスト", StyleId(1), False)
+    accent_phrase_cache.invalidate()
+    tts_engine.create_accent_phrases("テスト", StyleId(1), False)
+    # Tests
+    assert result_1 == result_2
+    assert text_to_full_context_labels.call_count == 2
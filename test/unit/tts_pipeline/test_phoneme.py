@@ -1,8 +1,13 @@
 """Phoneme クラスの単体テスト。"""
 
+import numpy as np
 import pytest
 
-from voicevox_engine.tts_pipeline.phoneme import Phoneme
+from voicevox_engine.tts_pipeline.phoneme import (
+    Phoneme,
+    ids_to_onehot_matrix,
+    phonemes_to_ids,
+)
 
 TRUE_NUM_PHONEME = 45
 
@@ -70,3 +75,31 @@ def test_onehot() -> None:
                 assert phoneme.onehot[j] == 1.0
             else:
                 assert phoneme.onehot[j] == 0.0
+
+
+def test_phonemes_to_ids() -> None:
+    """音素系列を一括で変換した音素ID系列は個別に変換した結果と一致する。"""
+    # Expects
+    true_ids = [p.id for p in ojt_hello_hiho]
+    # Outputs
+    ids = phonemes_to_ids(hello_hiho)
+    # Tests
+    assert ids.dtype == np.int64
+    assert ids.tolist() == true_ids
+
+
+def test_phonemes_to_ids_unknown_phoneme() -> None:
+    """Unknown音素 `xx` を含む音素系列の変換を拒否する"""
+    with pytest.raises(ValueError, match="not in tuple"):
+        phonemes_to_ids(["a", "xx"])
+
+
+def test_ids_to_onehot_matrix() -> None:
+    """音素ID系列から生成した onehot 行列の各行は各音素の onehot ベクトルと一致する。"""
+    # Expects
+    true_onehot = np.stack([p.onehot for p in ojt_hello_hiho])
+    # Outputs
+    onehot = ids_to_onehot_matrix(phonemes_to_ids(hello_hiho))
+    # Tests
+    assert onehot.dtype == np.float32
+    np.testing.assert_array_equal(onehot, true_onehot)
@@ -451,6 +451,31 @@ def test_create_accent_phrases() -> None:
     _assert_equal_accent_phrases(expected, actual)
 
 
+def test_create_accent_phrases_batch() -> None:
+    """複数テキストのアクセント句系列は推論 1 回ずつで生成され、テキストごとに生成した結果と一致する。"""
+    # Inputs
+    core = MockCoreWrapper()
+    core.yukarin_s_forward = MagicMock(side_effect=core.yukarin_s_forward)  # type: ignore[method-assign]
+    core.yukarin_sa_forward = MagicMock(side_effect=core.yukarin_sa_forward)  # type: ignore[method-assign]
+    tts_engine = TTSEngine(core=core)
+    texts = ["これはありますか？", "", "こんにちは、ヒホです。"]
+    # Expects
+    true_accent_phrases_list = [
+        TTSEngine(core=MockCoreWrapper()).create_accent_phrases(
+            text, StyleId(1), enable_katakana_english=False
+        )
+        for text in texts
+    ]
+    # Outputs
+    accent_phrases_list = tts_engine.create_accent_phrases_batch(
+        texts, StyleId(1), enable_katakana_english=False
+    )
+    # Tests
+    assert core.yukarin_s_forward.call_count == 1
+    assert core.yukarin_sa_forward.call_count == 1
+    assert accent_phrases_list == true_accent_phrases_list
+
+
 def test_upspeak_voiced_last_mora() -> None:
     # voiced + "？" + flagON -> upspeak
     # Inputs
@@ -672,3 +697,21 @@ def test_upspeak_voiced_u_last_mora() -> None:
     outputs = _apply_interrogative_upspeak(inputs, False)
     # Test
     _assert_equal_accent_phrases(expected, outputs)
+
+
+def test_synthesize_wave_stream_matches_synthesize_wave() -> None:
+    """`TTSEngine.synthesize_wave_stream()` は無音区間で分割しつつ `synthesize_wave()` と同じ音声波形を生成する。"""
+    # Inputs
+    core = MockCoreWrapper()
+    core.decode_forward = MagicMock(wraps=core.decode_forward)  # type: ignore[method-assign]
+    tts_engine = TTSEngine(core)
+    query = _gen_hello_hiho_query()
+    query.outputSamplingRate = 24000
+    query.outputStereo = False
+    # Expects
+    true_wave = tts_engine.synthesize_wave(query, StyleId(1), True)
+    # Outputs
+    waves = list(tts_engine.synthesize_wave_stream(query, StyleId(1), True))
+    # Tests
+    assert core.decode_forward.call_count == 1 + 2
+    np.testing.assert_array_equal(np.concatenate(waves), true_wave)
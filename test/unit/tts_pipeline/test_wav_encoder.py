@@ -0,0 +1,44 @@
+"""WAV エンコーダーのテスト"""
+
+import io
+from pathlib import Path
+
+import numpy as np
+import soundfile
+
+from voicevox_engine.tts_pipeline.wav_encoder import (
+    encode_wav,
+    wav_header_for_stream,
+    wave_to_pcm_bytes,
+)
+
+
+def test_encode_wav_matches_file_output(tmp_path: Path) -> None:
+    """メモリ上でのエンコード結果はファイルへの書き出し結果と一致する。"""
+    # Inputs
+    wave = np.linspace(-1.5, 1.5, 1000, dtype=np.float32).reshape(500, 2)
+    # Expects
+    wav_path = tmp_path / "true.wav"
+    soundfile.write(file=wav_path, data=wave, samplerate=24000, format="WAV")
+    true_wav = wav_path.read_bytes()
+    # Outputs
+    wav = encode_wav(wave, 24000)
+    # Tests
+    assert bytes(wav) == true_wav
+
+
+def test_stream_wav_is_readable() -> None:
+    """ストリーム用ヘッダーと PCM を連結したものは WAV として読み込める。"""
+    # Inputs
+    wave = np.linspace(-0.5, 0.5, 1000, dtype=np.float32)
+    # Expects
+    true_wave, true_sampling_rate = soundfile.read(io.BytesIO(encode_wav(wave, 48000)))
+    # Outputs
+    stream_wav = wav_header_for_stream(48000, stereo=False)
+    stream_wav += wave_to_pcm_bytes(wave[:300], 48000)
+    stream_wav += wave_to_pcm_bytes(wave[300:], 48000)
+    # Tests
+    assert len(wav_header_for_stream(48000, stereo=False)) == 44
+    assert stream_wav[44:] == bytes(encode_wav(wave, 48000))[44:]
+    assert true_sampling_rate == 48000
+    assert true_wave.shape == (1000,)
@@ -0,0 +1,263 @@
+"""音声波形キャッシュのテスト"""
+
+import threading
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from test.unit.tts_pipeline.tts_utils import gen_mora
+from voicevox_engine.dev.core.mock import MockCoreWrapper
+from voicevox_engine.metas.metas import StyleId
+from voicevox_engine.model import AudioQuery
+from voicevox_engine.tts_pipeline.model import AccentPhrase
+from voicevox_engine.tts_pipeline.tts_engine import TTSEngine
+from voicevox_engine.tts_pipeline.wave_cache import WaveCache, make_wave_cache_key
+
+
+def _gen_query(kana: str | None = None) -> AudioQuery:
+    return AudioQuery(
+        accent_phrases=[
+            AccentPhrase(
+                moras=[
+                    gen_mora("コ", "k", 0.0556, "o", 0.0904, 5.0),
+                    gen_mora("ン", None, None, "N", 0.0587, 5.0),
+                ],
+                accent=1,
+                pause_mora=None,
+            ),
+        ],
+        speedScale=1.0,
+        pitchScale=0.0,
+        intonationScale=1.0,
+        volumeScale=1.0,
+        prePhonemeLength=0.1,
+        postPhonemeLength=0.1,
+        pauseLength=None,
+        pauseLengthScale=1.0,
+        outputSamplingRate=24000,
+        outputStereo=False,
+        kana=kana,
+    )
+
+
+def _gen_wave(n_sample: int, value: float = 0.0) -> np.ndarray:
+    return np.full(n_sample, value, dtype=np.float32)
+
+
+def test_make_wave_cache_key_ignores_kana() -> None:
+    """キャッシュキーは合成結果に影響しない `kana` に依存しない。"""
+    # Outputs
+    key_1 = make_wave_cache_key(_gen_query(kana="コ'ン"), StyleId(1), "0.0.1", True)
+    key_2 = make_wave_cache_key(_gen_query(kana=None), StyleId(1), "0.0.1", True)
+    # Tests
+    assert key_1 == key_2
+
+
+def test_make_wave_cache_key_distinguishes_inputs() -> None:
+    """キャッシュキーは合成結果に影響する入力ごとに異なる。"""
+    # Inputs
+    query = _gen_query()
+    fast_query = _gen_query()
+    fast_query.speedScale = 1.5
+    # Outputs
+    keys = {
+        make_wave_cache_key(query, StyleId(1), "0.0.1", True),
+        make_wave_cache_key(fast_query, StyleId(1), "0.0.1", True),
+        make_wave_cache_key(query, StyleId(2), "0.0.1", True),
+        make_wave_cache_key(query, StyleId(1), "0.0.2", True),
+        make_wave_cache_key(query, StyleId(1), "0.0.1", False),
+    }
+    # Tests
+    assert len(keys) == 5
+
+
+def test_wave_cache_memory_lru_eviction() -> None:
+    """メモリ上のキャッシュは総バイト数の上限を超えると最も長く使われていない波形から追い出す。"""
+    # Inputs
+    wave_cache = WaveCache(max_memory_bytes=_gen_wave(100).nbytes * 2)
+    wave_cache.put("a", _gen_wave(100, 1.0))
+    wave_cache.put("b", _gen_wave(100, 2.0))
+    wave_cache.get("a")
+    wave_cache.put("c", _gen_wave(100, 3.0))
+    # Outputs
+    wave_a = wave_cache.get("a")
+    wave_b = wave_cache.get("b")
+    wave_c = wave_cache.get("c")
+    stats = wave_cache.stats()
+    # Tests
+    assert wave_a is not None
+    assert wave_a[0] == 1.0
+    assert wave_b is None
+    assert wave_c is not None
+    assert wave_c[0] == 3.0
+    assert stats.memory_hits == 3
+    assert stats.misses == 1
+    assert stats.memory_evictions == 1
+    assert stats.memory_entries == 2
+    assert stats.memory_bytes == _gen_wave(100).nbytes * 2
+
+
+def test_wave_cache_returns_read_only_wave() -> None:
+    """キャッシュされた波形は書き込み不可である。"""
+    # Inputs
+    wave_cache = WaveCache(max_memory_bytes=1024 * 1024)
+    wave_cache.put("a", _gen_wave(100))
+    # Outputs
+    wave = wave_cache.get("a")
+    # Tests
+    assert wave is not None
+    assert not wave.flags.writeable
+
+
+def test_wave_cache_disk_tier(tmp_path: Path) -> None:
+    """ディスク上のキャッシュはメモリ上から追い出された波形を保持し、再起動後も利用できる。"""
+    # Inputs
+    wave_nbytes = _gen_wave(100).nbytes
+    wave_cache = WaveCache(
+        max_memory_bytes=wave_nbytes,
+        disk_dir=tmp_path,
+        max_disk_bytes=1024 * 1024,
+    )
+    wave_cache.put("a", _gen_wave(100, 1.0))
+    wave_cache.put("b", _gen_wave(100, 2.0))
+    # Outputs
+    wave_a = wave_cache.get("a")
+    restarted_wave_cache = WaveCache(
+        max_memory_bytes=wave_nbytes,
+        disk_dir=tmp_path,
+        max_disk_bytes=1024 * 1024,
+    )
+    restarted_wave_b = restarted_wave_cache.get("b")
+    # Tests
+    assert wave_a is not None
+    assert wave_a[0] == 1.0
+    assert wave_cache.stats().disk_hits == 1
+    assert restarted_wave_b is not None
+    assert restarted_wave_b[0] == 2.0
+    assert restarted_wave_cache.stats().disk_entries == 2
+
+
+def test_wave_cache_disk_eviction(tmp_path: Path) -> None:
+    """ディスク上のキャッシュは総バイト数の上限を超えると波形ファイルを削除する。"""
+    # Inputs
+    wave_cache = WaveCache(max_memory_bytes=0, disk_dir=tmp_path, max_disk_bytes=0)
+    # Outputs
+    wave_cache.put("a", _gen_wave(100))
+    stats = wave_cache.stats()
+    # Tests
+    assert stats.disk_entries == 0
+    assert stats.disk_evictions == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_wave_cache_disk_write_does_not_block_memory_hits(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """ディスクへの書き込み中も、他のスレッドはメモリ上のキャッシュを利用できる。"""
+    # Inputs
+    wave_cache = WaveCache(
+        max_memory_bytes=1024 * 1024, disk_dir=tmp_path, max_disk_bytes=1024 * 1024
+    )
+    wave_cache.put("a", _gen_wave(100, 1.0))
+    writing = threading.Event()
+    release = threading.Event()
+    original_save = np.save
+
+    def blocking_save(*args: Any, **kwargs: Any) -> None:
+        writing.set()
+        release.wait(timeout=10)
+        original_save(*args, **kwargs)
+
+    monkeypatch.setattr(np, "save", blocking_save)
+    writer = threading.Thread(target=wave_cache.put, args=("b", _gen_wave(100, 2.0)))
+    writer.start()
+    assert writing.wait(timeout=10)
+    # Outputs
+    results: dict[str, Any] = {}
+
+    def read() -> None:
+        results["a"] = wave_cache.get("a")
+        results["c"] = wave_cache.get("c")
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    reader.join(timeout=5)
+    read_while_writing = not reader.is_alive()
+    release.set()
+    writer.join()
+    reader.join()
+    # Tests
+    assert read_while_writing
+    assert results["a"] is not None
+    assert results["a"][0] == 1.0
+    assert results["c"] is None
+    assert wave_cache.stats().disk_entries == 2
+
+
+def test_wave_cache_put_while_removing_evicted_wave(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """追い出された波形のファイルの削除中に同じ波形が追加されても、索引とディスク上のファイルが一致する。"""
+    # Inputs
+    wave = _gen_wave(100, 1.0)
+    wave_cache = WaveCache(
+        max_memory_bytes=0, disk_dir=tmp_path, max_disk_bytes=wave.nbytes + 200
+    )
+    wave_cache.put("a", wave)
+    removing = threading.Event()
+    release = threading.Event()
+    original_unlink = Path.unlink
+
+    def blocking_unlink(path: Path, missing_ok: bool = False) -> None:
+        if path.name == "a.npy" and not removing.is_set():
+            removing.set()
+            release.wait(timeout=10)
+        original_unlink(path, missing_ok=missing_ok)
+
+    monkeypatch.setattr(Path, "unlink", blocking_unlink)
+    # NOTE: "b" の追加で "a" が追い出され、そのファイルの削除中に止まる
+    evictor = threading.Thread(target=wave_cache.put, args=("b", _gen_wave(100, 2.0)))
+    evictor.start()
+    assert removing.wait(timeout=10)
+    # Outputs
+    wave_cache.put("a", wave)
+    release.set()
+    evictor.join()
+    stats = wave_cache.stats()
+    # Tests
+    files = sorted(tmp_path.glob("*.npy"))
+    assert stats.disk_entries == len(files)
+    assert stats.disk_bytes == sum(path.stat().st_size for path in files)
+    assert wave_cache.get("b") is not None
+
+
+def test_wave_cache_removes_orphaned_temporary_files(tmp_path: Path) -> None:
+    """書き込みの途中で中断されて残った一時ファイルは、キャッシュの生成時に削除される。"""
+    # Inputs
+    orphan = tmp_path / "a-0123.tmp"
+    orphan.write_bytes(b"partial")
+    # Outputs
+    WaveCache(max_memory_bytes=0, disk_dir=tmp_path, max_disk_bytes=1024)
+    # Tests
+    assert not orphan.exists()
+
+
+def test_tts_engine_synthesize_wave_with_wave_cache() -> None:
+    """キャッシュ付きの `TTSEngine.synthesize_wave()` は同一入力に対してデコードを再実行しない。"""
+    # Inputs
+    core = MockCoreWrapper()
+    core.decode_forward = MagicMock(wraps=core.decode_forward)  # type: ignore[method-assign]
+    wave_cache = WaveCache(max_memory_bytes=1024 * 1024)
+    tts_engine = TTSEngine(core, wave_cache)
+    query = _gen_query()
+    # Outputs
+    wave_1 = tts_engine.synthesize_wave(query, StyleId(1), True)
+    wave_2 = tts_engine.synthesize_wave(query, StyleId(1), True)
+    tts_engine.synthesize_wave(query, StyleId(1), False)
+    # Tests
+    np.testing.assert_array_equal(wave_1, wave_2)
+    assert core.decode_forward.call_count == 2
+    assert wave_cache.stats().memory_hits == 1
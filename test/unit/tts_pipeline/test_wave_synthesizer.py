@@ -17,6 +17,7 @@ from voicevox_engine.tts_pipeline.tts_engine import (
     _apply_prepost_silence,
     _apply_speed_scale,
     _count_frame_per_unit,
+    _MoraColumns,
     _query_to_decoder_feature,
 )
 
@@ -53,6 +54,15 @@ def _gen_query(
     )
 
 
+def _assert_mora_columns_equal(actual: _MoraColumns, expected: _MoraColumns) -> None:
+    np.testing.assert_array_equal(actual.consonant_ids, expected.consonant_ids)
+    np.testing.assert_array_equal(actual.consonant_lengths, expected.consonant_lengths)
+    np.testing.assert_array_equal(actual.vowel_ids, expected.vowel_ids)
+    np.testing.assert_array_equal(actual.vowel_lengths, expected.vowel_lengths)
+    np.testing.assert_array_equal(actual.pitches, expected.pitches)
+    np.testing.assert_array_equal(actual.is_pause, expected.is_pause)
+
+
 def test_apply_prepost_silence() -> None:
     """Test `_apply_prepost_silence()`."""
     # Inputs
@@ -67,10 +77,12 @@ def test_apply_prepost_silence() -> None:
         gen_mora("　", None, None, "sil", sec(6), 0.0),
     ]
     # Outputs
-    moras_with_silence = _apply_prepost_silence(moras, query)
+    moras_with_silence = _apply_prepost_silence(_MoraColumns.from_moras(moras), query)
 
     # Test
-    assert moras_with_silence == true_moras_with_silence
+    _assert_mora_columns_equal(
+        moras_with_silence, _MoraColumns.from_moras(true_moras_with_silence)
+    )
 
 
 def test_apply_speed_scale() -> None:
@@ -93,10 +105,10 @@ def test_apply_speed_scale() -> None:
         gen_mora("ホ", "h", sec(2), "O", sec(1), 0.0),
     ]
     # Outputs
-    moras = _apply_speed_scale(input_moras, query)
+    moras = _apply_speed_scale(_MoraColumns.from_moras(input_moras), query)
 
     # Test
-    assert moras == true_moras
+    _assert_mora_columns_equal(moras, _MoraColumns.from_moras(true_moras))
 
 
 def test_apply_pitch_scale() -> None:
@@ -119,10 +131,10 @@ def test_apply_pitch_scale() -> None:
         gen_mora("ホ", "h", 0.0, "O", 0.0, 0.0),
     ]
     # Outputs
-    moras = _apply_pitch_scale(input_moras, query)
+    moras = _apply_pitch_scale(_MoraColumns.from_moras(input_moras), query)
 
     # Test
-    assert moras == true_moras
+    _assert_mora_columns_equal(moras, _MoraColumns.from_moras(true_moras))
 
 
 def test_apply_intonation_scale() -> None:
@@ -145,10 +157,10 @@ def test_apply_intonation_scale() -> None:
         gen_mora("ホ", "h", 0.0, "O", 0.0, 0.0),
     ]
     # Outputs
-    moras = _apply_intonation_scale(input_moras, query)
+    moras = _apply_intonation_scale(_MoraColumns.from_moras(input_moras), query)
 
     # Test
-    assert moras == true_moras
+    _assert_mora_columns_equal(moras, _MoraColumns.from_moras(true_moras))
 
 
 def test_apply_volume_scale() -> None:
@@ -199,13 +211,13 @@ def test_count_frame_per_unit() -> None:
     """Test `_count_frame_per_unit()`."""
     # Inputs
     moras = [
-        gen_mora("　", None, None, "　", sec(2), 0.0),
+        gen_mora("　", None, None, "sil", sec(2), 0.0),
         gen_mora("コ", "k", sec(2), "o", sec(4), 0.0),
         gen_mora("ン", None, None, "N", sec(4), 0.0),
         gen_mora("、", None, None, "pau", sec(2), 0.0),
         gen_mora("ヒ", "h", sec(2), "i", sec(4), 0.0),
         gen_mora("ホ", "h", sec(4), "O", sec(2), 0.0),
-        gen_mora("　", None, None, "　", sec(6), 0.0),
+        gen_mora("　", None, None, "sil", sec(6), 0.0),
     ]
 
     # Expects
@@ -217,7 +229,9 @@ def test_count_frame_per_unit() -> None:
     true_frame_per_mora = np.array(true_frame_per_mora_list, dtype=np.int32)
 
     # Outputs
-    frame_per_phoneme, frame_per_mora = _count_frame_per_unit(moras)
+    frame_per_phoneme, frame_per_mora = _count_frame_per_unit(
+        _MoraColumns.from_moras(moras)
+    )
 
     # Test
     assert np.array_equal(frame_per_phoneme, true_frame_per_phoneme)
@@ -0,0 +1,31 @@
+"""ZIP 形式に関する utility のテスト"""
+
+import io
+import zipfile
+
+from voicevox_engine.utility.zip_utility import stream_zip
+
+
+def test_stream_zip() -> None:
+    """逐次生成されたバイト列を連結すると、エントリを順に含む ZIP になる。"""
+    # Inputs
+    entries: list[tuple[str, bytes | memoryview]] = [
+        ("001.wav", b"a" * 1000),
+        ("002.wav", memoryview(b"b")),
+    ]
+    # Outputs
+    chunks = list(stream_zip(iter(entries)))
+    # Tests
+    assert len(chunks) == len(entries) + 1
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.namelist() == ["001.wav", "002.wav"]
+        assert zip_file.read("001.wav") == b"a" * 1000
+        assert zip_file.read("002.wav") == b"b"
+
+
+def test_stream_zip_empty() -> None:
+    """エントリが無い場合、空の ZIP になる。"""
+    zip_bytes = b"".join(stream_zip([]))
+    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zip_file:
+        assert zip_file.namelist() == []
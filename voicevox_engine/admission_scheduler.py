@@ -0,0 +1,274 @@
+"""優先度と期限に基づく音声合成リクエストの受け付けスケジューラー"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Final, Literal, TypeAlias
+
+PriorityClass: TypeAlias = Literal["interactive", "normal", "batch"]
+
+# 優先度クラスごとの重み。重みに比例した割合で処理が割り当てられる
+DEFAULT_CLASS_WEIGHTS: Final[Mapping[PriorityClass, float]] = {
+    "interactive": 4.0,
+    "normal": 2.0,
+    "batch": 1.0,
+}
+
+# 処理時間の指数移動平均の平滑化係数
+_SERVICE_TIME_SMOOTHING: Final = 0.2
+
+
+class AdmissionRejected(Exception):
+    """期限までに処理を終えられないため、リクエストの受け付けを拒否したエラー"""
+
+    def __init__(self, retry_after: float) -> None:
+        """再試行までの推奨待機時間（秒）を用いてインスタンス化する。"""
+        super().__init__(
+            "期限までに処理を終えられないため、リクエストを受け付けられません"
+        )
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class AdmissionClassStats:
+    """優先度クラスごとの受け付けの統計情報"""
+
+    queued: int  # 受け付けを待っているリクエスト数
+    admitted: int  # これまでに受け付けたリクエスト数
+    rejected: int  # これまでに期限により拒否したリクエスト数
+    queue_wait_seconds_total: float  # 受け付けまでの待ち時間の合計（秒）
+    max_queue_wait_seconds: float  # 受け付けまでの待ち時間の最大値（秒）
+
+
+@dataclass(frozen=True)
+class AdmissionSchedulerStats:
+    """受け付けスケジューラーの統計情報"""
+
+    running: int  # 処理中のリクエスト数
+    mean_service_seconds: float | None  # 処理時間の指数移動平均（秒）
+    classes: dict[PriorityClass, AdmissionClassStats]
+
+
+@dataclass(eq=False)
+class AdmissionTicket:
+    """受け付けを待つ、あるいは受け付けられたリクエスト"""
+
+    priority_class: PriorityClass
+    finish_tag: float  # 重み付き公平キューイングの仮想終了時刻
+    enqueued_at: float  # 受け付けを待ち始めた時刻 (`time.monotonic()`)
+    admitted_at: float | None = None  # 受け付けられた時刻 (`time.monotonic()`)
+    future: "asyncio.Future[None] | None" = field(default=None, repr=False)
+
+
+@dataclass
+class _ClassCounter:
+    """優先度クラスごとの集計値"""
+
+    queued: int = 0
+    admitted: int = 0
+    rejected: int = 0
+    queue_wait_seconds_total: float = 0.0
+    max_queue_wait_seconds: float = 0.0
+
+
+class AdmissionScheduler:
+    """
+    優先度と期限に基づく音声合成リクエストの受け付けスケジューラー。
+
+    同時に処理するリクエスト数を制限し、空きを待つリクエストを優先度クラスの重みに基づく
+    重み付き公平キューイング（自己計時型）の順に受け付ける。
+    期限付きのリクエストは、待ち時間と処理時間の見積もりが期限を超える場合に待たずに拒否し、
+    待っている間に期限を過ぎた場合も拒否する。
+    空きの待機はイベントループ上で行うため、待っているリクエストはスレッドを占有しない。
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        class_weights: Mapping[PriorityClass, float] = DEFAULT_CLASS_WEIGHTS,
+    ) -> None:
+        """
+        スケジューラーを生成する。
+
+        Parameters
+        ----------
+        max_concurrency : int
+            同時に処理するリクエスト数の上限
+        class_weights : Mapping[PriorityClass, float]
+            優先度クラスごとの重み
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency は 1 以上である必要があります。")
+        if any(weight <= 0 for weight in class_weights.values()):
+            raise ValueError("class_weights の重みは正である必要があります。")
+
+        self._max_concurrency = max_concurrency
+        self._class_weights = dict(class_weights)
+
+        self._lock = threading.Lock()
+        self._running = 0
+        self._virtual_time = 0.0
+        self._last_finish_tags: dict[PriorityClass, float] = {}
+        self._waiters: list[tuple[float, int, AdmissionTicket]] = []
+        self._sequence = itertools.count()
+        self._mean_service_seconds: float | None = None
+        self._counters = {
+            priority_class: _ClassCounter() for priority_class in self._class_weights
+        }
+
+    async def acquire(
+        self, priority_class: PriorityClass, deadline_sec: float | None = None
+    ) -> AdmissionTicket:
+        """
+        リクエストの受け付けを待ち、受け付けられたリクエストを返す。
+
+        Parameters
+        ----------
+        priority_class : PriorityClass
+            リクエストの優先度クラス
+        deadline_sec : float | None
+            現在から処理を終えるまでの期限（秒）。None の場合は期限無し
+
+        Raises
+        ------
+        AdmissionRejected
+            期限までに処理を終えられない
+        """
+        now = time.monotonic()
+        with self._lock:
+            ticket = AdmissionTicket(
+                priority_class=priority_class,
+                finish_tag=self._next_finish_tag(priority_class),
+                enqueued_at=now,
+            )
+            if self._running < self._max_concurrency and len(self._waiters) == 0:
+                self._last_finish_tags[priority_class] = ticket.finish_tag
+                self._admit(ticket, now)
+                return ticket
+
+            estimated_wait = self._estimate_wait(ticket.finish_tag)
+            if deadline_sec is not None and self._mean_service_seconds is not None:
+                if estimated_wait + self._mean_service_seconds > deadline_sec:
+                    self._counters[priority_class].rejected += 1
+                    raise AdmissionRejected(retry_after=estimated_wait)
+
+            self._last_finish_tags[priority_class] = ticket.finish_tag
+            ticket.future = asyncio.get_running_loop().create_future()
+            heapq.heappush(
+                self._waiters, (ticket.finish_tag, next(self._sequence), ticket)
+            )
+            self._counters[priority_class].queued += 1
+
+        try:
+            async with asyncio.timeout(deadline_sec):
+                await ticket.future
+        except (TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                admitted = ticket.admitted_at is not None
+                if not admitted:
+                    self._remove_waiter(ticket)
+                    if isinstance(e, TimeoutError):
+                        self._counters[priority_class].rejected += 1
+                    estimated_wait = self._estimate_wait(ticket.finish_tag)
+            if admitted:
+                # NOTE: 受け付けと同時に待機が中断された場合は、割り当てられた枠を返す
+                self.release(ticket, record=False)
+            if isinstance(e, TimeoutError):
+                raise AdmissionRejected(retry_after=estimated_wait) from e
+            raise
+        return ticket
+
+    def release(self, ticket: AdmissionTicket, record: bool = True) -> None:
+        """
+        受け付けられたリクエストの処理の終了を通知し、次に待っているリクエストを受け付ける。
+
+        Parameters
+        ----------
+        ticket : AdmissionTicket
+            `acquire` で受け付けられたリクエスト
+        record : bool
+            処理時間を見積もりに反映するか否か
+        """
+        assert ticket.admitted_at is not None
+        service_seconds = time.monotonic() - ticket.admitted_at
+        with self._lock:
+            self._running -= 1
+            if record:
+                if self._mean_service_seconds is None:
+                    self._mean_service_seconds = service_seconds
+                else:
+                    self._mean_service_seconds += _SERVICE_TIME_SMOOTHING * (
+                        service_seconds - self._mean_service_seconds
+                    )
+            self._dispatch()
+
+    def _next_finish_tag(self, priority_class: PriorityClass) -> float:
+        """優先度クラスの次のリクエストの仮想終了時刻を計算する。`_lock` を取得した状態で呼ぶ。"""
+        start_tag = max(
+            self._virtual_time, self._last_finish_tags.get(priority_class, 0.0)
+        )
+        return start_tag + 1.0 / self._class_weights[priority_class]
+
+    def _estimate_wait(self, finish_tag: float) -> float:
+        """仮想終了時刻が finish_tag のリクエストが受け付けられるまでの時間（秒）を見積もる。`_lock` を取得した状態で呼ぶ。"""
+        if self._mean_service_seconds is None:
+            return 0.0
+        n_ahead = sum(1 for tag, _, _ in self._waiters if tag <= finish_tag)
+        return (n_ahead + 1) * self._mean_service_seconds / self._max_concurrency
+
+    def _admit(self, ticket: AdmissionTicket, now: float) -> None:
+        """リクエストを受け付ける。`_lock` を取得した状態で呼ぶ。"""
+        self._running += 1
+        self._virtual_time = max(self._virtual_time, ticket.finish_tag)
+        ticket.admitted_at = now
+
+        wait = now - ticket.enqueued_at
+        counter = self._counters[ticket.priority_class]
+        counter.admitted += 1
+        counter.queue_wait_seconds_total += wait
+        counter.max_queue_wait_seconds = max(counter.max_queue_wait_seconds, wait)
+
+    def _dispatch(self) -> None:
+        """空きの枠へ、仮想終了時刻の早い順に待っているリクエストを受け付ける。`_lock` を取得した状態で呼ぶ。"""
+        while self._running < self._max_concurrency and len(self._waiters) > 0:
+            _, _, ticket = heapq.heappop(self._waiters)
+            self._counters[ticket.priority_class].queued -= 1
+            self._admit(ticket, time.monotonic())
+            assert ticket.future is not None
+            ticket.future.get_loop().call_soon_threadsafe(
+                _set_future_result, ticket.future
+            )
+
+    def _remove_waiter(self, ticket: AdmissionTicket) -> None:
+        """待っているリクエストを取り除く。`_lock` を取得した状態で呼ぶ。"""
+        self._waiters = [entry for entry in self._waiters if entry[2] is not ticket]
+        heapq.heapify(self._waiters)
+        self._counters[ticket.priority_class].queued -= 1
+
+    def stats(self) -> AdmissionSchedulerStats:
+        """スケジューラーの統計情報を取得する。"""
+        with self._lock:
+            return AdmissionSchedulerStats(
+                running=self._running,
+                mean_service_seconds=self._mean_service_seconds,
+                classes={
+                    priority_class: AdmissionClassStats(
+                        queued=counter.queued,
+                        admitted=counter.admitted,
+                        rejected=counter.rejected,
+                        queue_wait_seconds_total=counter.queue_wait_seconds_total,
+                        max_queue_wait_seconds=counter.max_queue_wait_seconds,
+                    )
+                    for priority_class, counter in self._counters.items()
+                },
+            )
+
+
+def _set_future_result(future: "asyncio.Future[None]") -> None:
+    """待機が中断されていなければ、受け付けを待つリクエストへ受け付けを通知する。"""
+    if not future.done():
+        future.set_result(None)
@@ -5,7 +5,11 @@ from pathlib import Path
 from fastapi import FastAPI
 
 from voicevox_engine import __version__
-from voicevox_engine.app.dependencies import generate_mutability_allowed_verifier
+from voicevox_engine.admission_scheduler import AdmissionScheduler
+from voicevox_engine.app.dependencies import (
+    generate_admission_controller,
+    generate_mutability_allowed_verifier,
+)
 from voicevox_engine.app.global_exceptions import configure_global_exception_handlers
 from voicevox_engine.app.middlewares import configure_middlewares
 from voicevox_engine.app.openapi_schema import (
@@ -15,9 +19,11 @@ from voicevox_engine.app.openapi_schema import (
 from voicevox_engine.app.routers.character import generate_character_router
 from voicevox_engine.app.routers.engine_info import generate_engine_info_router
 from voicevox_engine.app.routers.library import generate_library_router
+from voicevox_engine.app.routers.metrics import generate_metrics_router
 from voicevox_engine.app.routers.morphing import generate_morphing_router
 from voicevox_engine.app.routers.portal_page import generate_portal_page_router
 from voicevox_engine.app.routers.preset import generate_preset_router
+from voicevox_engine.app.routers.profiler import generate_profiler_router
 from voicevox_engine.app.routers.setting import generate_setting_router
 from voicevox_engine.app.routers.tts_pipeline import generate_tts_pipeline_router
 from voicevox_engine.app.routers.user_dict import generate_user_dict_router
@@ -27,10 +33,13 @@ from voicevox_engine.core.core_initializer import CoreManager
 from voicevox_engine.engine_manifest import EngineManifest
 from voicevox_engine.library.library_manager import LibraryManager
 from voicevox_engine.metas.metas_store import MetasStore
+from voicevox_engine.metrics import MetricSample, MetricsRegistry, flatten_stats
 from voicevox_engine.preset.preset_manager import PresetManager
+from voicevox_engine.request_profiler import RequestProfiler
 from voicevox_engine.resource_manager import ResourceManager
 from voicevox_engine.setting.model import CorsPolicyMode
 from voicevox_engine.setting.setting_manager import SettingHandler
+from voicevox_engine.tts_pipeline.accent_phrase_cache import accent_phrase_cache
 from voicevox_engine.tts_pipeline.song_engine import SongEngineManager
 from voicevox_engine.tts_pipeline.tts_engine import TTSEngineManager
 from voicevox_engine.user_dict.user_dict_manager import UserDictionary
@@ -52,6 +61,12 @@ def generate_app(
     cors_policy_mode: CorsPolicyMode = CorsPolicyMode.localapps,
     allow_origin: list[str] | None = None,
     disable_mutable_api: bool = False,
+    multi_synthesis_workers: int = 1,
+    admission_scheduler: AdmissionScheduler | None = None,
+    metrics_registry: MetricsRegistry | None = None,
+    request_trace_log: Path | None = None,
+    request_profiler: RequestProfiler | None = None,
+    enable_server_timing: bool = False,
 ) -> FastAPI:
     """ASGI 'application' 仕様に準拠した VOICEVOX ENGINE アプリケーションインスタンスを生成する。"""
     if character_info_dir is None:
@@ -60,6 +75,7 @@ def generate_app(
     verify_mutability_allowed = generate_mutability_allowed_verifier(
         disable_mutable_api
     )
+    control_admission = generate_admission_controller(admission_scheduler)
 
     app = FastAPI(
         title=engine_manifest.name,
@@ -67,7 +83,14 @@ def generate_app(
         version=__version__,
         separate_input_output_schemas=False,  # Pydantic V1 のときのスキーマに合わせるため
     )
-    app = configure_middlewares(app, cors_policy_mode, allow_origin)
+    app = configure_middlewares(
+        app,
+        cors_policy_mode,
+        allow_origin,
+        request_trace_log,
+        request_profiler,
+        enable_server_timing,
+    )
     app = configure_global_exception_handlers(app)
 
     resource_manager = ResourceManager(is_development())
@@ -88,10 +111,19 @@ def generate_app(
 
     app.include_router(
         generate_tts_pipeline_router(
-            tts_engines, song_engines, preset_manager, cancellable_engine
+            tts_engines,
+            song_engines,
+            preset_manager,
+            cancellable_engine,
+            control_admission,
+            multi_synthesis_workers,
+        )
+    )
+    app.include_router(
+        generate_morphing_router(
+            tts_engines, metas_store, control_admission, cancellable_engine
         )
     )
-    app.include_router(generate_morphing_router(tts_engines, metas_store))
     app.include_router(
         generate_preset_router(preset_manager, verify_mutability_allowed)
     )
@@ -108,6 +140,15 @@ def generate_app(
         )
     )
     app.include_router(generate_portal_page_router(engine_manifest.name))
+    if metrics_registry is not None:
+        _register_stats_collectors(
+            metrics_registry, core_manager, cancellable_engine, admission_scheduler
+        )
+        app.include_router(generate_metrics_router(metrics_registry))
+    if request_profiler is not None:
+        app.include_router(
+            generate_profiler_router(request_profiler, verify_mutability_allowed)
+        )
 
     app = simplify_operation_ids(app)
     app = configure_openapi_schema(
@@ -115,3 +156,76 @@ def generate_app(
     )
 
     return app
+
+
+def _register_stats_collectors(
+    metrics_registry: MetricsRegistry,
+    core_manager: CoreManager,
+    cancellable_engine: CancellableEngine | None,
+    admission_scheduler: AdmissionScheduler | None,
+) -> None:
+    """各機能の統計情報を計測値として出力するよう登録する。"""
+
+    def collect_core_stats() -> list[MetricSample]:
+        samples = []
+        for version, core in core_manager.items():
+            core_labels = {"core_version": version}
+            for instance, stats in enumerate(core.scheduler_stats()):
+                labels = {**core_labels, "instance": str(instance)}
+                samples += flatten_stats("voicevox_core_scheduler", stats, labels)
+                for depth, count in stats.queue_depth_histogram.items():
+                    samples.append(
+                        MetricSample(
+                            "voicevox_core_scheduler_queue_depth_observations",
+                            count,
+                            {**labels, "depth": str(depth)},
+                        )
+                    )
+                for size, count in stats.batch_size_histogram.items():
+                    samples.append(
+                        MetricSample(
+                            "voicevox_core_scheduler_batch_size_observations",
+                            count,
+                            {**labels, "size": str(size)},
+                        )
+                    )
+            residency = core.residency_stats()
+            samples += flatten_stats("voicevox_model_residency", residency, core_labels)
+            for style in residency.styles:
+                samples += flatten_stats(
+                    "voicevox_model_residency_style",
+                    style,
+                    {**core_labels, "style_id": str(style.style_id)},
+                )
+        return samples
+
+    metrics_registry.register_collector(collect_core_stats)
+    metrics_registry.register_collector(
+        lambda: flatten_stats(
+            "voicevox_accent_phrase_cache", accent_phrase_cache.stats()
+        )
+    )
+
+    if cancellable_engine is not None:
+        cancellable_engine_stats = cancellable_engine.stats
+        metrics_registry.register_collector(
+            lambda: flatten_stats(
+                "voicevox_cancellable_engine", cancellable_engine_stats()
+            )
+        )
+
+    if admission_scheduler is not None:
+        admission_scheduler_stats = admission_scheduler.stats
+
+        def collect_admission_stats() -> list[MetricSample]:
+            stats = admission_scheduler_stats()
+            samples = flatten_stats("voicevox_admission", stats)
+            for priority_class, class_stats in stats.classes.items():
+                samples += flatten_stats(
+                    "voicevox_admission_class",
+                    class_stats,
+                    {"priority_class": priority_class},
+                )
+            return samples
+
+        metrics_registry.register_collector(collect_admission_stats)
@@ -1,11 +1,19 @@
 """FastAPI dependencies"""
 
-from collections.abc import Callable, Coroutine
-from typing import Any, TypeAlias
+import math
+from collections.abc import AsyncIterator, Callable, Coroutine
+from typing import Annotated, Any, TypeAlias
 
-from fastapi import HTTPException
+from fastapi import Header, HTTPException
+
+from voicevox_engine.admission_scheduler import (
+    AdmissionRejected,
+    AdmissionScheduler,
+    PriorityClass,
+)
 
 VerifyMutabilityAllowed: TypeAlias = Callable[[], Coroutine[Any, Any, None]]
+ControlAdmission: TypeAlias = Callable[..., AsyncIterator[None]]
 
 
 def generate_mutability_allowed_verifier(
@@ -21,3 +29,54 @@ def generate_mutability_allowed_verifier(
             pass
 
     return verify_mutability_allowed
+
+
+def generate_admission_controller(
+    admission_scheduler: AdmissionScheduler | None,
+) -> ControlAdmission:
+    """
+    control_admission 関数（音声合成リクエストの受け付けを制御する関数）を生成する。
+
+    受け付けの制御が無効な場合は、優先度や期限のヘッダーを読まずに全てのリクエストを受け付ける。
+    """
+    if admission_scheduler is None:
+
+        async def accept_all() -> AsyncIterator[None]:
+            yield
+
+        return accept_all
+
+    async def control_admission(
+        priority_class: Annotated[
+            PriorityClass,
+            Header(
+                alias="X-Priority-Class",
+                description="リクエストの優先度クラス。混雑時は重みの大きいクラスから順に多く処理されます",
+            ),
+        ] = "normal",
+        deadline_ms: Annotated[
+            int | None,
+            Header(
+                alias="X-Deadline-Ms",
+                gt=0,
+                description="処理を終えるまでの期限（ミリ秒）。期限までに処理を終えられない場合は 503 を返します",
+            ),
+        ] = None,
+    ) -> AsyncIterator[None]:
+        deadline_sec = deadline_ms / 1000 if deadline_ms is not None else None
+        try:
+            ticket = await admission_scheduler.acquire(priority_class, deadline_sec)
+        except AdmissionRejected as e:
+            retry_after = max(1, math.ceil(e.retry_after))
+            raise HTTPException(
+                status_code=503,
+                detail=str(e),
+                headers={"Retry-After": str(retry_after)},
+            ) from e
+        # NOTE: ストリーミングのレスポンスも含めて、レスポンスの送信完了まで枠を占有する
+        try:
+            yield
+        finally:
+            admission_scheduler.release(ticket)
+
+    return control_admission
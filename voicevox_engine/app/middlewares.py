@@ -1,22 +1,180 @@
 """FastAPI ミドルウェア"""
 
+import json
+import logging
 import re
 import warnings
 from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
 from traceback import print_exception
+from typing import Final
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.errors import ServerErrorMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from voicevox_engine.metrics import RequestTrace, trace_request
+from voicevox_engine.request_profiler import RequestProfiler
 from voicevox_engine.setting.model import CorsPolicyMode
 
+_TRACE_LOG_MAX_BYTES: Final = 10 * 1024 * 1024
+_TRACE_LOG_BACKUP_COUNT: Final = 5
+
+# 処理段階を記録する、音声合成用のクエリの作成と音声合成の API のパス
+_TRACED_PATHS: Final = frozenset(
+    {
+        "/audio_query",
+        "/audio_query_batch",
+        "/audio_query_from_preset",
+        "/accent_phrases",
+        "/mora_data",
+        "/mora_length",
+        "/mora_pitch",
+        "/synthesis",
+        "/streaming_synthesis",
+        "/cancellable_synthesis",
+        "/multi_synthesis",
+        "/sing_frame_audio_query",
+        "/sing_frame_f0",
+        "/sing_frame_volume",
+        "/frame_synthesis",
+        "/cancellable_frame_synthesis",
+        "/synthesis_morphing",
+        "/cancellable_synthesis_morphing",
+    }
+)
+
+
+class _RequestTraceLog:
+    """リクエストごとの処理段階の記録を JSON Lines 形式で書き出す、一定の大きさで切り替わるログ"""
+
+    def __init__(self, path: Path) -> None:
+        """ログファイルのパスを指定して生成する。ファイルは最初の書き出し時に作られる。"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._handler = RotatingFileHandler(
+            path,
+            maxBytes=_TRACE_LOG_MAX_BYTES,
+            backupCount=_TRACE_LOG_BACKUP_COUNT,
+            encoding="utf-8",
+            delay=True,
+        )
+
+    def write(self, scope: Scope, status: int, trace: RequestTrace) -> None:
+        """リクエストの処理段階の記録を 1 行書き出す。ファイルの切り替えを伴いうるため、イベントループの外で呼ぶ。"""
+        entry = {
+            "time": datetime.now(UTC).isoformat(),
+            "method": scope["method"],
+            "path": scope["path"],
+            "query": scope["query_string"].decode("latin-1"),
+            "status": status,
+            "total_ms": trace.elapsed_seconds * 1000,
+            "stages": [
+                {
+                    "stage": span.stage,
+                    "style_id": span.style_id,
+                    "core_version": span.core_version,
+                    "start_ms": span.start_seconds * 1000,
+                    "duration_ms": span.seconds * 1000,
+                    "failed": span.failed,
+                }
+                for span in trace.spans()
+            ],
+        }
+        message = json.dumps(entry, ensure_ascii=False)
+        self._handler.handle(logging.makeLogRecord({"msg": message}))
+
+
+class _RequestTraceMiddleware:
+    """
+    音声合成用のクエリの作成と音声合成のリクエストの処理中に実行された処理段階を記録するミドルウェア。
+
+    `server_timing` が True の場合、処理段階の所要時間を `Server-Timing` ヘッダーとして返す。
+    ヘッダーはレスポンスの送信開始時に生成されるため、逐次送信されるレスポンスではそれ以降の処理段階を含まない。
+    ログが指定された場合は、レスポンスの送信完了後に全ての処理段階を書き出す。
+    """
+
+    def __init__(
+        self, app: ASGIApp, server_timing: bool, trace_log: _RequestTraceLog | None
+    ) -> None:
+        """ミドルウェアを生成する。`trace_log` が None の場合はログを書き出さない。"""
+        self.app = app
+        self._server_timing = server_timing
+        self._trace_log = trace_log
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in _TRACED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        with trace_request() as trace:
+            status = 0
+            completed = False
+
+            async def send_with_timing(message: Message) -> None:
+                nonlocal status, completed
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    # NOTE: 処理段階を持たない API にはヘッダーを付与しない
+                    server_timing = trace.server_timing() if self._server_timing else ""
+                    if server_timing:
+                        total_ms = trace.elapsed_seconds * 1000
+                        MutableHeaders(scope=message).append(
+                            "Server-Timing",
+                            f"{server_timing}, total;dur={total_ms:.3f}",
+                        )
+                elif message["type"] == "http.response.body":
+                    completed = not message.get("more_body", False)
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+        if self._trace_log is not None and completed and len(trace.spans()) > 0:
+            # NOTE: ログの書き出しでイベントループを止めない
+            await run_in_threadpool(self._trace_log.write, scope, status, trace)
+
+
+class _RequestProfilerMiddleware:
+    """抽選されたリクエストの処理中、レスポンスの送信完了までプロファイリングするミドルウェア"""
+
+    def __init__(self, app: ASGIApp, request_profiler: RequestProfiler) -> None:
+        """ミドルウェアを生成する。"""
+        self.app = app
+        self._request_profiler = request_profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._request_profiler.should_profile():
+            await self.app(scope, receive, send)
+            return
+
+        request_id = self._request_profiler.begin(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # NOTE: プロファイルの書き出しでイベントループを止めない
+            await run_in_threadpool(self._request_profiler.end, request_id)
+
 
 def configure_middlewares(
-    app: FastAPI, cors_policy_mode: CorsPolicyMode, allow_origin: list[str] | None
+    app: FastAPI,
+    cors_policy_mode: CorsPolicyMode,
+    allow_origin: list[str] | None,
+    request_trace_log: Path | None = None,
+    request_profiler: RequestProfiler | None = None,
+    enable_server_timing: bool = False,
 ) -> FastAPI:
-    """FastAPI のミドルウェアを設定する。"""
+    """
+    FastAPI のミドルウェアを設定する。
+
+    `enable_server_timing` が True の場合、音声合成などの API の処理段階ごとの所要時間を `Server-Timing` ヘッダーとして返す。
+    `request_trace_log` が指定された場合、リクエストごとの処理段階の記録をそこへ書き出す。
+    `request_profiler` が指定された場合、抽選されたリクエストをプロファイリングする。
+    """
 
     # 未処理の例外が発生するとCORSMiddlewareが適用されない問題に対するワークアラウンド
     # ref: https://github.com/VOICEVOX/voicevox_engine/issues/91
@@ -50,6 +208,7 @@ def configure_middlewares(
         allow_origin_regex=localhost_regex,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["Server-Timing"] if enable_server_timing else [],
     )
 
     # 許可されていないOriginを遮断するミドルウェア
@@ -87,4 +246,22 @@ def configure_middlewares(
                 status_code=403, content={"detail": "Origin not allowed"}
             )
 
+    # 処理段階を記録し、Server-Timing ヘッダーやログとして出力するミドルウェア
+    # NOTE: 処理段階の記録には計測のコストがかかるため、出力先が無ければ記録しない
+    if enable_server_timing or request_trace_log is not None:
+        trace_log = (
+            None if request_trace_log is None else _RequestTraceLog(request_trace_log)
+        )
+        app.add_middleware(
+            _RequestTraceMiddleware,
+            server_timing=enable_server_timing,
+            trace_log=trace_log,
+        )
+
+    # 抽選されたリクエストをプロファイリングするミドルウェア
+    if request_profiler is not None:
+        app.add_middleware(
+            _RequestProfilerMiddleware, request_profiler=request_profiler
+        )
+
     return app
@@ -0,0 +1,22 @@
+"""計測値の公開機能を提供する API Router"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from voicevox_engine.metrics import MetricsRegistry
+
+_PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def generate_metrics_router(metrics_registry: MetricsRegistry) -> APIRouter:
+    """計測値 API Router を生成する"""
+    router = APIRouter(tags=["その他"])
+
+    @router.get("/metrics", response_class=PlainTextResponse)
+    def metrics() -> PlainTextResponse:
+        """処理段階ごとの所要時間やキャッシュなどの統計情報を Prometheus テキスト形式で取得します。"""
+        return PlainTextResponse(
+            metrics_registry.render(), media_type=_PROMETHEUS_CONTENT_TYPE
+        )
+
+    return router
@@ -1,15 +1,18 @@
 """モーフィング機能を提供する API Router"""
 
 from functools import lru_cache
-from tempfile import NamedTemporaryFile
+from traceback import print_exception
 from typing import Annotated
 
-import soundfile
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic.json_schema import SkipJsonSchema
-from starlette.background import BackgroundTask
-from starlette.responses import FileResponse
+from starlette.responses import Response
 
+from voicevox_engine.app.dependencies import ControlAdmission
+from voicevox_engine.cancellable_engine import (
+    CancellableEngine,
+    CancellableEngineInternalError,
+)
 from voicevox_engine.metas.metas import StyleId
 from voicevox_engine.metas.metas_store import MetasStore
 from voicevox_engine.model import AudioQuery
@@ -24,7 +27,7 @@ from voicevox_engine.morphing.morphing import (
     synthesis_morphing_parameter as _synthesis_morphing_parameter,
 )
 from voicevox_engine.tts_pipeline.tts_engine import LATEST_VERSION, TTSEngineManager
-from voicevox_engine.utility.file_utility import try_delete_file
+from voicevox_engine.tts_pipeline.wav_encoder import encode_wav
 
 # キャッシュを有効化
 # モジュール側でlru_cacheを指定するとキャッシュを制御しにくいため、HTTPサーバ側で指定する
@@ -33,11 +36,28 @@ synthesis_morphing_parameter = lru_cache(maxsize=4)(_synthesis_morphing_paramete
 
 
 def generate_morphing_router(
-    tts_engines: TTSEngineManager, metas_store: MetasStore
+    tts_engines: TTSEngineManager,
+    metas_store: MetasStore,
+    control_admission: ControlAdmission,
+    cancellable_engine: CancellableEngine | None = None,
 ) -> APIRouter:
     """モーフィング API Router を生成する"""
     router = APIRouter(tags=["音声合成"])
 
+    def verify_morphable(
+        base_style_id: StyleId, target_style_id: StyleId, core_version: str | None
+    ) -> None:
+        """モーフィングが許可されないキャラクターペアを拒否する。"""
+        characters = metas_store.characters(core_version)
+        try:
+            morphable = is_morphable(characters, base_style_id, target_style_id)
+        except StyleIdNotFoundError as e:
+            msg = f"該当するスタイル(style_id={e.style_id})が見つかりません"
+            raise HTTPException(status_code=404, detail=msg) from e
+        if not morphable:
+            msg = "指定されたスタイルペアでのモーフィングはできません"
+            raise HTTPException(status_code=400, detail=msg)
+
     @router.post(
         "/morphable_targets",
         summary="指定したスタイルに対してエンジン内のキャラクターがモーフィングが可能か判定する",
@@ -66,7 +86,8 @@ def generate_morphing_router(
 
     @router.post(
         "/synthesis_morphing",
-        response_class=FileResponse,
+        dependencies=[Depends(control_admission)],
+        response_class=Response,
         responses={
             200: {
                 "content": {
@@ -88,7 +109,7 @@ def generate_morphing_router(
             ),
         ] = True,
         core_version: str | SkipJsonSchema[None] = None,
-    ) -> FileResponse:
+    ) -> Response:
         """
         指定された2種類のスタイルで音声を合成、指定した割合でモーフィングした音声を得ます。
 
@@ -97,16 +118,7 @@ def generate_morphing_router(
         version = core_version or LATEST_VERSION
         engine = tts_engines.get_tts_engine(version)
 
-        # モーフィングが許可されないキャラクターペアを拒否する
-        characters = metas_store.characters(core_version)
-        try:
-            morphable = is_morphable(characters, base_style_id, target_style_id)
-        except StyleIdNotFoundError as e:
-            msg = f"該当するスタイル(style_id={e.style_id})が見つかりません"
-            raise HTTPException(status_code=404, detail=msg) from e
-        if not morphable:
-            msg = "指定されたスタイルペアでのモーフィングはできません"
-            raise HTTPException(status_code=400, detail=msg)
+        verify_morphable(base_style_id, target_style_id, core_version)
 
         # 生成したパラメータはキャッシュされる
         morph_param = synthesis_morphing_parameter(
@@ -124,18 +136,67 @@ def generate_morphing_router(
             output_stereo=query.outputStereo,
         )
 
-        with NamedTemporaryFile(delete=False) as f:
-            soundfile.write(
-                file=f,
-                data=morph_wave,
-                samplerate=query.outputSamplingRate,
-                format="WAV",
+        wav = encode_wav(morph_wave, query.outputSamplingRate)
+        return Response(wav, media_type="audio/wav")
+
+    @router.post(
+        "/cancellable_synthesis_morphing",
+        dependencies=[Depends(control_admission)],
+        response_class=Response,
+        responses={
+            200: {
+                "content": {
+                    "audio/wav": {"schema": {"type": "string", "format": "binary"}}
+                },
+            }
+        },
+        summary="2種類のスタイルでモーフィングした音声を合成する（キャンセル可能）",
+    )
+    async def cancellable_synthesis_morphing(
+        query: AudioQuery,
+        request: Request,
+        base_style_id: Annotated[StyleId, Query(alias="base_speaker")],
+        target_style_id: Annotated[StyleId, Query(alias="target_speaker")],
+        morph_rate: Annotated[float, Query(ge=0.0, le=1.0)],
+        enable_interrogative_upspeak: Annotated[
+            bool,
+            Query(
+                description="疑問系のテキストが与えられたら語尾を自動調整する",
+            ),
+        ] = True,
+        core_version: str | SkipJsonSchema[None] = None,
+    ) -> Response:
+        """
+        指定された2種類のスタイルで音声を合成、指定した割合でモーフィングした音声を得ます。接続が切断された場合は合成を中止します。
+
+        モーフィングの割合は`morph_rate`で指定でき、0.0でベースのスタイル、1.0でターゲットのスタイルに近づきます。
+        """
+        if cancellable_engine is None:
+            raise HTTPException(
+                status_code=404,
+                detail="実験的機能はデフォルトで無効になっています。使用するには引数を指定してください。",
             )
+        verify_morphable(base_style_id, target_style_id, core_version)
 
-        return FileResponse(
-            f.name,
-            media_type="audio/wav",
-            background=BackgroundTask(try_delete_file, f.name),
-        )
+        try:
+            version = core_version or LATEST_VERSION
+            async with cancellable_engine.watch_disconnection(request):
+                wav = await cancellable_engine.synthesize_morphed_wave_async(
+                    query,
+                    base_style_id,
+                    target_style_id,
+                    morph_rate,
+                    enable_interrogative_upspeak,
+                    request=request,
+                    version=version,
+                )
+        except CancellableEngineInternalError as e:
+            print_exception(e)
+            raise HTTPException(status_code=500) from e
+
+        if len(wav) == 0:
+            raise HTTPException(status_code=422, detail="不明なバージョンです")
+
+        return Response(wav, media_type="audio/wav")
 
     return router
@@ -0,0 +1,67 @@
+"""リクエストのプロファイリング機能を提供する API Router"""
+
+from typing import Annotated, Self
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel, Field
+
+from voicevox_engine.request_profiler import RequestProfiler, RequestProfilerStats
+
+from ..dependencies import VerifyMutabilityAllowed
+
+
+class RequestProfilerInfo(BaseModel):
+    """リクエストのプロファイラーの状態。"""
+
+    sample_rate: float = Field(
+        description="プロファイリングの対象とするリクエストの割合。0の場合は無効"
+    )
+    interval_sec: float = Field(description="スタックを採取する間隔（秒）")
+    profiled_requests: int = Field(
+        description="これまでにプロファイリングの対象としたリクエスト数"
+    )
+    samples: int = Field(description="これまでに採取したスタック数")
+    output_dir: str = Field(description="プロファイルの書き出し先ディレクトリ")
+
+    @classmethod
+    def generate_from(cls, stats: RequestProfilerStats) -> Self:
+        """`RequestProfilerStats` インスタンスからこのインスタンスを生成する。"""
+        return cls(
+            sample_rate=stats.sample_rate,
+            interval_sec=stats.interval_sec,
+            profiled_requests=stats.profiled_requests,
+            samples=stats.samples,
+            output_dir=str(stats.output_dir),
+        )
+
+
+def generate_profiler_router(
+    request_profiler: RequestProfiler, verify_mutability: VerifyMutabilityAllowed
+) -> APIRouter:
+    """プロファイラー API Router を生成する"""
+    router = APIRouter(tags=["その他"])
+
+    @router.get("/profiler")
+    def get_profiler() -> RequestProfilerInfo:
+        """リクエストのプロファイラーの状態を取得します。"""
+        return RequestProfilerInfo.generate_from(request_profiler.stats())
+
+    @router.put("/profiler", status_code=204, dependencies=[Depends(verify_mutability)])
+    def put_profiler(
+        sample_rate: Annotated[
+            float,
+            Query(
+                ge=0.0,
+                le=1.0,
+                description="プロファイリングの対象とするリクエストの割合。0の場合は無効",
+            ),
+        ],
+    ) -> None:
+        """
+        リクエストのプロファイリングを設定します。
+
+        指定した割合のリクエストの処理中にスタックを採取し、API ごとに collapsed stack 形式で集計したプロファイルを書き出します。
+        """
+        request_profiler.set_sample_rate(sample_rate)
+
+    return router
@@ -1,22 +1,26 @@
 """音声合成機能を提供する API Router"""
 
-import zipfile
-from tempfile import NamedTemporaryFile, TemporaryFile
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from contextvars import copy_context
 from traceback import print_exception
-from typing import Annotated, Self
+from typing import Annotated, Literal, Self
 
-import soundfile
-from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel, Field
 from pydantic.json_schema import SkipJsonSchema
-from starlette.background import BackgroundTask
-from starlette.responses import FileResponse
+from starlette.concurrency import iterate_in_threadpool
+from starlette.responses import Response, StreamingResponse
 
+from voicevox_engine.app.dependencies import ControlAdmission
 from voicevox_engine.cancellable_engine import (
     CancellableEngine,
     CancellableEngineInternalError,
 )
 from voicevox_engine.core.core_adapter import DeviceSupport
+from voicevox_engine.core.model_residency import ModelResidencyStats
 from voicevox_engine.metas.metas import StyleId
 from voicevox_engine.model import AudioQuery
 from voicevox_engine.preset.preset_manager import (
@@ -47,7 +51,12 @@ from voicevox_engine.tts_pipeline.tts_engine import (
     LATEST_VERSION,
     TTSEngineManager,
 )
-from voicevox_engine.utility.file_utility import try_delete_file
+from voicevox_engine.tts_pipeline.wav_encoder import (
+    encode_wav,
+    wav_header_for_stream,
+    wave_to_pcm_bytes,
+)
+from voicevox_engine.utility.zip_utility import stream_zip
 
 
 class ParseKanaBadRequest(BaseModel):
@@ -82,17 +91,87 @@ class SupportedDevicesInfo(BaseModel):
         )
 
 
+class ResidentStyleInfo(BaseModel):
+    """音声合成モデルが常駐しているスタイルの情報。"""
+
+    style_id: StyleId = Field(description="スタイルID")
+    approx_bytes: int = Field(
+        description="読み込みによって増えたメモリ使用量の概算（バイト）。他のスタイルとモデルを共有する場合は0"
+    )
+    idle_seconds: float = Field(description="最後に利用されてからの経過時間（秒）")
+    pinned: bool = Field(description="メモリ上限による解放の対象外か")
+
+
+class ModelResidencyInfo(BaseModel):
+    """音声合成モデルの常駐状況。"""
+
+    memory_budget_bytes: int | None = Field(
+        description="音声合成モデルが使うメモリの上限（バイト）。nullの場合は無制限"
+    )
+    resident_bytes: int = Field(
+        description="常駐している音声合成モデルが使うメモリの概算（バイト）"
+    )
+    evictions: int = Field(description="音声合成モデルを個別に解放した回数")
+    recycles: int = Field(
+        description="音声合成モデルを解放するためにコアを再初期化した回数"
+    )
+    styles: list[ResidentStyleInfo] = Field(
+        description="音声合成モデルが常駐しているスタイルの一覧"
+    )
+
+    @classmethod
+    def generate_from(cls, stats: ModelResidencyStats) -> Self:
+        """`ModelResidencyStats` インスタンスからこのインスタンスを生成する。"""
+        return cls(
+            memory_budget_bytes=stats.memory_budget_bytes,
+            resident_bytes=stats.resident_bytes,
+            evictions=stats.evictions,
+            recycles=stats.recycles,
+            styles=[
+                ResidentStyleInfo(
+                    style_id=style.style_id,
+                    approx_bytes=style.approx_bytes,
+                    idle_seconds=style.idle_seconds,
+                    pinned=style.pinned,
+                )
+                for style in stats.styles
+            ],
+        )
+
+
 def generate_tts_pipeline_router(
     tts_engines: TTSEngineManager,
     song_engines: SongEngineManager,
     preset_manager: PresetManager,
     cancellable_engine: CancellableEngine | None,
+    control_admission: ControlAdmission,
+    multi_synthesis_workers: int = 1,
 ) -> APIRouter:
     """音声合成 API Router を生成する"""
     router = APIRouter()
 
+    def create_default_audio_query(
+        accent_phrases: list[AccentPhrase], default_sampling_rate: int
+    ) -> AudioQuery:
+        """アクセント句系列から初期値の音声合成用のクエリを生成する。"""
+        return AudioQuery(
+            accent_phrases=accent_phrases,
+            speedScale=1,
+            pitchScale=0,
+            intonationScale=1,
+            volumeScale=1,
+            prePhonemeLength=0.1,
+            postPhonemeLength=0.1,
+            pauseLength=None,
+            pauseLengthScale=1,
+            outputSamplingRate=default_sampling_rate,
+            outputStereo=False,
+            kana=create_kana(accent_phrases),
+        )
+
     @router.post(
         "/audio_query",
+        dependencies=[Depends(control_admission)],
         tags=["クエリ作成"],
         summary="音声合成用のクエリを作成する",
     )
@@ -108,23 +187,34 @@ def generate_tts_pipeline_router(
         accent_phrases = engine.create_accent_phrases(
             text, style_id, enable_katakana_english
         )
-        return AudioQuery(
-            accent_phrases=accent_phrases,
-            speedScale=1,
-            pitchScale=0,
-            intonationScale=1,
-            volumeScale=1,
-            prePhonemeLength=0.1,
-            postPhonemeLength=0.1,
-            pauseLength=None,
-            pauseLengthScale=1,
-            outputSamplingRate=engine.default_sampling_rate,
-            outputStereo=False,
-            kana=create_kana(accent_phrases),
+        return create_default_audio_query(accent_phrases, engine.default_sampling_rate)
+
+    @router.post(
+        "/audio_query_batch",
+        dependencies=[Depends(control_admission)],
+        tags=["クエリ作成"],
+        summary="複数のテキストから音声合成用のクエリをまとめて作成する",
+    )
+    def audio_query_batch(
+        texts: list[str],
+        style_id: Annotated[StyleId, Query(alias="speaker")],
+        enable_katakana_english: bool = True,
+        core_version: str | SkipJsonSchema[None] = None,
+    ) -> list[AudioQuery]:
+        """複数のテキストそれぞれに対する音声合成用のクエリの初期値を、テキストと同じ順序で得ます。音素長と音高の推論はテキスト間でまとめて行われます。"""
+        version = core_version or LATEST_VERSION
+        engine = tts_engines.get_tts_engine(version)
+        accent_phrases_list = engine.create_accent_phrases_batch(
+            texts, style_id, enable_katakana_english
         )
+        return [
+            create_default_audio_query(accent_phrases, engine.default_sampling_rate)
+            for accent_phrases in accent_phrases_list
+        ]
 
     @router.post(
         "/audio_query_from_preset",
+        dependencies=[Depends(control_admission)],
         tags=["クエリ作成"],
         summary="音声合成用のクエリをプリセットを用いて作成する",
     )
@@ -173,6 +263,7 @@ def generate_tts_pipeline_router(
 
     @router.post(
         "/accent_phrases",
+        dependencies=[Depends(control_admission)],
         tags=["クエリ編集"],
         summary="テキストからアクセント句を得る",
         responses={
@@ -215,6 +306,7 @@ def generate_tts_pipeline_router(
 
     @router.post(
         "/mora_data",
+        dependencies=[Depends(control_admission)],
         tags=["クエリ編集"],
         summary="アクセント句から音素の長さと音高を得る",
     )
@@ -229,6 +321,7 @@ def generate_tts_pipeline_router(
 
     @router.post(
         "/mora_length",
+        dependencies=[Depends(control_admission)],
         tags=["クエリ編集"],
         summary="アクセント句から音素の長さを得る",
     )
@@ -243,6 +336,7 @@ def generate_tts_pipeline_router(
 
     @router.post(
         "/mora_pitch",
+        dependencies=[Depends(control_admission)],
         tags=["クエリ編集"],
         summary="アクセント句から音高を得る",
     )
@@ -257,7 +351,8 @@ def generate_tts_pipeline_router(
 
     @router.post(
         "/synthesis",
-        response_class=FileResponse,
+        dependencies=[Depends(control_admission)],
+        response_class=Response,
         responses={
             200: {
                 "content": {
@@ -278,27 +373,76 @@ def generate_tts_pipeline_router(
             ),
         ] = True,
         core_version: str | SkipJsonSchema[None] = None,
-    ) -> FileResponse:
+    ) -> Response:
         version = core_version or LATEST_VERSION
         engine = tts_engines.get_tts_engine(version)
         wave = engine.synthesize_wave(
             query, style_id, enable_interrogative_upspeak=enable_interrogative_upspeak
         )
 
-        with NamedTemporaryFile(delete=False) as f:
-            soundfile.write(
-                file=f, data=wave, samplerate=query.outputSamplingRate, format="WAV"
-            )
+        wav = encode_wav(wave, query.outputSamplingRate)
+        return Response(wav, media_type="audio/wav")
 
-        return FileResponse(
-            f.name,
-            media_type="audio/wav",
-            background=BackgroundTask(try_delete_file, f.name),
+    @router.post(
+        "/streaming_synthesis",
+        dependencies=[Depends(control_admission)],
+        response_class=StreamingResponse,
+        responses={
+            200: {
+                "content": {
+                    "audio/wav": {"schema": {"type": "string", "format": "binary"}},
+                    "audio/L16": {"schema": {"type": "string", "format": "binary"}},
+                },
+            }
+        },
+        tags=["音声合成"],
+        summary="音声合成し、合成できた部分から逐次出力する",
+    )
+    def streaming_synthesis(
+        query: AudioQuery,
+        style_id: Annotated[StyleId, Query(alias="speaker")],
+        enable_interrogative_upspeak: Annotated[
+            bool,
+            Query(
+                description="疑問系のテキストが与えられたら語尾を自動調整する",
+            ),
+        ] = True,
+        audio_format: Annotated[
+            Literal["wav", "pcm"],
+            Query(
+                description=(
+                    "出力形式。wav はサイズ未確定の WAV ヘッダーに続けて PCM を、"
+                    "pcm は 16bit リトルエンディアンの PCM のみを出力する"
+                ),
+            ),
+        ] = "wav",
+        core_version: str | SkipJsonSchema[None] = None,
+    ) -> StreamingResponse:
+        """文中の無音区間ごとに音声を合成し、合成できた区間から逐次出力します。出力される音声は`/synthesis`と厳密には一致しません。"""
+        version = core_version or LATEST_VERSION
+        engine = tts_engines.get_tts_engine(version)
+        waves = engine.synthesize_wave_stream(
+            query, style_id, enable_interrogative_upspeak=enable_interrogative_upspeak
         )
+        sampling_rate = query.outputSamplingRate
+
+        def generate_audio() -> Iterator[bytes]:
+            if audio_format == "wav":
+                yield wav_header_for_stream(sampling_rate, query.outputStereo)
+            for wave in waves:
+                yield wave_to_pcm_bytes(wave, sampling_rate)
+
+        if audio_format == "wav":
+            media_type = "audio/wav"
+        else:
+            n_channels = 2 if query.outputStereo else 1
+            media_type = f"audio/L16;rate={sampling_rate};channels={n_channels}"
+        return StreamingResponse(generate_audio(), media_type=media_type)
 
     @router.post(
         "/cancellable_synthesis",
-        response_class=FileResponse,
+        dependencies=[Depends(control_admission)],
+        response_class=Response,
         responses={
             200: {
                 "content": {
@@ -309,13 +453,13 @@ def generate_tts_pipeline_router(
         tags=["音声合成"],
         summary="音声合成する（キャンセル可能）",
     )
-    def cancellable_synthesis(
+    async def cancellable_synthesis(
         query: AudioQuery,
         request: Request,
         style_id: Annotated[StyleId, Query(alias="speaker")],
         enable_interrogative_upspeak: bool = True,
         core_version: str | SkipJsonSchema[None] = None,
-    ) -> FileResponse:
+    ) -> Response:
         if cancellable_engine is None:
             raise HTTPException(
                 status_code=404,
@@ -323,29 +467,27 @@ def generate_tts_pipeline_router(
             )
         try:
             version = core_version or LATEST_VERSION
-            f_name = cancellable_engine.synthesize_wave(
-                query,
-                style_id,
-                enable_interrogative_upspeak=enable_interrogative_upspeak,
-                request=request,
-                version=version,
-            )
+            async with cancellable_engine.watch_disconnection(request):
+                wav = await cancellable_engine.synthesize_wave_async(
+                    query,
+                    style_id,
+                    enable_interrogative_upspeak=enable_interrogative_upspeak,
+                    request=request,
+                    version=version,
+                )
         except CancellableEngineInternalError as e:
             print_exception(e)
             raise HTTPException(status_code=500) from e
 
-        if f_name == "":
+        if len(wav) == 0:
             raise HTTPException(status_code=422, detail="不明なバージョンです")
 
-        return FileResponse(
-            f_name,
-            media_type="audio/wav",
-            background=BackgroundTask(try_delete_file, f_name),
-        )
+        return Response(wav, media_type="audio/wav")
 
     @router.post(
         "/multi_synthesis",
-        response_class=FileResponse,
+        dependencies=[Depends(control_admission)],
+        response_class=Response,
         responses={
             200: {
                 "content": {
@@ -358,9 +500,10 @@ def generate_tts_pipeline_router(
         tags=["音声合成"],
         summary="複数まとめて音声合成する",
     )
-    def multi_synthesis(
+    async def multi_synthesis(
         queries: list[AudioQuery],
         style_id: Annotated[StyleId, Query(alias="speaker")],
+        request: Request,
         enable_interrogative_upspeak: Annotated[
             bool,
             Query(
@@ -368,41 +511,76 @@ def generate_tts_pipeline_router(
             ),
         ] = True,
         core_version: str | SkipJsonSchema[None] = None,
-    ) -> FileResponse:
+    ) -> Response:
         version = core_version or LATEST_VERSION
         engine = tts_engines.get_tts_engine(version)
         sampling_rate = queries[0].outputSamplingRate
 
-        with NamedTemporaryFile(delete=False) as f:
-            with zipfile.ZipFile(f, mode="a") as zip_file:
-                for i in range(len(queries)):
-                    if queries[i].outputSamplingRate != sampling_rate:
-                        msg = "サンプリングレートが異なるクエリがあります"
-                        raise HTTPException(status_code=422, detail=msg)
-
-                    with TemporaryFile() as wav_file:
-                        wave = engine.synthesize_wave(
-                            queries[i],
-                            style_id,
-                            enable_interrogative_upspeak=enable_interrogative_upspeak,
-                        )
-                        soundfile.write(
-                            file=wav_file,
-                            data=wave,
-                            samplerate=sampling_rate,
-                            format="WAV",
-                        )
-                        wav_file.seek(0)
-                        zip_file.writestr(f"{str(i + 1).zfill(3)}.wav", wav_file.read())
-
-        return FileResponse(
-            f.name,
-            media_type="application/zip",
-            background=BackgroundTask(try_delete_file, f.name),
+        for query in queries:
+            if query.outputSamplingRate != sampling_rate:
+                msg = "サンプリングレートが異なるクエリがあります"
+                raise HTTPException(status_code=422, detail=msg)
+
+        def synthesize(query: AudioQuery) -> bytes | memoryview:
+            """クエリから音声を合成し、WAV 形式のバイト列を返す。"""
+            if cancellable_engine is not None:
+                wav = cancellable_engine.synthesize_wave(
+                    query, style_id, enable_interrogative_upspeak, request, version
+                )
+                if len(wav) == 0:
+                    raise HTTPException(status_code=422, detail="不明なバージョンです")
+                return wav
+            wave = engine.synthesize_wave(
+                query,
+                style_id,
+                enable_interrogative_upspeak=enable_interrogative_upspeak,
+            )
+            return encode_wav(wave, sampling_rate)
+
+        # NOTE: 切断の監視はレスポンスの送信完了まで続ける
+        exit_stack = AsyncExitStack()
+        if cancellable_engine is not None:
+            await exit_stack.enter_async_context(
+                cancellable_engine.watch_disconnection(request)
+            )
+
+        # NOTE: 1 つのリクエストが他のリクエストの合成を待たせないよう、ワーカーはリクエストごとに用意する
+        # NOTE: キャンセル可能な音声合成が有効な場合、各ワーカーはその合成用プロセスを利用する
+        executor = ThreadPoolExecutor(
+            max_workers=min(multi_synthesis_workers, len(queries)),
+            thread_name_prefix="multi_synthesis",
         )
+        # NOTE: 切断などで送信が中断された場合も、未着手の合成を取り消してワーカーを終了させる
+        exit_stack.callback(executor.shutdown, wait=False, cancel_futures=True)
+
+        # NOTE: 全クエリをワーカーへ投入し、合成済みのものから順に ZIP のエントリとして送信する
+        # NOTE: ワーカーでの処理段階もリクエストに記録されるよう、コンテキストを引き継ぐ
+        futures = [executor.submit(copy_context().run, synthesize, q) for q in queries]
+
+        # NOTE: レスポンスの送信開始後はエラーを返せないため、最初の音声は送信開始前に合成する
+        try:
+            await asyncio.wrap_future(futures[0])
+        except BaseException:
+            await exit_stack.aclose()
+            raise
+
+        def generate_entries() -> Iterator[bytes]:
+            entries = (
+                (f"{str(i + 1).zfill(3)}.wav", future.result())
+                for i, future in enumerate(futures)
+            )
+            yield from stream_zip(entries)
+
+        async def generate_zip() -> AsyncIterator[bytes]:
+            async with exit_stack:
+                async for chunk in iterate_in_threadpool(generate_entries()):
+                    yield chunk
+
+        return StreamingResponse(generate_zip(), media_type="application/zip")
 
     @router.post(
         "/sing_frame_audio_query",
+        dependencies=[Depends(control_admission)],
         tags=["クエリ作成"],
         summary="歌唱音声合成用のクエリを作成する",
     )
@@ -432,6 +610,7 @@ def generate_tts_pipeline_router(
 
     @router.post(
         "/sing_frame_f0",
+        dependencies=[Depends(control_admission)],
         tags=["クエリ編集"],
         summary="楽譜・歌唱音声合成用のクエリからフレームごとの基本周波数を得る",
     )
@@ -452,6 +631,7 @@ def generate_tts_pipeline_router(
 
     @router.post(
         "/sing_frame_volume",
+        dependencies=[Depends(control_admission)],
         tags=["クエリ編集"],
         summary="楽譜・歌唱音声合成用のクエリからフレームごとの音量を得る",
     )
@@ -472,7 +652,8 @@ def generate_tts_pipeline_router(
 
     @router.post(
         "/frame_synthesis",
-        response_class=FileResponse,
+        dependencies=[Depends(control_admission)],
+        response_class=Response,
         responses={
             200: {
                 "content": {
@@ -486,7 +667,7 @@ def generate_tts_pipeline_router(
         query: FrameAudioQuery,
         style_id: Annotated[StyleId, Query(alias="speaker")],
         core_version: str | SkipJsonSchema[None] = None,
-    ) -> FileResponse:
+    ) -> Response:
         """歌唱音声合成を行います。"""
         version = core_version or LATEST_VERSION
         engine = song_engines.get_song_engine(version)
@@ -495,20 +676,55 @@ def generate_tts_pipeline_router(
         except SongInvalidInputError as e:
             raise HTTPException(status_code=400, detail=str(e)) from e
 
-        with NamedTemporaryFile(delete=False) as f:
-            soundfile.write(
-                file=f, data=wave, samplerate=query.outputSamplingRate, format="WAV"
+        wav = encode_wav(wave, query.outputSamplingRate)
+        return Response(wav, media_type="audio/wav")
+
+    @router.post(
+        "/cancellable_frame_synthesis",
+        dependencies=[Depends(control_admission)],
+        response_class=Response,
+        responses={
+            200: {
+                "content": {
+                    "audio/wav": {"schema": {"type": "string", "format": "binary"}}
+                },
+            }
+        },
+        tags=["音声合成"],
+        summary="歌唱音声合成を行う（キャンセル可能）",
+    )
+    async def cancellable_frame_synthesis(
+        query: FrameAudioQuery,
+        request: Request,
+        style_id: Annotated[StyleId, Query(alias="speaker")],
+        core_version: str | SkipJsonSchema[None] = None,
+    ) -> Response:
+        """歌唱音声合成を行います。接続が切断された場合は合成を中止します。"""
+        if cancellable_engine is None:
+            raise HTTPException(
+                status_code=404,
+                detail="実験的機能はデフォルトで無効になっています。使用するには引数を指定してください。",
             )
+        try:
+            version = core_version or LATEST_VERSION
+            async with cancellable_engine.watch_disconnection(request):
+                wav = await cancellable_engine.frame_synthesize_wave_async(
+                    query, style_id, request=request, version=version
+                )
+        except SongInvalidInputError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        except CancellableEngineInternalError as e:
+            print_exception(e)
+            raise HTTPException(status_code=500) from e
 
-        return FileResponse(
-            f.name,
-            media_type="audio/wav",
-            background=BackgroundTask(try_delete_file, f.name),
-        )
+        if len(wav) == 0:
+            raise HTTPException(status_code=422, detail="不明なバージョンです")
+
+        return Response(wav, media_type="audio/wav")
 
     @router.post(
         "/connect_waves",
-        response_class=FileResponse,
+        response_class=Response,
         responses={
             200: {
                 "content": {
@@ -519,26 +735,15 @@ def generate_tts_pipeline_router(
         tags=["その他"],
         summary="base64エンコードされた複数のwavデータを一つに結合する",
     )
-    def connect_waves(waves: list[str]) -> FileResponse:
+    def connect_waves(waves: list[str]) -> Response:
         """base64エンコードされたwavデータを一纏めにし、wavファイルで返します。"""
         try:
             waves_nparray, sampling_rate = connect_base64_waves(waves)
         except ConnectBase64WavesException as e:
             raise HTTPException(status_code=422, detail=str(e)) from e
 
-        with NamedTemporaryFile(delete=False) as f:
-            soundfile.write(
-                file=f,
-                data=waves_nparray,
-                samplerate=sampling_rate,
-                format="WAV",
-            )
-
-        return FileResponse(
-            f.name,
-            media_type="audio/wav",
-            background=BackgroundTask(try_delete_file, f.name),
-        )
+        wav = encode_wav(waves_nparray, sampling_rate)
+        return Response(wav, media_type="audio/wav")
 
     @router.post(
         "/validate_kana",
@@ -598,6 +803,39 @@ def generate_tts_pipeline_router(
         engine = tts_engines.get_tts_engine(version)
         return engine.is_synthesis_initialized(style_id)
 
+    @router.post("/pin_speaker", status_code=204, tags=["その他"])
+    def pin_speaker(
+        style_id: Annotated[StyleId, Query(alias="speaker")],
+        core_version: str | SkipJsonSchema[None] = None,
+    ) -> None:
+        """
+        指定されたスタイルを初期化し、メモリ上限による音声合成モデルの解放の対象外にします。
+
+        頻繁に使うスタイルの初回実行時の待ち時間を避けるために使います。
+        """
+        version = core_version or LATEST_VERSION
+        engine = tts_engines.get_tts_engine(version)
+        engine.pin_synthesis(style_id)
+
+    @router.post("/unpin_speaker", status_code=204, tags=["その他"])
+    def unpin_speaker(
+        style_id: Annotated[StyleId, Query(alias="speaker")],
+        core_version: str | SkipJsonSchema[None] = None,
+    ) -> None:
+        """指定されたスタイルを、メモリ上限による音声合成モデルの解放の対象に戻します。"""
+        version = core_version or LATEST_VERSION
+        engine = tts_engines.get_tts_engine(version)
+        engine.unpin_synthesis(style_id)
+
+    @router.get("/model_residency", tags=["その他"])
+    def model_residency(
+        core_version: str | SkipJsonSchema[None] = None,
+    ) -> ModelResidencyInfo:
+        """音声合成モデルが常駐しているスタイルと、そのメモリ使用量の概算を取得します。"""
+        version = core_version or LATEST_VERSION
+        engine = tts_engines.get_tts_engine(version)
+        return ModelResidencyInfo.generate_from(engine.model_residency)
+
     @router.get("/supported_devices", tags=["その他"])
     def supported_devices(
         core_version: str | SkipJsonSchema[None] = None,
@@ -1,9 +1,20 @@
 """キャンセル可能な音声合成"""
 
 import asyncio
+import atexit
 import sys
-from multiprocessing import Pipe, Process
-from queue import Queue
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from multiprocessing import Pipe, get_context
+from multiprocessing.process import BaseProcess
+from multiprocessing.shared_memory import SharedMemory
+from queue import Empty, Queue
+from typing import Any, Final, TypeAlias
 
 if sys.platform == "win32":
     from multiprocessing.connection import PipeConnection as ConnectionType
@@ -11,15 +22,52 @@ else:
     from multiprocessing.connection import Connection as ConnectionType
 
 from pathlib import Path
-from tempfile import NamedTemporaryFile
 
-import soundfile
+import numpy as np
 from fastapi import Request
+from numpy.typing import NDArray
 
 from .core.core_initializer import initialize_cores
 from .metas.metas import StyleId
 from .model import AudioQuery
-from .tts_pipeline.tts_engine import LatestVersion, make_tts_engines_from_cores
+from .morphing.morphing import synthesis_morphing_parameter, synthesize_morphed_wave
+from .tts_pipeline.model import FrameAudioQuery
+from .tts_pipeline.song_engine import (
+    MockSongEngineNotFound,
+    SongEngineManager,
+    SongEngineNotFound,
+    SongInvalidInputError,
+    make_song_engines_from_cores,
+)
+from .tts_pipeline.tts_engine import (
+    LatestVersion,
+    MockTTSEngineNotFound,
+    TTSEngineManager,
+    TTSEngineNotFound,
+    make_tts_engines_from_cores,
+)
+from .tts_pipeline.wav_encoder import encode_wav
+
+# 各プロセスが音声波形の受け渡しに用いる共有メモリの容量（byte）のデフォルト値
+# NOTE: 24kHz モノラルの float32 波形で約 3 分に相当する
+_DEFAULT_SHARED_MEMORY_SIZE: Final = 16 * 1024 * 1024
+
+# 音声波形のデータ型
+_WAVE_DTYPE: Final = np.float32
+
+# 追加で起動したプロセスを終了するまでの待機時間（秒）のデフォルト値
+_DEFAULT_IDLE_TIMEOUT: Final = 300.0
+
+# 待機時間を超過したプロセスを確認する間隔（秒）の上限
+_MAX_REAP_INTERVAL: Final = 1.0
+
+# 新しく起動するプロセスで事前に初期化する、利用頻度の高いスタイルの数
+_N_PRELOAD_STYLES: Final = 4
+
+# 音声合成用プロセスの起動方式
+# NOTE: プロセスは複数のスレッドから並行して起動されるため、fork では他のスレッドが獲得中のロックを
+#       子プロセスが引き継いでデッドロックしうる。全ての OS で spawn とする
+_process_context: Final = get_context("spawn")
 
 
 class CancellableEngineInternalError(Exception):
@@ -28,6 +76,206 @@ class CancellableEngineInternalError(Exception):
     pass
 
 
+@dataclass(eq=False)
+class _SynthesisProcess:
+    """音声合成を行うサブプロセスと、そのプロセスとの通信手段"""
+
+    process: BaseProcess
+    connection: ConnectionType  # プロセスへのコネクション
+    shared_memory: SharedMemory | None  # 音声波形の受け渡しに用いる共有メモリ
+    idle_since: float = 0.0  # 待機中プールへ移動した時刻 (`time.monotonic()`)
+
+
+# NOTE: ジョブはサブプロセスへ pickle 化して送るため、クエリは Python 組み込み型へ変換して持つ
+#       （転送量と (de)serialize のコストを抑えるため）
+@dataclass(frozen=True)
+class _TalkJob:
+    """トーク音声合成のジョブ"""
+
+    query: dict[str, Any]  # `AudioQuery` を変換したもの
+    style_id: StyleId
+    enable_interrogative_upspeak: bool
+    version: str | LatestVersion
+
+    def run(
+        self, tts_engines: TTSEngineManager, song_engines: SongEngineManager
+    ) -> NDArray[np.float32]:
+        """ジョブを実行し、音声波形を生成する。"""
+        engine = tts_engines.get_tts_engine(self.version)
+        return engine.synthesize_wave(
+            AudioQuery.model_validate(self.query),
+            self.style_id,
+            enable_interrogative_upspeak=self.enable_interrogative_upspeak,
+        )
+
+
+@dataclass(frozen=True)
+class _SongJob:
+    """歌声合成のジョブ"""
+
+    query: dict[str, Any]  # `FrameAudioQuery` を変換したもの
+    style_id: StyleId
+    version: str | LatestVersion
+
+    def run(
+        self, tts_engines: TTSEngineManager, song_engines: SongEngineManager
+    ) -> NDArray[np.float32]:
+        """ジョブを実行し、音声波形を生成する。"""
+        engine = song_engines.get_song_engine(self.version)
+        return engine.frame_synthesize_wave(
+            FrameAudioQuery.model_validate(self.query), self.style_id
+        )
+
+
+@dataclass(frozen=True)
+class _MorphingJob:
+    """モーフィングした音声を合成するジョブ"""
+
+    query: dict[str, Any]  # `AudioQuery` を変換したもの
+    style_id: StyleId  # ベースのスタイル ID
+    target_style_id: StyleId
+    morph_rate: float
+    enable_interrogative_upspeak: bool
+    version: str | LatestVersion
+
+    def run(
+        self, tts_engines: TTSEngineManager, song_engines: SongEngineManager
+    ) -> NDArray[np.float32]:
+        """ジョブを実行し、音声波形を生成する。"""
+        engine = tts_engines.get_tts_engine(self.version)
+        query = AudioQuery.model_validate(self.query)
+        morph_param = _synthesis_morphing_parameter(
+            engine=engine,
+            query=query,
+            base_style_id=self.style_id,
+            target_style_id=self.target_style_id,
+            enable_interrogative_upspeak=self.enable_interrogative_upspeak,
+        )
+        return synthesize_morphed_wave(
+            morph_param=morph_param,
+            morph_rate=self.morph_rate,
+            output_fs=query.outputSamplingRate,
+            output_stereo=query.outputStereo,
+        )
+
+
+_Job: TypeAlias = _TalkJob | _SongJob | _MorphingJob
+
+# サブプロセス内でモーフィング用パラメータをキャッシュする
+_synthesis_morphing_parameter = lru_cache(maxsize=4)(synthesis_morphing_parameter)
+
+# ジョブの実行時に、バージョンが見つからないことを示すエラー
+_VERSION_NOT_FOUND_ERRORS: Final = (
+    TTSEngineNotFound,
+    MockTTSEngineNotFound,
+    SongEngineNotFound,
+    MockSongEngineNotFound,
+)
+
+
+class _IdlePool:
+    """
+    待機中のプロセスを保持する LIFO のプール
+
+    スレッドからのブロッキングな取り出しと、イベントループ上での `await` による取り出しの両方に対応する。
+    空きを待つコルーチンはスレッドを占有せず、プロセスが戻されると直接受け渡される。
+    """
+
+    def __init__(self) -> None:
+        self._items: list[_SynthesisProcess] = []
+        self._not_empty = threading.Condition()
+        self._waiters: deque[
+            tuple[asyncio.AbstractEventLoop, asyncio.Future[_SynthesisProcess]]
+        ] = deque()
+
+    def qsize(self) -> int:
+        """保持しているプロセス数を取得する。"""
+        with self._not_empty:
+            return len(self._items)
+
+    def empty(self) -> bool:
+        """保持しているプロセスが無いか否かを取得する。"""
+        return self.qsize() == 0
+
+    def put(self, item: _SynthesisProcess) -> None:
+        """プロセスを戻す。空きを待つコルーチンがある場合はそのコルーチンへ受け渡す。"""
+        with self._not_empty:
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                if waiter.done() or loop.is_closed():
+                    continue
+                loop.call_soon_threadsafe(self._deliver, waiter, item)
+                return
+            self._items.append(item)
+            self._not_empty.notify()
+
+    def _deliver(
+        self, waiter: asyncio.Future[_SynthesisProcess], item: _SynthesisProcess
+    ) -> None:
+        """イベントループ上で、空きを待つコルーチンへプロセスを受け渡す。"""
+        if waiter.done():
+            # 受け渡しまでの間に待機が取り消された
+            self.put(item)
+        else:
+            waiter.set_result(item)
+
+    def get(self) -> _SynthesisProcess:
+        """プロセスを取り出す。空きが無い場合は空きをブロッキングで待つ。"""
+        with self._not_empty:
+            while not self._items:
+                self._not_empty.wait()
+            return self._items.pop()
+
+    def get_nowait(self) -> _SynthesisProcess:
+        """プロセスを取り出す。空きが無い場合は `queue.Empty` を送出する。"""
+        with self._not_empty:
+            if not self._items:
+                raise Empty
+            return self._items.pop()
+
+    async def get_async(self) -> _SynthesisProcess:
+        """プロセスを取り出す。空きが無い場合はスレッドを占有せずに空きを待つ。"""
+        loop = asyncio.get_running_loop()
+        with self._not_empty:
+            if self._items:
+                return self._items.pop()
+            waiter: asyncio.Future[_SynthesisProcess] = loop.create_future()
+            self._waiters.append((loop, waiter))
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            with self._not_empty:
+                if (loop, waiter) in self._waiters:
+                    self._waiters.remove((loop, waiter))
+            if waiter.done() and not waiter.cancelled():
+                # 受け渡しの直後に取り消されたプロセスをプールへ戻す
+                self.put(waiter.result())
+            raise
+
+
+@dataclass(frozen=True)
+class CancellableEngineStats:
+    """`CancellableEngine` のプロセスプールの統計情報"""
+
+    active: int  # 音声合成中のプロセス数
+    idle: int  # 待機中のプロセス数
+    starting: int  # 起動中のプロセス数
+    queued: int  # 空きプロセスを待っているリクエスト数
+    spawned: int  # これまでに起動が完了したプロセス数
+    reaped: int  # これまでに待機時間の超過で終了したプロセス数
+    spawn_seconds_total: float  # プロセスの起動にかかった時間の合計（秒）
+    last_spawn_seconds: float | None  # 直近に起動したプロセスの起動にかかった時間（秒）
+    standby: int  # 起動済みの予備プロセス数
+    promoted: int  # これまでに予備プロセスから待機中プールへ移動したプロセス数
+    cancelled: int  # これまでに切断で中止した音声合成の数
+    cancel_latency_seconds_total: (
+        float  # 切断の検知から合成の中止までにかかった時間の合計（秒）
+    )
+    last_cancel_latency_seconds: (
+        float | None
+    )  # 直近の切断の検知から合成の中止までにかかった時間（秒）
+
+
 class CancellableEngine:
     """キャンセル可能な合成をサポートする音声合成エンジン"""
 
@@ -40,31 +288,231 @@ class CancellableEngine:
         runtime_dirs: list[Path] | None = None,
         cpu_num_threads: int | None = None,
         enable_mock: bool = True,
+        shared_memory_size: int = _DEFAULT_SHARED_MEMORY_SIZE,
+        max_processes: int | None = None,
+        idle_timeout: float = _DEFAULT_IDLE_TIMEOUT,
+        standby_processes: int = 0,
     ) -> None:
-        """init_processesの数だけ同時処理できるエンジンを立ち上げる。その他の引数はcore_initializerを参照。"""
+        """
+        init_processesの数だけ同時処理できるエンジンを立ち上げる。
+
+        空きプロセスが無い状態でリクエストが来た場合、max_processes を上限にプロセスを追加で起動する。
+        init_processes を超える分のプロセスは、idle_timeout 秒以上待機すると終了される。
+        max_processes を指定しない場合はプロセスを追加で起動しない。
+        standby_processes の数だけ起動済みの予備プロセスを常に用意し、キャンセルで終了したプロセスの
+        作り直しや追加の起動の際には、起動を待たずに予備プロセスを利用する。
+        新しく起動するプロセスでは、利用頻度の高いスタイルを事前に初期化する。
+        各プロセスは shared_memory_size (byte) の共有メモリを介して音声波形を受け渡す。
+        共有メモリに収まらない音声波形や shared_memory_size が 0 の場合はコネクションを介して受け渡す。
+        その他の引数はcore_initializerを参照。
+        """
+        if max_processes is None:
+            max_processes = init_processes
+        if max_processes < init_processes:
+            msg = "max_processes は init_processes 以上である必要があります。"
+            raise ValueError(msg)
+
         self.use_gpu = use_gpu
         self.voicelib_dirs = voicelib_dirs
         self.voicevox_dir = voicevox_dir
         self.runtime_dirs = runtime_dirs
         self.cpu_num_threads = cpu_num_threads
         self.enable_mock = enable_mock
+        self.shared_memory_size = shared_memory_size
+        self.min_processes = init_processes
+        self.max_processes = max_processes
+        self.idle_timeout = idle_timeout
+        self.standby_processes = standby_processes
 
         # 実行中プール
         # 「実行されているリクエスト」と「そのリクエストを処理しているプロセス」のペアのリスト
-        self._actives_pool: list[tuple[Request, Process]] = []
+        self._actives_pool: list[tuple[Request, _SynthesisProcess]] = []
 
         # 待機中プール
-        # 「待機しているプロセス」と「そのプロセスへのコネクション」のペアのキュー
-        self._idles_pool: Queue[tuple[Process, ConnectionType]] = Queue()
+        # NOTE: 直近に使われたプロセスから再利用し、使われないプロセスが待機時間の超過で終了されるよう LIFO とする
+        self._idles_pool = _IdlePool()
+
+        # 予備プール
+        # 起動済みだがリクエストを処理しないプロセス。プロセス数には含めず、待機時間の超過でも終了しない
+        self._standby_pool: Queue[_SynthesisProcess] = Queue()
+
+        # プロセス数と統計情報。`_lock` で保護される
+        self._lock = threading.Lock()
+        # プロセスプールの状態の変化の通知。`_lock` を共有する
+        self._state_changed = threading.Condition(self._lock)
+        self._n_processes = 0  # 起動中のものを含む全プロセス数
+        self._n_starting = 0
+        self._n_queued = 0
+        self._n_spawned = 0
+        self._n_reaped = 0
+        self._spawn_seconds_total = 0.0
+        self._last_spawn_seconds: float | None = None
+        self._n_standby = 0  # 起動中のものを含む予備プロセス数
+        self._n_promoted = 0
+        self._n_cancelled = 0
+        self._cancel_latency_seconds_total = 0.0
+        self._last_cancel_latency_seconds: float | None = None
+
+        # 切断されたリクエスト。`_lock` で保護される
+        self._disconnected_requests: set[Request] = set()
+
+        # バージョンとスタイル ID の組ごとの合成回数。`_lock` で保護される
+        self._style_usage: Counter[tuple[str | LatestVersion, StyleId]] = Counter()
 
-        # 指定された数のプロセスを起動し待機中プールへ移動する
+        # 生成した全ての共有メモリ。終了時に解放する
+        self._shared_memories: set[SharedMemory] = set()
+        atexit.register(self._release_all_shared_memories)
+
+        # 指定された数のプロセスを起動する
         for _ in range(init_processes):
-            self._idles_pool.put(self._start_new_process())
+            self._spawn_process()
+        for _ in range(standby_processes):
+            self._spawn_process(standby=True)
+
+        # 追加で起動したプロセスを待機時間の超過で終了させる
+        if max_processes > init_processes:
+            threading.Thread(target=self._reap_idle_processes_loop, daemon=True).start()
+
+    def stats(self) -> CancellableEngineStats:
+        """プロセスプールの統計情報を取得する。"""
+        with self._lock:
+            return self._stats_locked()
+
+    def wait_for_stats(
+        self,
+        predicate: Callable[[CancellableEngineStats], bool],
+        timeout: float | None = None,
+    ) -> CancellableEngineStats:
+        """
+        プロセスプールの統計情報が条件を満たすまで待ち、条件を満たした統計情報を返す。
+
+        プロセスの起動完了や音声合成の開始・終了など、プロセスプールの状態が変化するたびに条件を判定する。
+
+        Parameters
+        ----------
+        predicate:
+            統計情報が満たすべき条件
+        timeout:
+            待機時間の上限（秒）。None の場合は無制限に待つ
+
+        Raises
+        ------
+        TimeoutError
+            待機時間の上限までに条件を満たさなかった
+        """
+        with self._state_changed:
+            satisfied = self._state_changed.wait_for(
+                lambda: predicate(self._stats_locked()), timeout
+            )
+            if not satisfied:
+                raise TimeoutError("プロセスプールの状態が条件を満たしませんでした。")
+            return self._stats_locked()
+
+    def _stats_locked(self) -> CancellableEngineStats:
+        """プロセスプールの統計情報を取得する。`_lock` を取得した状態で呼ぶ。"""
+        return CancellableEngineStats(
+            active=len(self._actives_pool),
+            idle=self._idles_pool.qsize(),
+            starting=self._n_starting,
+            queued=self._n_queued,
+            spawned=self._n_spawned,
+            reaped=self._n_reaped,
+            spawn_seconds_total=self._spawn_seconds_total,
+            last_spawn_seconds=self._last_spawn_seconds,
+            standby=self._standby_pool.qsize(),
+            promoted=self._n_promoted,
+            cancelled=self._n_cancelled,
+            cancel_latency_seconds_total=self._cancel_latency_seconds_total,
+            last_cancel_latency_seconds=self._last_cancel_latency_seconds,
+        )
+
+    def _notify_state_changed(self) -> None:
+        """プロセスプールの状態の変化を、統計情報を待っているスレッドへ通知する。"""
+        with self._state_changed:
+            self._state_changed.notify_all()
+
+    def _needs_spawn(self) -> bool:
+        """プロセスを追加で起動すべきか否かを判定する。`_lock` を取得した状態で呼ぶ。"""
+        if self._n_processes < self.min_processes:
+            return True
+        # 空きプロセスが無く、起動中のプロセスでは待っているリクエストを賄えない
+        return (
+            self._idles_pool.empty()
+            and self._n_starting < self._n_queued
+            and self._n_processes < self.max_processes
+        )
+
+    def _spawn_process(self, standby: bool = False) -> None:
+        """
+        新しいプロセスをバックグラウンドで起動し、起動が完了したら待機中プールへ移動する。
+
+        standby が偽で起動済みの予備プロセスがある場合は、予備プロセスを即座に待機中プールへ移動し、
+        代わりの予備プロセスを起動する。standby が真の場合は、起動したプロセスを予備プールへ移動する。
+        """
+        if not standby and self._promote_standby_process():
+            self._spawn_process(standby=True)
+            return
+        with self._lock:
+            if standby:
+                self._n_standby += 1
+            else:
+                self._n_processes += 1
+                self._n_starting += 1
+            preload_styles = [
+                style for style, _ in self._style_usage.most_common(_N_PRELOAD_STYLES)
+            ]
+            self._state_changed.notify_all()
+        threading.Thread(
+            target=self._start_new_process,
+            args=(standby, preload_styles),
+            daemon=True,
+        ).start()
+
+    def _promote_standby_process(self) -> bool:
+        """起動済みの予備プロセスを待機中プールへ移動する。移動できた場合は真を返す。"""
+        while True:
+            try:
+                synth_process = self._standby_pool.get_nowait()
+            except Empty:
+                return False
+            with self._lock:
+                self._n_standby -= 1
+            if not synth_process.process.is_alive():
+                # 起動に失敗した、あるいは終了した予備プロセスは破棄する
+                self._discard_process(synth_process)
+                continue
+            with self._lock:
+                self._n_processes += 1
+                self._n_promoted += 1
+            synth_process.idle_since = time.monotonic()
+            self._idles_pool.put(synth_process)
+            self._notify_state_changed()
+            return True
+
+    def _start_new_process(
+        self,
+        standby: bool,
+        preload_styles: list[tuple[str | LatestVersion, StyleId]],
+    ) -> None:
+        """
+        音声合成可能な新しいプロセスを開始し、起動の完了を待って待機中プールあるいは予備プールへ移動する。
+
+        Parameters
+        ----------
+        standby:
+            起動したプロセスを予備プールへ移動するか否か
+        preload_styles:
+            プロセスの起動時に初期化するバージョンとスタイル ID の組のリスト
+        """
+        start_time = time.monotonic()
+
+        shared_memory: SharedMemory | None = None
+        if self.shared_memory_size > 0:
+            shared_memory = SharedMemory(create=True, size=self.shared_memory_size)
+            self._shared_memories.add(shared_memory)
 
-    def _start_new_process(self) -> tuple[Process, ConnectionType]:
-        """音声合成可能な新しいプロセスを開始し、そのプロセスと、プロセスへのコネクションを返す。"""
         connection_outer, connection_inner = Pipe(True)
-        new_process = Process(
+        new_process = _process_context.Process(
             target=start_synthesis_subprocess,
             kwargs={
                 "use_gpu": self.use_gpu,
@@ -74,14 +522,139 @@ class CancellableEngine:
                 "cpu_num_threads": self.cpu_num_threads,
                 "enable_mock": self.enable_mock,
                 "connection": connection_inner,
+                "shared_memory_name": (
+                    shared_memory.name if shared_memory is not None else None
+                ),
+                "preload_styles": preload_styles,
             },
             daemon=True,
         )
         new_process.start()
-        return new_process, connection_outer
+
+        # NOTE: 起動に失敗したプロセスも待機中プールへ移動し、そのプロセスを利用したリクエストへエラーを返す
+        try:
+            connection_outer.recv()  # 起動完了の通知
+            succeeded = True
+        except (EOFError, OSError):
+            succeeded = False
+        spawn_seconds = time.monotonic() - start_time
+
+        synth_process = _SynthesisProcess(
+            new_process, connection_outer, shared_memory, idle_since=time.monotonic()
+        )
+        with self._lock:
+            if succeeded:
+                self._n_spawned += 1
+                self._spawn_seconds_total += spawn_seconds
+                self._last_spawn_seconds = spawn_seconds
+            if standby:
+                self._standby_pool.put(synth_process)
+            else:
+                self._n_starting -= 1
+                self._idles_pool.put(synth_process)
+            self._state_changed.notify_all()
+
+    def _discard_process(self, synth_process: _SynthesisProcess) -> None:
+        """プロセスを終了し、共有メモリを解放する。プロセス数は呼び出し元で更新する。"""
+        proc = synth_process.process
+        try:
+            if proc.is_alive():
+                proc.terminate()
+                proc.join()
+            proc.close()
+        except ValueError:
+            pass
+        self._release_shared_memory(synth_process.shared_memory)
+
+    def _reap_idle_processes_loop(self) -> None:
+        """待機時間を超過したプロセスを定期的に終了するループを実行する。"""
+        while True:
+            time.sleep(min(self.idle_timeout, _MAX_REAP_INTERVAL))
+            self._reap_idle_processes()
+
+    def _reap_idle_processes(self) -> None:
+        """待機時間が idle_timeout を超えたプロセスを、プロセス数が init_processes を下回らない範囲で終了する。"""
+        now = time.monotonic()
+        reaped: list[_SynthesisProcess] = []
+        with self._lock:
+            idles: list[_SynthesisProcess] = []
+            while True:
+                try:
+                    idles.append(self._idles_pool.get_nowait())
+                except Empty:
+                    break
+
+            # NOTE: LIFO のため、待機開始が古いプロセスほど後に取り出される
+            n_reapable = self._n_processes - self.min_processes
+            for synth_process in reversed(idles):
+                if n_reapable <= 0:
+                    break
+                if now - synth_process.idle_since >= self.idle_timeout:
+                    reaped.append(synth_process)
+                    n_reapable -= 1
+
+            for synth_process in reversed(idles):
+                if synth_process not in reaped:
+                    self._idles_pool.put(synth_process)
+            self._n_processes -= len(reaped)
+            self._n_reaped += len(reaped)
+            self._state_changed.notify_all()
+
+        for synth_process in reaped:
+            self._discard_process(synth_process)
+
+    def _acquire_process(self) -> _SynthesisProcess:
+        """待機中プールからプロセスを取り出す。空きが無い場合は必要に応じてプロセスを追加で起動し、空きを待つ。"""
+        with self._lock:
+            self._n_queued += 1
+            needs_spawn = self._needs_spawn()
+            self._state_changed.notify_all()
+        if needs_spawn:
+            self._spawn_process()
+        try:
+            return self._idles_pool.get()
+        finally:
+            with self._lock:
+                self._n_queued -= 1
+                self._state_changed.notify_all()
+
+    async def _acquire_process_async(self) -> _SynthesisProcess:
+        """`_acquire_process` の非同期版。空きをスレッドを占有せずに待つ。"""
+        with self._lock:
+            self._n_queued += 1
+            needs_spawn = self._needs_spawn()
+            self._state_changed.notify_all()
+        if needs_spawn:
+            self._spawn_process()
+        try:
+            return await self._idles_pool.get_async()
+        finally:
+            with self._lock:
+                self._n_queued -= 1
+                self._state_changed.notify_all()
+
+    def _release_shared_memory(self, shared_memory: SharedMemory | None) -> None:
+        """プロセスの共有メモリを解放する。"""
+        if shared_memory is None or shared_memory not in self._shared_memories:
+            return
+        self._shared_memories.remove(shared_memory)
+        try:
+            shared_memory.close()
+        except BufferError:
+            # NOTE: 音声波形の受け取り中に終了された場合は参照が残っており、参照が無くなった後に GC で閉じられる
+            pass
+        shared_memory.unlink()
+
+    def _release_all_shared_memories(self) -> None:
+        """生成した全ての共有メモリを解放する。"""
+        for shared_memory in list(self._shared_memories):
+            self._release_shared_memory(shared_memory)
 
     def _finalize_con(
-        self, req: Request, proc: Process, sub_proc_con: ConnectionType | None
+        self,
+        req: Request,
+        synth_process: _SynthesisProcess,
+        sub_proc_con: ConnectionType | None,
     ) -> None:
         """
         プロセスを後処理する
@@ -90,7 +663,7 @@ class CancellableEngine:
         ----------
         req:
             HTTP 接続状態に関するオブジェクト
-        proc:
+        synth_process:
             音声合成を行っていたプロセス
         sub_proc_con:
             音声合成を行っていたプロセスとのコネクション
@@ -98,20 +671,26 @@ class CancellableEngine:
         """
         # ペアを実行中プールから除外する
         try:
-            self._actives_pool.remove((req, proc))
+            self._actives_pool.remove((req, synth_process))
         except ValueError:
-            pass
+            # 既に後処理されている
+            return
 
-        # ペアを待機中プールへ移動する
-        try:
-            if not proc.is_alive() or sub_proc_con is None:
-                proc.close()
-                raise ValueError
-            # プロセスが死んでいないので再利用する
-            self._idles_pool.put((proc, sub_proc_con))
-        except ValueError:
-            # プロセスが死んでいるので新しく作り直す
-            self._idles_pool.put(self._start_new_process())
+        # プロセスが死んでいないので再利用する
+        if synth_process.process.is_alive() and sub_proc_con is not None:
+            synth_process.idle_since = time.monotonic()
+            self._idles_pool.put(synth_process)
+            self._notify_state_changed()
+            return
+
+        # プロセスが死んでいるので破棄し、必要であれば新しく作り直す
+        self._discard_process(synth_process)
+        with self._lock:
+            self._n_processes -= 1
+            needs_spawn = self._needs_spawn()
+            self._state_changed.notify_all()
+        if needs_spawn:
+            self._spawn_process()
 
     def synthesize_wave(
         self,
@@ -120,9 +699,11 @@ class CancellableEngine:
         enable_interrogative_upspeak: bool,
         request: Request,
         version: str | LatestVersion,
-    ) -> str:
+    ) -> bytes | memoryview:
         """
-        サブプロセスで音声合成用のクエリ・スタイルIDから音声を生成し、音声ファイル名を返す。
+        サブプロセスで音声合成用のクエリ・スタイルIDから音声を生成し、WAV 形式のバイト列を返す。
+
+        バージョンが見つからない場合は空のバイト列を返す。
 
         Parameters
         ----------
@@ -131,47 +712,333 @@ class CancellableEngine:
         version:
             合成に用いる TTSEngine のバージョン
         """
-        # 待機中プールのペアを実行中プールへ移動する
-        synth_process, synth_connection = self._idles_pool.get()
-        self._actives_pool.append((request, synth_process))
+        job = _TalkJob(
+            query.model_dump(), style_id, enable_interrogative_upspeak, version
+        )
+        return self._run_job(job, query.outputSamplingRate, request)
+
+    async def synthesize_wave_async(
+        self,
+        query: AudioQuery,
+        style_id: StyleId,
+        enable_interrogative_upspeak: bool,
+        request: Request,
+        version: str | LatestVersion,
+    ) -> bytes | memoryview:
+        """
+        `synthesize_wave` の非同期版。
+
+        空きプロセスやサブプロセスからの応答をスレッドを占有せずにイベントループ上で待つ。
+        コルーチンが取り消された場合は、音声合成を行っていたプロセスを終了する。
+        """
+        job = _TalkJob(
+            query.model_dump(), style_id, enable_interrogative_upspeak, version
+        )
+        return await self._run_job_async(job, query.outputSamplingRate, request)
+
+    async def frame_synthesize_wave_async(
+        self,
+        query: FrameAudioQuery,
+        style_id: StyleId,
+        request: Request,
+        version: str | LatestVersion,
+    ) -> bytes | memoryview:
+        """
+        サブプロセスで歌声合成用のクエリ・スタイルIDから音声を生成し、WAV 形式のバイト列を返す。
+
+        バージョンが見つからない場合は空のバイト列を返す。
+        不正な入力の場合はサブプロセスで送出された `SongInvalidInputError` を送出する。
+        """
+        job = _SongJob(query.model_dump(), style_id, version)
+        return await self._run_job_async(job, query.outputSamplingRate, request)
 
-        # プロセスへ入力を渡して音声を合成する
+    async def synthesize_morphed_wave_async(
+        self,
+        query: AudioQuery,
+        base_style_id: StyleId,
+        target_style_id: StyleId,
+        morph_rate: float,
+        enable_interrogative_upspeak: bool,
+        request: Request,
+        version: str | LatestVersion,
+    ) -> bytes | memoryview:
+        """
+        サブプロセスで2種類のスタイルの音声を合成・モーフィングし、WAV 形式のバイト列を返す。
+
+        モーフィングの可否は呼び出し元で判定する。バージョンが見つからない場合は空のバイト列を返す。
+        """
+        job = _MorphingJob(
+            query.model_dump(),
+            base_style_id,
+            target_style_id,
+            morph_rate,
+            enable_interrogative_upspeak,
+            version,
+        )
+        return await self._run_job_async(job, query.outputSamplingRate, request)
+
+    def _run_job(
+        self, job: _Job, sampling_rate: int, request: Request
+    ) -> bytes | memoryview:
+        """サブプロセスでジョブを実行し、生成された音声を WAV 形式のバイト列として返す。"""
+        self._check_request(request, job)
+
+        # 待機中プールのプロセスを実行中プールへ移動する
+        synth_process = self._acquire_process()
+        self._activate_process(request, synth_process)
+        synth_connection = synth_process.connection
+
+        # プロセスへジョブを渡して音声を合成する
         try:
-            synth_connection.send(
-                (query, style_id, enable_interrogative_upspeak, version)
+            synth_connection.send(job)
+            wave_info = synth_connection.recv()
+            wav = _receive_wav(
+                synth_connection, synth_process.shared_memory, wave_info, sampling_rate
             )
-            audio_file_name = synth_connection.recv()
+        except (EOFError, OSError) as e:
+            # NOTE: 送受信中にプロセスが終了されると、コネクションの切断に応じたエラーが送出される
+            self._finalize_con(request, synth_process, None)
+            raise CancellableEngineInternalError(
+                "既にサブプロセスは終了されています"
+            ) from e
+        except Exception:
+            self._finalize_con(request, synth_process, synth_connection)
+            raise
+        self._finalize_con(request, synth_process, synth_connection)
+
+        return wav
+
+    async def _run_job_async(
+        self, job: _Job, sampling_rate: int, request: Request
+    ) -> bytes | memoryview:
+        """`_run_job` の非同期版。"""
+        self._check_request(request, job)
 
-            if not isinstance(audio_file_name, str):
-                # ここには来ないはず
-                raise CancellableEngineInternalError("不正な値が生成されました")
-        except EOFError as e:
+        # 待機中プールのプロセスを実行中プールへ移動する
+        synth_process = await self._acquire_process_async()
+        await self._activate_process_async(request, synth_process)
+        synth_connection = synth_process.connection
+
+        # プロセスへジョブを渡して音声を合成する
+        try:
+            synth_connection.send(job)
+            await _wait_readable(synth_connection)
+            wave_info = synth_connection.recv()
+            # NOTE: 波形の受け取りとエンコードはイベントループを止めないよう別スレッドで行う
+            wav = await asyncio.to_thread(
+                _receive_wav,
+                synth_connection,
+                synth_process.shared_memory,
+                wave_info,
+                sampling_rate,
+            )
+        except (EOFError, OSError) as e:
+            # NOTE: 送受信中にプロセスが終了されると、コネクションの切断に応じたエラーが送出される
+            await self._discard_con_async(request, synth_process)
             raise CancellableEngineInternalError(
                 "既にサブプロセスは終了されています"
             ) from e
+        except asyncio.CancelledError:
+            # NOTE: プロセスとの送受信の途中で中断されるため、プロセスは再利用せずに終了する
+            await self._discard_con_async(request, synth_process)
+            raise
         except Exception:
             self._finalize_con(request, synth_process, synth_connection)
             raise
         self._finalize_con(request, synth_process, synth_connection)
 
-        return audio_file_name
+        return wav
 
-    async def catch_disconnection(self) -> None:
-        """接続監視を行うコルーチン。"""
+    def _check_request(self, request: Request, job: _Job) -> None:
+        """音声合成の開始前に利用状況を記録し、リクエストが切断されていればエラーを送出する。"""
+        with self._lock:
+            self._style_usage[(job.version, job.style_id)] += 1
+        if self._is_disconnected(request):
+            raise CancellableEngineInternalError("既にリクエストは切断されています")
+
+    def _activate_process(
+        self, request: Request, synth_process: _SynthesisProcess
+    ) -> None:
+        """プロセスを実行中プールへ移動する。プロセスの取得を待つ間に切断されていた場合はエラーを送出する。"""
+        self._actives_pool.append((request, synth_process))
+        self._notify_state_changed()
+        # NOTE: プロセスの取得を待つ間に切断された場合、監視による中止の対象から漏れるためここで中止する
+        #       まだジョブを送信していないため、プロセスは終了せずに待機中プールへ戻す
+        if self._is_disconnected(request):
+            self._finalize_con(request, synth_process, synth_process.connection)
+            raise CancellableEngineInternalError("既にリクエストは切断されています")
+
+    async def _activate_process_async(
+        self, request: Request, synth_process: _SynthesisProcess
+    ) -> None:
+        """`_activate_process` の非同期版。"""
+        self._actives_pool.append((request, synth_process))
+        self._notify_state_changed()
+        if self._is_disconnected(request):
+            # NOTE: プロセスを待機中プールへ戻すだけであり、イベントループを止めない
+            self._finalize_con(request, synth_process, synth_process.connection)
+            raise CancellableEngineInternalError("既にリクエストは切断されています")
+
+    async def _discard_con_async(
+        self, request: Request, synth_process: _SynthesisProcess
+    ) -> None:
+        """プロセスを再利用せずに後処理する。プロセスの終了待ちでイベントループを止めないよう、別スレッドで行う。"""
+        await asyncio.to_thread(self._finalize_con, request, synth_process, None)
+
+    def _is_disconnected(self, request: Request) -> bool:
+        """リクエストが切断されたか否かを取得する。"""
+        with self._lock:
+            return request in self._disconnected_requests
+
+    @asynccontextmanager
+    async def watch_disconnection(self, request: Request) -> AsyncIterator[None]:
+        """
+        コンテキスト内でリクエストの切断を監視し、切断された時点でそのリクエストの音声合成を中止する。
+
+        ASGI の receive チャネルからの切断通知を待つため、切断の検知にポーリング間隔分の遅延が生じない。
+        リクエストボディの読み込みを終えた後に用いる。
+        """
+        watcher = asyncio.create_task(self._wait_for_disconnection(request))
+        try:
+            yield
+        finally:
+            watcher.cancel()
+            with self._lock:
+                self._disconnected_requests.discard(request)
+
+    async def _wait_for_disconnection(self, request: Request) -> None:
+        """リクエストの切断通知を待ち、そのリクエストの音声合成を中止する。"""
         while True:
-            await asyncio.sleep(1)
-            for con in self._actives_pool:
-                req, proc = con
-                if await req.is_disconnected():
-                    try:
-                        if proc.is_alive():
-                            proc.terminate()
-                            proc.join()
-                        proc.close()
-                    except ValueError:
-                        pass
-                    finally:
-                        self._finalize_con(req, proc, None)
+            message = await request.receive()
+            if message["type"] == "http.disconnect":
+                break
+        detected_at = time.monotonic()
+        with self._lock:
+            self._disconnected_requests.add(request)
+        # NOTE: プロセスの終了待ちでイベントループを止めないよう、別スレッドで中止する
+        await asyncio.to_thread(self._cancel_request, request, detected_at)
+
+    def _cancel_request(self, request: Request, detected_at: float) -> None:
+        """
+        リクエストの音声合成を行っているプロセスを終了する。
+
+        Parameters
+        ----------
+        request:
+            切断されたリクエスト
+        detected_at:
+            切断を検知した時刻 (`time.monotonic()`)
+        """
+        cancelled = [con for con in list(self._actives_pool) if con[0] is request]
+        for req, synth_process in cancelled:
+            self._finalize_con(req, synth_process, None)
+        if len(cancelled) == 0:
+            return
+        latency = time.monotonic() - detected_at
+        with self._lock:
+            self._n_cancelled += len(cancelled)
+            self._cancel_latency_seconds_total += latency
+            self._last_cancel_latency_seconds = latency
+            self._state_changed.notify_all()
+
+
+async def _wait_readable(connection: ConnectionType) -> None:
+    """コネクションが読み込み可能になるまで、スレッドを占有せずに待つ。"""
+    loop = asyncio.get_running_loop()
+    readable: asyncio.Future[None] = loop.create_future()
+
+    def on_readable() -> None:
+        if not readable.done():
+            readable.set_result(None)
+
+    fd = connection.fileno()
+    try:
+        loop.add_reader(fd, on_readable)
+    except NotImplementedError:
+        # NOTE: Windows の ProactorEventLoop はファイルディスクリプタの監視に対応しないため、スレッドで待つ
+        await asyncio.to_thread(connection.poll, None)
+        return
+    try:
+        await readable
+    finally:
+        loop.remove_reader(fd)
+
+
+def _receive_wav(
+    connection: ConnectionType,
+    shared_memory: SharedMemory | None,
+    wave_info: tuple[tuple[int, ...], bool] | SongInvalidInputError | None,
+    sampling_rate: int,
+) -> bytes | memoryview:
+    """
+    サブプロセスから音声波形を受け取り、WAV 形式のバイト列を返す。
+
+    wave_info が None の場合（バージョンが見つからない場合）は空のバイト列を返す。
+    wave_info が不正な入力を示すエラーの場合はそのエラーを送出する。
+    """
+    if wave_info is None:
+        return b""  # 空のバイト列をエラーとして扱う
+    if isinstance(wave_info, SongInvalidInputError):
+        raise wave_info
+    wave = _receive_wave(connection, shared_memory, wave_info)
+    # NOTE: 共有メモリはプロセスの再利用時に上書きされるため、プールへ戻す前にエンコードする
+    return encode_wav(wave, sampling_rate)
+
+
+def _receive_wave(
+    connection: ConnectionType,
+    shared_memory: SharedMemory | None,
+    wave_info: tuple[tuple[int, ...], bool],
+) -> NDArray[np.float32]:
+    """
+    サブプロセスから音声波形を受け取る。
+
+    共有メモリを介して受け取った音声波形は共有メモリのビューであり、複製されない。
+
+    Parameters
+    ----------
+    connection:
+        サブプロセスとのコネクション
+    shared_memory:
+        サブプロセスの共有メモリ
+    wave_info:
+        音声波形の shape と、音声波形が共有メモリへ書き込まれたか否か
+    """
+    shape, in_shared_memory = wave_info
+    if in_shared_memory:
+        assert shared_memory is not None
+        # NOTE: 切断による中止で共有メモリが閉じられると buf は None となる。
+        #       None のまま ndarray を生成すると未初期化の領域が確保され、不正な音声が返るためエラーとする
+        buf = shared_memory.buf
+        if buf is None:
+            raise CancellableEngineInternalError("既に共有メモリは解放されています")
+        try:
+            return np.ndarray(shape, dtype=_WAVE_DTYPE, buffer=buf)
+        except ValueError as e:
+            # NOTE: buf の取得後に閉じられた場合、解放済みのメモリビューとしてエラーが送出される
+            raise CancellableEngineInternalError(
+                "既に共有メモリは解放されています"
+            ) from e
+    return np.frombuffer(connection.recv_bytes(), dtype=_WAVE_DTYPE).reshape(shape)
+
+
+def _send_wave(
+    connection: ConnectionType,
+    shared_memory: SharedMemory | None,
+    wave: NDArray[Any],
+) -> None:
+    """音声波形を、収まる場合は共有メモリへ書き込み、収まらない場合はコネクションを介してメインプロセスへ送る。"""
+    wave = wave.astype(_WAVE_DTYPE, copy=False)
+    if shared_memory is not None and wave.nbytes <= shared_memory.size:
+        shared_wave = np.ndarray(
+            wave.shape, dtype=_WAVE_DTYPE, buffer=shared_memory.buf
+        )
+        shared_wave[...] = wave
+        del shared_wave
+        connection.send((wave.shape, True))
+    else:
+        connection.send((wave.shape, False))
+        connection.send_bytes(np.ascontiguousarray(wave).data)
 
 
 # NOTE: pickle化の関係でグローバルに書いている
@@ -183,9 +1050,11 @@ def start_synthesis_subprocess(
     cpu_num_threads: int | None,
     enable_mock: bool,
     connection: ConnectionType,
+    shared_memory_name: str | None,
+    preload_styles: list[tuple[str | LatestVersion, StyleId]] | None = None,
 ) -> None:
     """
-    コネクションへの入力に応答して音声合成するループを実行する
+    コネクションから受け取ったジョブ（トーク・歌声・モーフィング）に応答して音声合成するループを実行する
 
     引数 use_gpu, voicelib_dirs, voicevox_dir,
     runtime_dirs, cpu_num_threads, enable_mock は、 core_initializer を参照
@@ -194,7 +1063,15 @@ def start_synthesis_subprocess(
     ----------
     connection:
         メインプロセスと通信するためのコネクション
+    shared_memory_name:
+        メインプロセスへ音声波形を受け渡すための共有メモリの名前
+    preload_styles:
+        起動完了の通知前に初期化するバージョンとスタイル ID の組のリスト
     """
+    shared_memory = None
+    if shared_memory_name is not None:
+        shared_memory = SharedMemory(name=shared_memory_name)
+
     # 音声合成エンジンを用意する
     core_manager = initialize_cores(
         use_gpu=use_gpu,
@@ -206,31 +1083,39 @@ def start_synthesis_subprocess(
     )
     tts_engines = make_tts_engines_from_cores(core_manager)
     assert len(tts_engines.versions()) != 0, "音声合成エンジンがありません。"
+    song_engines = make_song_engines_from_cores(core_manager)
+
+    # 利用頻度の高いスタイルを初期化し、最初の合成で初期化を待たないようにする
+    for version, style_id in preload_styles or []:
+        try:
+            tts_engines.get_tts_engine(version).initialize_synthesis(
+                style_id, skip_reinit=True
+            )
+        except Exception:
+            pass
+
+    # 起動完了を通知する
+    connection.send(True)
 
     while True:
         try:
             # キューの入力を受け取る
-            query, style_id, enable_interrogative_upspeak, version = connection.recv()
+            job: _Job = connection.recv()
 
-            # 音声を合成しファイルへ保存する
+            # 音声を合成する
             try:
-                _engine = tts_engines.get_tts_engine(version)
-            except Exception:
+                wave = job.run(tts_engines, song_engines)
+            except _VERSION_NOT_FOUND_ERRORS:
                 # コネクションを介して「バージョンが見つからないエラー」を送信する
-                connection.send("")  # `""` をエラーして扱う
+                connection.send(None)
+                continue
+            except SongInvalidInputError as e:
+                # 不正な入力によるエラーはプロセスを終了せずにメインプロセスへ送信する
+                connection.send(e)
                 continue
-            wave = _engine.synthesize_wave(
-                query,
-                style_id,
-                enable_interrogative_upspeak=enable_interrogative_upspeak,
-            )
-            with NamedTemporaryFile(delete=False) as f:
-                soundfile.write(
-                    file=f, data=wave, samplerate=query.outputSamplingRate, format="WAV"
-                )
 
-            # コネクションを介してファイル名を送信する
-            connection.send(f.name)
+            # 音声波形を送信する。WAV 形式へのエンコードはメインプロセスで行う
+            _send_wave(connection, shared_memory, wave)
 
         except Exception:
             connection.close()
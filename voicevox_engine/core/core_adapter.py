@@ -2,17 +2,27 @@
 
 import json
 import threading
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 from functools import cached_property
 from itertools import chain
-from typing import Literal, NewType
+from typing import Any, Literal, NewType, TypeVar
 
 import numpy as np
 from numpy.typing import NDArray
 from pydantic import TypeAdapter
 
 from ..metas.metas import StyleId
+from ..metrics import stage_timer
+from .core_scheduler import CoreScheduler, CoreSchedulerStats
 from .core_wrapper import CoreWrapper, OldCoreError
+from .model_residency import (
+    ModelResidencyManager,
+    ModelResidencyStats,
+    merge_residency_stats,
+)
+
+T = TypeVar("T")
 
 CoreStyleId = NewType("CoreStyleId", int)
 CoreStyleType = Literal["talk", "singing_teacher", "frame_decode", "sing"]
@@ -57,17 +67,59 @@ class CoreStyleIdError(Exception):
     pass
 
 
+@dataclass(frozen=True)
+class _CoreInstance:
+    """コアのインスタンスと、それを排他的に利用するためのロック・推論呼び出しのスケジューラー・モデルの常駐管理"""
+
+    core: CoreWrapper
+    mutex: threading.Lock
+    scheduler: CoreScheduler
+    residency: ModelResidencyManager
+
+
 class CoreAdapter:
     """
     コアのアダプター。
 
     ついでにコア内部で推論している処理をプロセスセーフにする。
+    複数のコアのインスタンスを受け取った場合、インスタンスごとにロックを持ち、推論呼び出しを空いているインスタンスへ振り分ける。
     """
 
-    def __init__(self, core: CoreWrapper):
+    def __init__(
+        self,
+        core: CoreWrapper | Sequence[CoreWrapper],
+        batch_window_sec: float = 0.0,
+        max_batch_size: int = 1,
+        model_memory_budget_bytes: int | None = None,
+    ):
         super().__init__()
-        self.core = core
-        self.mutex = threading.Lock()
+        cores = [core] if isinstance(core, CoreWrapper) else list(core)
+        if len(cores) == 0:
+            raise ValueError("コアのインスタンスが 1 つ以上必要です。")
+
+        # NOTE: メタ情報など推論以外の情報は先頭のインスタンスから取得する
+        self.core = cores[0]
+        self._instances: list[_CoreInstance] = []
+        for instance_core in cores:
+            mutex = threading.Lock()
+            scheduler = CoreScheduler(
+                mutex,
+                batch_window_sec=batch_window_sec,
+                max_batch_size=max_batch_size,
+            )
+            residency = ModelResidencyManager(instance_core, model_memory_budget_bytes)
+            self._instances.append(
+                _CoreInstance(instance_core, mutex, scheduler, residency)
+            )
+
+        # インスタンスごとの実行中・実行待ちの推論呼び出し数
+        self._dispatch_lock = threading.Lock()
+        self._n_inflight = [0] * len(self._instances)
+
+    @property
+    def n_instances(self) -> int:
+        """コアのインスタンス数。"""
+        return len(self._instances)
 
     @property
     def default_sampling_rate(self) -> int:
@@ -79,6 +131,12 @@ class CoreAdapter:
         """キャラクター情報"""
         return _core_characters_adapter.validate_json(self.core.metas())
 
+    @cached_property
+    def version(self) -> str:
+        """コアのバージョン"""
+        # NOTE: コアのバージョンは先頭キャラクターのバージョンで代表させる
+        return self.characters[0].version
+
     @property
     def supported_devices(self) -> DeviceSupport | None:
         """デバイスサポート情報（None: 情報無し）"""
@@ -156,41 +214,110 @@ class CoreAdapter:
             True の場合, 既に初期化済みのキャラクターの再初期化をスキップします
         """
         self._assert_style_exists(style_id)
-        try:
-            with self.mutex:
+        for instance in self._instances:
+            with instance.mutex:
                 # 以下の条件のいずれかを満たす場合, 初期化を実行する
                 # 1. 引数 skip_reinit が False の場合
                 # 2. キャラクターが初期化されていない場合
-                if (not skip_reinit) or (not self.core.is_model_loaded(style_id)):
-                    self.core.load_model(style_id)
-        except OldCoreError:
-            pass  # コアが古い場合はどうしようもないので何もしない
+                # コアが古い場合はどうしようもないので何もしない
+                instance.residency.ensure_loaded(style_id, reload=not skip_reinit)
+
+    def pin_style_id_synthesis(self, style_id: StyleId) -> None:
+        """指定したスタイルのモデルを読み込み、常駐させる（追い出しの対象外にする）。"""
+        self._assert_style_exists(style_id)
+        for instance in self._instances:
+            with instance.mutex:
+                instance.residency.pin(style_id)
+
+    def unpin_style_id_synthesis(self, style_id: StyleId) -> None:
+        """指定したスタイルのモデルを追い出しの対象に戻す。"""
+        self._assert_style_exists(style_id)
+        for instance in self._instances:
+            instance.residency.unpin(style_id)
 
     def is_initialized_style_id_synthesis(self, style_id: StyleId) -> bool:
         """指定したスタイルでの音声合成が初期化されているかどうかを返す"""
         self._assert_style_exists(style_id)
         try:
-            return self.core.is_model_loaded(style_id)
+            return all(
+                instance.core.is_model_loaded(style_id) for instance in self._instances
+            )
         except OldCoreError:
             return True  # コアが古い場合はどうしようもないのでTrueを返す
 
+    def scheduler_stats(self) -> list[CoreSchedulerStats]:
+        """インスタンスごとの推論呼び出しスケジューラーの統計情報を取得する。"""
+        return [instance.scheduler.stats() for instance in self._instances]
+
+    def residency_stats(self) -> ModelResidencyStats:
+        """全インスタンスを合わせた音声合成モデルの常駐状況を取得する。"""
+        return merge_residency_stats(
+            [instance.residency.stats() for instance in self._instances]
+        )
+
+    def _acquire_instance(self, style_id: StyleId) -> int:
+        """推論呼び出しの少ないインスタンスを選ぶ。同数であればスタイルのモデルが常駐しているものを優先する。"""
+        with self._dispatch_lock:
+            index = min(
+                range(len(self._instances)),
+                key=lambda i: (
+                    self._n_inflight[i],
+                    not self._instances[i].residency.is_resident(style_id),
+                ),
+            )
+            self._n_inflight[index] += 1
+            return index
+
+    def _release_instance(self, index: int) -> None:
+        """インスタンスでの推論呼び出しの終了を記録する。"""
+        with self._dispatch_lock:
+            self._n_inflight[index] -= 1
+
+    def _run_inference(
+        self,
+        kind: str,
+        style_id: StyleId,
+        fn: Callable[[CoreWrapper], T],
+        inputs: tuple[NDArray[Any], ...],
+    ) -> T:
+        """スタイルのモデルが読み込まれた状態で推論が実行されるよう、推論呼び出しをインスタンスのスケジューラーへ投入する。"""
+        index = self._acquire_instance(style_id)
+        instance = self._instances[index]
+        # NOTE: 取りまとめ担当の別スレッドで実行されうるため、呼び出し元のリクエストの記録先を先に決める
+        #       ロックの待機や取りまとめの待ち時間を含めないよう、推論の実行のみを計測する
+        timer = stage_timer(kind, style_id, self.version)
+
+        def run() -> T:
+            # NOTE: 初期化からロックを再び獲得するまでに、他のスタイルの読み込みによって追い出されうる
+            instance.residency.ensure_loaded(style_id)
+            with timer:
+                return fn(instance.core)
+
+        try:
+            return instance.scheduler.run((kind, style_id), run, inputs)
+        finally:
+            self._release_instance(index)
+
     def safe_yukarin_s_forward(
         self, phoneme_list_s: NDArray[np.int64], style_id: StyleId
     ) -> NDArray[np.float32]:
         """音素列から音素ごとの長さを求める。"""
         # 「指定スタイルを初期化」「mutexによる安全性」「コア仕様に従う無音付加」「系列長・データ型に関するアダプター」を提供する
         self._assert_style_supports_feature(style_id, "talk")
-        self.initialize_style_id_synthesis(style_id, skip_reinit=True)
 
         # 前後無音を付加する（詳細: voicevox_engine#924）
         phoneme_list_s = np.r_[0, phoneme_list_s, 0]
 
-        with self.mutex:
-            phoneme_length = self.core.yukarin_s_forward(
+        phoneme_length = self._run_inference(
+            "yukarin_s",
+            style_id,
+            lambda core: core.yukarin_s_forward(
                 length=len(phoneme_list_s),
                 phoneme_list=phoneme_list_s,
                 style_id=np.array(style_id, dtype=np.int64).reshape(-1),
-            )
+            ),
+            (phoneme_list_s,),
+        )
 
         # 前後無音に相当する領域を破棄する
         phoneme_length = phoneme_length[1:-1]
@@ -210,7 +337,6 @@ class CoreAdapter:
         """モーラごとの音素列とアクセント情報からモーラごとの音高を求める。"""
         # 「指定スタイルを初期化」「mutexによる安全性」「コア仕様に従う無音付加」「系列長・データ型に関するアダプター」を提供する
         self._assert_style_supports_feature(style_id, "talk")
-        self.initialize_style_id_synthesis(style_id, skip_reinit=True)
 
         # 前後無音を付加する（詳細: voicevox_engine#924）
         vowel_phoneme_list = np.r_[0, vowel_phoneme_list, 0]
@@ -220,8 +346,10 @@ class CoreAdapter:
         start_accent_phrase_list = np.r_[0, start_accent_phrase_list, 0]
         end_accent_phrase_list = np.r_[0, end_accent_phrase_list, 0]
 
-        with self.mutex:
-            f0_list: NDArray[np.float32] = self.core.yukarin_sa_forward(
+        f0_list: NDArray[np.float32] = self._run_inference(
+            "yukarin_sa",
+            style_id,
+            lambda core: core.yukarin_sa_forward(
                 length=vowel_phoneme_list.shape[0],
                 vowel_phoneme_list=vowel_phoneme_list[np.newaxis],
                 consonant_phoneme_list=consonant_phoneme_list[np.newaxis],
@@ -230,7 +358,16 @@ class CoreAdapter:
                 start_accent_phrase_list=start_accent_phrase_list[np.newaxis],
                 end_accent_phrase_list=end_accent_phrase_list[np.newaxis],
                 style_id=np.array(style_id, dtype=np.int64).reshape(-1),
-            )[0]
+            )[0],
+            (
+                vowel_phoneme_list,
+                consonant_phoneme_list,
+                start_accent_list,
+                end_accent_list,
+                start_accent_phrase_list,
+                end_accent_phrase_list,
+            ),
+        )
 
         # 前後無音に相当する領域を破棄する
         f0_list = f0_list[1:-1]
@@ -246,15 +383,18 @@ class CoreAdapter:
         """フレームごとの音素・音高とスタイル ID から波形を求める。"""
         # 「指定スタイルを初期化」「mutexによる安全性」「系列長・データ型に関するアダプター」を提供する
         self._assert_style_supports_feature(style_id, "talk")
-        self.initialize_style_id_synthesis(style_id, skip_reinit=True)
-        with self.mutex:
-            wave = self.core.decode_forward(
+        wave = self._run_inference(
+            "decode",
+            style_id,
+            lambda core: core.decode_forward(
                 length=phoneme.shape[0],
                 phoneme_size=phoneme.shape[1],
                 f0=f0[:, np.newaxis],
                 phoneme=phoneme,
                 style_id=np.array(style_id, dtype=np.int64).reshape(-1),
-            )
+            ),
+            (phoneme, f0),
+        )
         sr_wave = self.default_sampling_rate
         return wave, sr_wave
 
@@ -268,16 +408,19 @@ class CoreAdapter:
         """子音列・母音列・ノート長・スタイル ID から音素ごとの長さを求める。"""
         # 「指定スタイルを初期化」「mutexによる安全性」「コア仕様に従う無音付加」「系列長・データ型に関するアダプター」を提供する
         self._assert_style_supports_feature(style_id, "singing_teacher")
-        self.initialize_style_id_synthesis(style_id, skip_reinit=True)
 
-        with self.mutex:
-            consonant_length = self.core.predict_sing_consonant_length_forward(
+        consonant_length = self._run_inference(
+            "predict_sing_consonant_length",
+            style_id,
+            lambda core: core.predict_sing_consonant_length_forward(
                 length=consonant.shape[0],
                 consonant=consonant[np.newaxis],
                 vowel=vowel[np.newaxis],
                 note_duration=note_duration[np.newaxis],
                 style_id=np.array(style_id, dtype=np.int64).reshape(-1),
-            )
+            ),
+            (consonant, vowel, note_duration),
+        )
 
         return consonant_length
 
@@ -290,15 +433,18 @@ class CoreAdapter:
         """フレームごとの音素・ノートとスタイル ID からフレームごとの音高を求める。"""
         # 「指定スタイルを初期化」「mutexによる安全性」「コア仕様に従う無音付加」「系列長・データ型に関するアダプター」を提供する
         self._assert_style_supports_feature(style_id, "singing_teacher")
-        self.initialize_style_id_synthesis(style_id, skip_reinit=True)
 
-        with self.mutex:
-            f0 = self.core.predict_sing_f0_forward(
+        f0 = self._run_inference(
+            "predict_sing_f0",
+            style_id,
+            lambda core: core.predict_sing_f0_forward(
                 length=phoneme.shape[0],
                 phoneme=phoneme[np.newaxis],
                 note=note[np.newaxis],
                 style_id=np.array(style_id, dtype=np.int64).reshape(-1),
-            )
+            ),
+            (phoneme, note),
+        )
 
         return f0
 
@@ -312,16 +458,19 @@ class CoreAdapter:
         """フレームごとの音素・ノート・音高とスタイル ID からフレームごとの音量を求める。"""
         # 「指定スタイルを初期化」「mutexによる安全性」「コア仕様に従う無音付加」「系列長・データ型に関するアダプター」を提供する
         self._assert_style_supports_feature(style_id, "singing_teacher")
-        self.initialize_style_id_synthesis(style_id, skip_reinit=True)
 
-        with self.mutex:
-            volume = self.core.predict_sing_volume_forward(
+        volume = self._run_inference(
+            "predict_sing_volume",
+            style_id,
+            lambda core: core.predict_sing_volume_forward(
                 length=phoneme.shape[0],
                 phoneme=phoneme[np.newaxis],
                 note=note[np.newaxis],
                 f0=f0[np.newaxis],
                 style_id=np.array(style_id, dtype=np.int64).reshape(-1),
-            )
+            ),
+            (phoneme, note, f0),
+        )
 
         return volume
 
@@ -335,14 +484,17 @@ class CoreAdapter:
         """フレームごとの音素・音高・音量とスタイル ID から音声波形を求める。"""
         # 「指定スタイルを初期化」「mutexによる安全性」「系列長・データ型に関するアダプター」を提供する
         self._assert_style_supports_feature(style_id, "frame_decode")
-        self.initialize_style_id_synthesis(style_id, skip_reinit=True)
-        with self.mutex:
-            wave = self.core.sf_decode_forward(
+        wave = self._run_inference(
+            "sf_decode",
+            style_id,
+            lambda core: core.sf_decode_forward(
                 length=phoneme.shape[0],
                 phoneme=phoneme[np.newaxis],
                 f0=f0[np.newaxis],
                 volume=volume[np.newaxis],
                 style_id=np.array(style_id, dtype=np.int64).reshape(-1),
-            )
+            ),
+            (phoneme, f0, volume),
+        )
         sr_wave = self.default_sampling_rate
         return wave, sr_wave
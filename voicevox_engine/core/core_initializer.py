@@ -1,15 +1,25 @@
 """VOICEVOX CORE インスタンスの生成"""
 
-import json
+import hashlib
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
 import psutil
+from pydantic import TypeAdapter, ValidationError
 
 from ..utility.core_version_utility import MOCK_CORE_VERSION, get_latest_version
 from ..utility.path_utility import engine_root, get_save_dir
 from .core_adapter import CoreAdapter
-from .core_wrapper import CoreWrapper, load_runtime_lib
+from .core_wrapper import (
+    CoreWrapper,
+    LazyCoreWrapper,
+    OldCoreError,
+    is_core_version_0_12_or_later,
+    load_runtime_lib,
+)
 
 
 def _determine_default_cpu_num_threads() -> int:
@@ -23,6 +33,126 @@ def _determine_default_cpu_num_threads() -> int:
     return logical_cores // 2
 
 
+# コアのインスタンス数を自動で決める場合の、インスタンスごとの推論スレッド数
+_DEFAULT_POOL_CPU_NUM_THREADS = 2
+
+
+def determine_core_pool_size(
+    core_instances: int, cpu_num_threads: int | None
+) -> tuple[int, int]:
+    """
+    コアのインスタンス数とインスタンスごとの推論スレッド数を、合計が CPU のコア数に収まるよう決める。
+
+    Parameters
+    ----------
+    core_instances:
+        コアのインスタンス数。0 のとき、推論スレッド数から決める
+    cpu_num_threads:
+        インスタンスごとの推論スレッド数。0 か None のとき、インスタンス数から決める
+
+    Returns
+    -------
+    コアのインスタンス数と、インスタンスごとの推論スレッド数の組
+    """
+    if core_instances < 0:
+        raise ValueError("core_instances は 0 以上である必要があります。")
+
+    # NOTE: 論理コアを同時に使っても推論は速くならないため、物理コア数を基準にする
+    n_cpu = psutil.cpu_count(logical=False) or psutil.cpu_count(logical=True) or 1
+
+    if core_instances == 0:
+        if not cpu_num_threads:
+            cpu_num_threads = min(_DEFAULT_POOL_CPU_NUM_THREADS, n_cpu)
+        core_instances = max(n_cpu // cpu_num_threads, 1)
+    elif not cpu_num_threads:
+        cpu_num_threads = max(n_cpu // core_instances, 1)
+
+    if core_instances * cpu_num_threads > n_cpu:
+        msg = (
+            f"The total number of inference threads ({core_instances} instances x "
+            f"{cpu_num_threads} threads) exceeds the number of CPU cores ({n_cpu})."
+        )
+        warnings.warn(msg, stacklevel=1)
+    return core_instances, cpu_num_threads
+
+
+@dataclass(frozen=True)
+class _CoreManifest:
+    """コアを初期化せずに登録するためにキャッシュする、コアの情報"""
+
+    fingerprint: (
+        str  # コアのディレクトリ直下のファイル構成から求めた値。コアの更新を検出する
+    )
+    metas: str  # キャラクターメタ情報
+    supported_devices: str | None  # 対応デバイスの情報。None の場合は情報無し
+
+
+_core_manifests_adapter = TypeAdapter(dict[str, _CoreManifest])
+
+
+def _fingerprint_core_dir(core_dir: Path) -> str:
+    """コアのディレクトリ直下のファイルの名前・大きさ・更新時刻から、コアの更新を検出するための値を求める。"""
+    entries = []
+    for path in sorted(core_dir.iterdir()):
+        if path.is_file():
+            stat = path.stat()
+            entries.append(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hashlib.sha256("\n".join(entries).encode("utf-8")).hexdigest()
+
+
+class _CoreManifestCache:
+    """コアのディレクトリごとの、コアを初期化せずに登録するための情報のキャッシュ"""
+
+    def __init__(self, cache_path: Path) -> None:
+        self._cache_path = cache_path
+        self._lock = threading.Lock()
+        self._updated = False
+        try:
+            self._manifests = _core_manifests_adapter.validate_json(
+                cache_path.read_bytes()
+            )
+        except (OSError, ValidationError):
+            self._manifests = {}
+
+    @staticmethod
+    def _key(core_dir: Path, use_gpu: bool) -> str:
+        """キャッシュのキーを生成する。GPU の利用有無によって読み込まれるコアが異なりうるためキーに含める。"""
+        return f"{core_dir.resolve()}|{'gpu' if use_gpu else 'cpu'}"
+
+    def get(self, core_dir: Path, use_gpu: bool) -> _CoreManifest | None:
+        """キャッシュされたコアの情報を取得する。キャッシュが無いかコアが更新されていれば None を返す。"""
+        with self._lock:
+            manifest = self._manifests.get(self._key(core_dir, use_gpu))
+        if manifest is None or manifest.fingerprint != _fingerprint_core_dir(core_dir):
+            return None
+        return manifest
+
+    def put(self, core_dir: Path, use_gpu: bool, core: CoreWrapper) -> None:
+        """初期化したコアから情報を取得してキャッシュする。"""
+        try:
+            supported_devices: str | None = core.supported_devices()
+        except OldCoreError:
+            supported_devices = None
+        manifest = _CoreManifest(
+            fingerprint=_fingerprint_core_dir(core_dir),
+            metas=core.metas(),
+            supported_devices=supported_devices,
+        )
+        with self._lock:
+            self._manifests[self._key(core_dir, use_gpu)] = manifest
+            self._updated = True
+
+    def save(self) -> None:
+        """更新されたキャッシュをファイルへ書き出す。"""
+        with self._lock:
+            if not self._updated:
+                return
+            self._cache_path.write_bytes(
+                _core_manifests_adapter.dump_json(self._manifests)
+            )
+            self._updated = False
+
+
 class CoreNotFound(Exception):
     """コアが見つからないエラー"""
 
@@ -70,6 +200,11 @@ def initialize_cores(
     cpu_num_threads: int | None = None,
     enable_mock: bool = True,
     load_all_models: bool = False,
+    batch_window_sec: float = 0.0,
+    max_batch_size: int = 1,
+    model_memory_budget_bytes: int | None = None,
+    core_instances: int = 1,
+    lazy_load: bool = False,
 ) -> CoreManager:
     """
     音声ライブラリを読み込んでコアを生成する。
@@ -93,8 +228,25 @@ def initialize_cores(
         コア読み込みに失敗したとき、代わりにmockを使用するかどうか
     load_all_models:
         起動時に全てのモデルを読み込むかどうか
+    batch_window_sec:
+        並行した推論呼び出しをまとめるために待つ最大時間（秒）
+    max_batch_size:
+        1 回のロック獲得でまとめて実行する推論呼び出し数の上限
+    model_memory_budget_bytes:
+        コアのインスタンスごとに音声合成モデルが使うメモリの上限（バイト）
+        Noneのとき、モデルを解放しない
+    core_instances:
+        コアごとに生成するインスタンス数。インスタンスごとにロックを持ち、推論を並列に実行する
+        0のとき、cpu_num_threads と CPU のコア数から決める
+    lazy_load:
+        前回の起動時にキャッシュしたキャラクターメタ情報を用いてコアを登録し、コアの初期化を初回の利用まで遅らせるかどうか
+        キャッシュが無いか、コアが更新されていた場合はコアを初期化してキャッシュする
     """
-    if cpu_num_threads == 0 or cpu_num_threads is None:
+    if core_instances != 1:
+        core_instances, cpu_num_threads = determine_core_pool_size(
+            core_instances, cpu_num_threads
+        )
+    elif cpu_num_threads == 0 or cpu_num_threads is None:
         msg = "cpu_num_threads is set to 0. Setting it to an appropriate value."
         warnings.warn(msg, stacklevel=1)
         cpu_num_threads = _determine_default_cpu_num_threads()
@@ -119,41 +271,53 @@ def initialize_cores(
     voicelib_dirs = [p.expanduser() for p in voicelib_dirs]
 
     if not enable_mock:
+        manifest_cache = (
+            _CoreManifestCache(get_save_dir() / "core_manifest_cache.json")
+            if lazy_load
+            else None
+        )
+
+        def create_core(
+            core_dir: Path, manifest: _CoreManifest | None, private_copy: bool
+        ) -> CoreWrapper:
+            """
+            コアのインスタンスを生成する。キャッシュされた情報があれば初期化を初回の利用まで遅らせる。
 
-        def load_core_library(core_dir: Path, suppress_error: bool = False) -> None:
+            v0.12 より前のコアは初期化でカレントディレクトリを変更するため、起動時に初期化する。
             """
-            指定されたコアを読み込み `core_manager` へ登録する。
+            if manifest is not None and is_core_version_0_12_or_later(core_dir):
+                return LazyCoreWrapper(
+                    use_gpu,
+                    core_dir,
+                    cpu_num_threads,
+                    load_all_models,
+                    private_copy,
+                    metas=manifest.metas,
+                    supported_devices=manifest.supported_devices,
+                )
+            return CoreWrapper(
+                use_gpu, core_dir, cpu_num_threads, load_all_models, private_copy
+            )
+
+        def load_core_library(core_dir: Path) -> tuple[CoreWrapper, str]:
+            """
+            指定されたコアを読み込み、そのバージョンと合わせて返す。
 
             Parameters
             ----------
             core_dir : Path
                 直下にコア（共有ライブラリ）が存在するディレクトリ、あるいはその候補
-            suppress_error: bool
-                エラーを抑制する。`core_dir` がコア候補であることを想定。
             """
-            # 指定されたコアを読み込み登録する
-            try:
-                # コアを読み込む
-                core = CoreWrapper(use_gpu, core_dir, cpu_num_threads, load_all_models)
-                # コアを登録する
-                metas = json.loads(core.metas())
-                core_version: str = metas[0]["version"]
-                if core_manager.has_core(core_version):
-                    msg = "Core loading is skipped because of version duplication."
-                    warnings.warn(msg, stacklevel=1)
-                else:
-                    core_manager.register_core(CoreAdapter(core), core_version)
-            except Exception:
-                # コアでなかった場合のエラーを抑制する
-                if not suppress_error:
-                    raise
-
-        # `voicelib_dirs` 下のコアを読み込み登録する
-        for core_dir in voicelib_dirs:
-            load_core_library(core_dir)
-
-        # ユーザーディレクトリ下のコアを読み込み登録する
-        # コア候補を列挙する
+            manifest = None
+            if manifest_cache is not None:
+                manifest = manifest_cache.get(core_dir, use_gpu)
+            core = create_core(core_dir, manifest, private_copy=False)
+            core_version = CoreAdapter(core).version
+            if manifest_cache is not None and manifest is None:
+                manifest_cache.put(core_dir, use_gpu, core)
+            return core, core_version
+
+        # ユーザーディレクトリ下のコア候補を列挙する
         user_voicelib_dirs = []
         core_libraries_dir = get_save_dir() / "core_libraries"
         core_libraries_dir.mkdir(exist_ok=True)
@@ -162,16 +326,78 @@ def initialize_cores(
             if not path.is_dir():
                 continue
             user_voicelib_dirs.append(path)
-        # コア候補を読み込み登録する。候補がコアで無かった場合のエラーを抑制する。
-        for core_dir in user_voicelib_dirs:
-            load_core_library(core_dir, suppress_error=True)
+
+        # `voicelib_dirs` 下のコアとユーザーディレクトリ下のコア候補を並列に読み込む
+        # 候補がコアで無かった場合のエラーは抑制する
+        # NOTE: v0.12 より前のコアの初期化は並行してカレントディレクトリを変更するため、相対パスを先に解決する
+        candidates = [(core_dir.resolve(), False) for core_dir in voicelib_dirs]
+        candidates += [(core_dir.resolve(), True) for core_dir in user_voicelib_dirs]
+        with ThreadPoolExecutor() as executor:
+            futures = [
+                (core_dir, suppress_error, executor.submit(load_core_library, core_dir))
+                for core_dir, suppress_error in candidates
+            ]
+
+            # 読み込んだコアを、並列化する前と同じ順に重複を除いて採用する
+            loaded: list[tuple[Path, CoreWrapper, str]] = []
+            for core_dir, suppress_error, future in futures:
+                try:
+                    core, core_version = future.result()
+                except Exception:
+                    if not suppress_error:
+                        raise
+                    continue
+                if core_version in (version for _, _, version in loaded):
+                    msg = "Core loading is skipped because of version duplication."
+                    warnings.warn(msg, stacklevel=1)
+                    continue
+                loaded.append((core_dir, core, core_version))
+
+            # 2 つ目以降のインスタンスはコアの複製を読み込み、内部状態を共有しないようにする
+            extra_futures = [
+                [
+                    executor.submit(
+                        create_core,
+                        core_dir,
+                        manifest_cache.get(core_dir, use_gpu)
+                        if manifest_cache is not None
+                        else None,
+                        True,
+                    )
+                    for _ in range(core_instances - 1)
+                ]
+                for core_dir, _, _ in loaded
+            ]
+
+            # コアを登録する
+            # 複製の読み込みに失敗した場合は、読み込めたインスタンスのみでコアを利用する
+            for (_, core, core_version), extras in zip(
+                loaded, extra_futures, strict=True
+            ):
+                cores = [core]
+                for extra in extras:
+                    try:
+                        cores.append(extra.result())
+                    except Exception as e:
+                        msg = f"コア {core_version} の追加のインスタンスを読み込めませんでした：{e}"
+                        warnings.warn(msg, stacklevel=1)
+                core_adapter = CoreAdapter(
+                    cores, batch_window_sec, max_batch_size, model_memory_budget_bytes
+                )
+                core_manager.register_core(core_adapter, core_version)
+
+        if manifest_cache is not None:
+            manifest_cache.save()
 
     else:
         # モック追加
         from ..dev.core.mock import MockCoreWrapper
 
         if not core_manager.has_core(MOCK_CORE_VERSION):
-            core = MockCoreWrapper()
-            core_manager.register_core(CoreAdapter(core), MOCK_CORE_VERSION)
+            cores = [MockCoreWrapper() for _ in range(core_instances)]
+            core_adapter = CoreAdapter(
+                cores, batch_window_sec, max_batch_size, model_memory_budget_bytes
+            )
+            core_manager.register_core(core_adapter, MOCK_CORE_VERSION)
 
     return core_manager
@@ -0,0 +1,197 @@
+"""コアによる推論呼び出しのスケジューラー"""
+
+import copy
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from numpy.typing import NDArray
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class CoreSchedulerStats:
+    """推論呼び出しスケジューラーの統計情報"""
+
+    # 推論呼び出しの投入時に待機していた呼び出し数（自身を含む）と、その観測回数の対応表
+    queue_depth_histogram: dict[int, int]
+    # 1 回のロック獲得でまとめて実行された呼び出し数と、その観測回数の対応表
+    batch_size_histogram: dict[int, int]
+    # 同一入力の呼び出しと統合されたため推論を省略できた呼び出し数
+    deduplicated_calls: int
+
+
+@dataclass
+class _Job:
+    """スケジューラーに投入された推論呼び出し"""
+
+    fn: Callable[[], Any]
+    dedup_key: Hashable | None
+    future: "Future[Any]" = field(default_factory=Future)
+    promoted: bool = False  # 次のバッチを取りまとめる担当に昇格したか否か
+
+
+def _make_dedup_key(inputs: tuple[NDArray[Any], ...]) -> Hashable:
+    """入力配列群から、内容が等しい呼び出しを判定するためのキーを生成する。"""
+    return tuple((x.dtype.str, x.shape, x.tobytes()) for x in inputs)
+
+
+class CoreScheduler:
+    """
+    コアによる推論呼び出しのスケジューラー。
+
+    同じ種類・スタイルに対する並行した推論呼び出しを短い時間窓の間まとめ、1 回のロック獲得で連続して実行する。
+    入力が完全に一致する呼び出しは 1 回だけ推論し、結果を複製して各呼び出し元へ返す。
+    """
+
+    def __init__(
+        self,
+        mutex: threading.Lock,
+        batch_window_sec: float = 0.0,
+        max_batch_size: int = 1,
+    ) -> None:
+        """
+        スケジューラーを生成する。
+
+        Parameters
+        ----------
+        mutex : threading.Lock
+            コアを排他的に利用するためのロック
+        batch_window_sec : float
+            呼び出しをまとめるために待つ最大時間（秒）
+        max_batch_size : int
+            1 回のロック獲得でまとめて実行する呼び出し数の上限
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size は 1 以上である必要があります。")
+        if batch_window_sec < 0:
+            raise ValueError("batch_window_sec は 0 以上である必要があります。")
+
+        self._mutex = mutex
+        self._batch_window_sec = batch_window_sec
+        self._max_batch_size = max_batch_size
+
+        self._cond = threading.Condition()
+        self._queues: dict[Hashable, list[_Job]] = {}
+        self._leading_groups: set[Hashable] = set()
+        self._n_pending = 0
+
+        self._queue_depth_histogram: Counter[int] = Counter()
+        self._batch_size_histogram: Counter[int] = Counter()
+        self._deduplicated_calls = 0
+
+    def run(
+        self,
+        group: Hashable,
+        fn: Callable[[], T],
+        inputs: tuple[NDArray[Any], ...] = (),
+    ) -> T:
+        """
+        推論呼び出しを投入し、その結果を待って返す。
+
+        Parameters
+        ----------
+        group : Hashable
+            まとめて実行できる呼び出しの単位（推論の種類とスタイル ID の組など）
+        fn : Callable[[], T]
+            推論を実行する関数。ロックを獲得した状態で呼ばれる
+        inputs : tuple[NDArray[Any], ...]
+            推論の入力配列群。内容が一致する呼び出しの統合に用いられる
+        """
+        dedup_key = _make_dedup_key(inputs) if self._max_batch_size > 1 else None
+        job = _Job(fn=fn, dedup_key=dedup_key)
+
+        with self._cond:
+            self._queues.setdefault(group, []).append(job)
+            self._n_pending += 1
+            self._queue_depth_histogram[self._n_pending] += 1
+            if group in self._leading_groups:
+                # 取りまとめ担当が待機中であれば、バッチが埋まったか確認させる
+                self._cond.notify_all()
+                while not job.future.done() and not job.promoted:
+                    self._cond.wait()
+                is_leader = job.promoted
+            else:
+                self._leading_groups.add(group)
+                is_leader = True
+
+        if is_leader:
+            self._lead(group)
+
+        result: T = job.future.result()
+        return result
+
+    def _lead(self, group: Hashable) -> None:
+        """取りまとめ担当として呼び出しを集めて実行する。"""
+        deadline = time.monotonic() + self._batch_window_sec
+        with self._cond:
+            queue = self._queues[group]
+            while len(queue) < self._max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch = queue[: self._max_batch_size]
+            del queue[: self._max_batch_size]
+            self._n_pending -= len(batch)
+            self._batch_size_histogram[len(batch)] += 1
+
+            # 残りの呼び出しは次の取りまとめ担当が集める
+            if len(queue) > 0:
+                queue[0].promoted = True
+                self._cond.notify_all()
+            else:
+                del self._queues[group]
+                self._leading_groups.discard(group)
+
+        self._execute(batch)
+
+        with self._cond:
+            self._cond.notify_all()
+
+    def _execute(self, batch: list[_Job]) -> None:
+        """1 回のロック獲得でバッチ内の呼び出しを連続して実行する。"""
+        # 入力が一致する呼び出しを統合する
+        job_groups: list[list[_Job]] = []
+        dedup_key_to_jobs: dict[Hashable, list[_Job]] = {}
+        for job in batch:
+            if job.dedup_key is None:
+                job_groups.append([job])
+            elif job.dedup_key in dedup_key_to_jobs:
+                dedup_key_to_jobs[job.dedup_key].append(job)
+            else:
+                dedup_key_to_jobs[job.dedup_key] = [job]
+                job_groups.append(dedup_key_to_jobs[job.dedup_key])
+
+        with self._mutex:
+            for jobs in job_groups:
+                try:
+                    result = jobs[0].fn()
+                except Exception as e:
+                    for job in jobs:
+                        job.future.set_exception(e)
+                    continue
+                # NOTE: 呼び出し元で結果が書き換えられても互いに影響しないよう複製する
+                for job in jobs[1:]:
+                    job.future.set_result(copy.deepcopy(result))
+                jobs[0].future.set_result(result)
+
+        n_deduplicated = len(batch) - len(job_groups)
+        if n_deduplicated > 0:
+            with self._cond:
+                self._deduplicated_calls += n_deduplicated
+
+    def stats(self) -> CoreSchedulerStats:
+        """スケジューラーの統計情報を取得する。"""
+        with self._cond:
+            return CoreSchedulerStats(
+                queue_depth_histogram=dict(self._queue_depth_histogram),
+                batch_size_histogram=dict(self._batch_size_histogram),
+                deduplicated_calls=self._deduplicated_calls,
+            )
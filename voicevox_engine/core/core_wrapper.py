@@ -1,7 +1,11 @@
 """VOICEVOX CORE の Python ラッパー"""
 
+import atexit
 import os
 import platform
+import shutil
+import tempfile
+import threading
 from ctypes import (
     CDLL,
     POINTER,
@@ -16,7 +20,7 @@ from ctypes.util import find_library
 from dataclasses import dataclass
 from enum import Enum, auto
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
 import numpy as np
 from numpy.typing import NDArray
@@ -358,7 +362,7 @@ def _check_core_type(core_dir: Path) -> Literal["libtorch", "onnxruntime"] | Non
         return None
 
 
-def load_core(core_dir: Path, use_gpu: bool) -> CDLL:
+def load_core(core_dir: Path, use_gpu: bool, private_copy: bool = False) -> CDLL:
     """
     `core_dir` 直下に存在し実行中マシンでサポートされるコアDLLを読み込む。
 
@@ -366,6 +370,8 @@ def load_core(core_dir: Path, use_gpu: bool) -> CDLL:
     ----------
     core_dir:
         直下にコア（共有ライブラリ）が存在するディレクトリ
+    private_copy:
+        コアDLLの複製を読み込み、既に読み込まれたコアと内部状態を共有しないインスタンスにするか否か
 
     Returns
     -------
@@ -373,28 +379,80 @@ def load_core(core_dir: Path, use_gpu: bool) -> CDLL:
     """
     core_name = _find_version_0_12_core_or_later(core_dir)
     if core_name:
-        return _load_core_version_0_12_or_later(core_dir / core_name)
+        return _load_core_version_0_12_or_later(core_dir / core_name, private_copy)
     else:
-        return _load_core_version_earlier_than_0_12(core_dir, use_gpu=use_gpu)
+        return _load_core_version_earlier_than_0_12(
+            core_dir, use_gpu=use_gpu, private_copy=private_copy
+        )
+
+
+def _copy_core_dll(core_path: Path) -> Path:
+    """
+    コア共有ライブラリの複製を一時ディレクトリへ作成する。
+
+    同じパスの共有ライブラリはプロセス内で 1 度しか読み込まれず内部状態を共有するため、独立したインスタンスには複製を読み込む。
+    コアが自身の位置を基準に参照するモデル等を解決できるよう、同じディレクトリの他の項目も配置する。
+    """
+    core_path = core_path.resolve(strict=True)
+    copy_dir = Path(tempfile.mkdtemp(prefix="voicevox_core_"))
+    atexit.register(shutil.rmtree, copy_dir, ignore_errors=True)
+    for entry in core_path.parent.iterdir():
+        if entry.name != core_path.name:
+            _place_core_entry(entry.resolve(), copy_dir / entry.name)
+    copy_path = copy_dir / core_path.name
+    shutil.copy2(core_path, copy_path)
+    return copy_path
+
+
+def _place_core_entry(src: Path, dst: Path) -> None:
+    """
+    コアと同じディレクトリの項目を複製先へ配置する。
+
+    シンボリックリンクを優先し、作成できない場合はハードリンクを、それも作成できない場合は複製を配置する。
+    NOTE: Windows でシンボリックリンクを作成するには管理者権限か開発者モードが必要である。
+    """
+    try:
+        dst.symlink_to(src, target_is_directory=src.is_dir())
+        return
+    except OSError:
+        pass
+    if src.is_dir():
+        shutil.copytree(src, dst, copy_function=_link_or_copy_file)
+    else:
+        _link_or_copy_file(src, dst)
 
 
-def _load_core_dll(core_path: Path) -> CDLL:
+def _link_or_copy_file(src: str | Path, dst: str | Path) -> None:
+    """ファイルのハードリンクを作成する。作成できない場合はファイルを複製する。"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _load_core_dll(core_path: Path, private_copy: bool = False) -> CDLL:
     """コア共有ライブラリを読み込む。"""
+    if private_copy:
+        core_path = _copy_core_dll(core_path)
     # NOTE: CDLL クラスのコンストラクタの引数 name には文字列を渡す必要がある。
     #       Windows 環境では PathLike オブジェクトを引数として渡すと初期化に失敗する。
     return CDLL(str(core_path.resolve(strict=True)))
 
 
-def _load_core_version_0_12_or_later(core_path: Path) -> CDLL:
+def _load_core_version_0_12_or_later(
+    core_path: Path, private_copy: bool = False
+) -> CDLL:
     """v0.12以降のコア共有ライブラリを読み込む。"""
     try:
-        return _load_core_dll(core_path)
+        return _load_core_dll(core_path, private_copy)
     except OSError as e:
         msg = f"利用可能なコアがありましたが、読み込みに失敗しました：{e}"
         raise RuntimeError(msg) from e
 
 
-def _load_core_version_earlier_than_0_12(core_dir: Path, use_gpu: bool) -> CDLL:
+def _load_core_version_earlier_than_0_12(
+    core_dir: Path, use_gpu: bool, private_copy: bool = False
+) -> CDLL:
     """v0.12以前のコア共有ライブラリを読み込む。"""
     model_type = _check_core_type(core_dir)
     if model_type is None:
@@ -409,7 +467,7 @@ def _load_core_version_earlier_than_0_12(core_dir: Path, use_gpu: bool) -> CDLL:
             core_name = _get_suitable_core_name(model_type, gpu_type)
             if core_name:
                 try:
-                    return _load_core_dll(core_dir / core_name)
+                    return _load_core_dll(core_dir / core_name, private_copy)
                 except OSError as e:
                     latest_e = e
 
@@ -418,7 +476,7 @@ def _load_core_version_earlier_than_0_12(core_dir: Path, use_gpu: bool) -> CDLL:
     core_name = _get_suitable_core_name(model_type, gpu_type=GPUType.NONE)
     if core_name:
         try:
-            return _load_core_dll(core_dir / core_name)
+            return _load_core_dll(core_dir / core_name, private_copy)
         except OSError as e:
             latest_e = e
 
@@ -428,7 +486,7 @@ def _load_core_version_earlier_than_0_12(core_dir: Path, use_gpu: bool) -> CDLL:
         core_name = _get_suitable_core_name(model_type, gpu_type=GPUType.CUDA)
         if core_name:
             try:
-                return _load_core_dll(core_dir / core_name)
+                return _load_core_dll(core_dir / core_name, private_copy)
             except OSError as e:
                 latest_e = e
 
@@ -552,6 +610,10 @@ _CORE_API_TYPES = {
         argtypes=(c_long,),
         restype=c_bool,
     ),
+    "unload_model": _CoreApiType(
+        argtypes=(c_long,),
+        restype=c_bool,
+    ),
     "supported_devices": _CoreApiType(
         argtypes=(),
         restype=c_char_p,
@@ -594,6 +656,15 @@ def _check_and_type_apis(core_cdll: CDLL) -> dict[str, bool]:
     return api_exists
 
 
+# コアの初期化でカレントディレクトリを変更する間、他の初期化を待たせるためのロック
+_chdir_lock = threading.Lock()
+
+
+def is_core_version_0_12_or_later(core_dir: Path) -> bool:
+    """`core_dir` 直下のコアが v0.12 以降のコアか否か。"""
+    return _find_version_0_12_core_or_later(core_dir) is not None
+
+
 class CoreWrapper:
     """VOICEVOX CORE の Python ラッパー。"""
 
@@ -603,11 +674,19 @@ class CoreWrapper:
         core_dir: Path,
         cpu_num_threads: int = 0,
         load_all_models: bool = False,
+        private_copy: bool = False,
+        *,
+        chdir: bool = True,
     ) -> None:
-        """コアを利用可能にする。"""
+        """
+        コアを利用可能にする。`private_copy` が True の場合、他のインスタンスと内部状態を共有しない。
+
+        `chdir` が True の場合、初期化の間カレントディレクトリをコアのディレクトリへ変更する。
+        v0.12 より前のコアはカレントディレクトリを基準にモデル等を探すため、常に変更する。
+        """
         self.default_sampling_rate = 24000
 
-        self.core = load_core(core_dir, use_gpu)
+        self.core = load_core(core_dir, use_gpu, private_copy)
 
         self.api_exists = _check_and_type_apis(self.core)
 
@@ -626,21 +705,45 @@ class CoreWrapper:
         if model_type == "onnxruntime":
             exist_cpu_num_threads = True
 
-        cwd = os.getcwd()
-        os.chdir(core_dir)
-        try:
-            if is_version_0_12_core_or_later:
-                self.assert_core_success(
-                    self.core.initialize(use_gpu, cpu_num_threads, load_all_models)
-                )
-            elif exist_cpu_num_threads:
-                self.assert_core_success(
-                    self.core.initialize(".", use_gpu, cpu_num_threads)
+        # NOTE: 再初期化のために初期化時の設定を保持する
+        self._use_gpu = use_gpu
+        self._core_dir = core_dir
+        self._cpu_num_threads = cpu_num_threads
+        self._is_version_0_12_core_or_later = is_version_0_12_core_or_later
+        self._exist_cpu_num_threads = exist_cpu_num_threads
+
+        self._initialize(load_all_models, chdir)
+
+    def _initialize(self, load_all_models: bool, chdir: bool) -> None:
+        """保持した設定でコアを初期化する。"""
+        if self._is_version_0_12_core_or_later and not chdir:
+            # NOTE: v0.12 以降のコアはモデル等をコア自身の位置を基準に探すため、カレントディレクトリに依存しない
+            self.assert_core_success(
+                self.core.initialize(
+                    self._use_gpu, self._cpu_num_threads, load_all_models
                 )
-            else:
-                self.assert_core_success(self.core.initialize(".", use_gpu))
-        finally:
-            os.chdir(cwd)
+            )
+            return
+
+        # NOTE: カレントディレクトリはプロセス全体で共有されるため、並行した初期化の間で変更を排他する
+        with _chdir_lock:
+            cwd = os.getcwd()
+            os.chdir(self._core_dir)
+            try:
+                if self._is_version_0_12_core_or_later:
+                    self.assert_core_success(
+                        self.core.initialize(
+                            self._use_gpu, self._cpu_num_threads, load_all_models
+                        )
+                    )
+                elif self._exist_cpu_num_threads:
+                    self.assert_core_success(
+                        self.core.initialize(".", self._use_gpu, self._cpu_num_threads)
+                    )
+                else:
+                    self.assert_core_success(self.core.initialize(".", self._use_gpu))
+            finally:
+                os.chdir(cwd)
 
     def metas(self) -> str:
         """キャラクターメタ情報を文字列として取得する。"""
@@ -969,10 +1072,26 @@ class CoreWrapper:
             return
         raise OldCoreError
 
+    def reinitialize(self) -> None:
+        """コアをファイナライズして初期化し直し、読み込まれた全てのモデルを解放する。"""
+        self.finalize()
+        # NOTE: リクエストを処理するスレッドから呼ばれるため、可能ならカレントディレクトリを変更しない
+        self._initialize(
+            load_all_models=False, chdir=not self._is_version_0_12_core_or_later
+        )
+
     def load_model(self, style_id: int) -> None:
         """コアにモデルを読み込む。"""
         if self.api_exists["load_model"]:
             self.assert_core_success(self.core.load_model(c_long(style_id)))
+            return
+        raise OldCoreError
+
+    def unload_model(self, style_id: int) -> None:
+        """コアから指定されたスタイルのモデルを解放する。"""
+        if self.api_exists["unload_model"]:
+            self.assert_core_success(self.core.unload_model(c_long(style_id)))
+            return
         raise OldCoreError
 
     def is_model_loaded(self, style_id: int) -> bool:
@@ -988,3 +1107,127 @@ class CoreWrapper:
             raise CoreError(
                 self.core.last_error_message().decode("utf-8", "backslashreplace")
             )
+
+
+class LazyCoreWrapper(CoreWrapper):
+    """
+    初めて必要になるまでコアの読み込みと初期化を遅らせる `CoreWrapper`。v0.12 以降のコアのみに用いる。
+
+    キャラクターメタ情報と対応デバイスの情報には事前に取得した値を返すため、これらの取得ではコアを読み込まない。
+    """
+
+    def __init__(
+        self,
+        use_gpu: bool,
+        core_dir: Path,
+        cpu_num_threads: int = 0,
+        load_all_models: bool = False,
+        private_copy: bool = False,
+        *,
+        metas: str,
+        supported_devices: str | None,
+    ) -> None:
+        """コアの読み込みに用いる設定と、事前に取得したコアの情報を保持する。"""
+        self.default_sampling_rate = 24000
+
+        self._use_gpu = use_gpu
+        self._core_dir = core_dir
+        self._cpu_num_threads = cpu_num_threads
+        self._load_all_models = load_all_models
+        self._private_copy = private_copy
+        self._metas = metas
+        self._supported_devices = supported_devices
+
+        self._lock = threading.Lock()
+        self._wrapper: CoreWrapper | None = None
+
+    @property
+    def is_loaded(self) -> bool:
+        """コアが読み込まれたか否か。"""
+        return self._wrapper is not None
+
+    def _loaded(self) -> CoreWrapper:
+        """コアが読み込まれていなければ読み込んで初期化し、それを返す。"""
+        with self._lock:
+            if self._wrapper is None:
+                # NOTE: 初めての利用はリクエストを処理するスレッドで起きるため、カレントディレクトリを変更しない
+                self._wrapper = CoreWrapper(
+                    self._use_gpu,
+                    self._core_dir,
+                    self._cpu_num_threads,
+                    self._load_all_models,
+                    self._private_copy,
+                    chdir=False,
+                )
+            return self._wrapper
+
+    def metas(self) -> str:
+        """事前に取得したキャラクターメタ情報を文字列として取得する。"""
+        return self._metas
+
+    def supported_devices(self) -> str:
+        """事前に取得した、コアが対応するデバイスの情報をJSON文字列として取得する。"""
+        if self._supported_devices is None:
+            raise OldCoreError
+        return self._supported_devices
+
+    def yukarin_s_forward(self, *args: Any, **kwargs: Any) -> NDArray[np.float32]:
+        """コアを読み込んで音素ごとの長さを求める。"""
+        return self._loaded().yukarin_s_forward(*args, **kwargs)
+
+    def yukarin_sa_forward(self, *args: Any, **kwargs: Any) -> NDArray[np.float32]:
+        """コアを読み込んでモーラごとの音高を求める。"""
+        return self._loaded().yukarin_sa_forward(*args, **kwargs)
+
+    def decode_forward(self, *args: Any, **kwargs: Any) -> NDArray[np.float32]:
+        """コアを読み込んでフレームごとの音素と音高から波形を求める。"""
+        return self._loaded().decode_forward(*args, **kwargs)
+
+    def predict_sing_consonant_length_forward(
+        self, *args: Any, **kwargs: Any
+    ) -> NDArray[np.int64]:
+        """コアを読み込んで子音・母音列とノート長から子音長を求める。"""
+        return self._loaded().predict_sing_consonant_length_forward(*args, **kwargs)
+
+    def predict_sing_f0_forward(self, *args: Any, **kwargs: Any) -> NDArray[np.float32]:
+        """コアを読み込んでフレームごとの音素列とノート列から音高列を求める。"""
+        return self._loaded().predict_sing_f0_forward(*args, **kwargs)
+
+    def predict_sing_volume_forward(
+        self, *args: Any, **kwargs: Any
+    ) -> NDArray[np.float32]:
+        """コアを読み込んでフレームごとの音素列とノート列と音高列から音量列を求める。"""
+        return self._loaded().predict_sing_volume_forward(*args, **kwargs)
+
+    def sf_decode_forward(self, *args: Any, **kwargs: Any) -> NDArray[np.float32]:
+        """コアを読み込んでフレームごとの音素と音高と音量から波形を求める。"""
+        return self._loaded().sf_decode_forward(*args, **kwargs)
+
+    def finalize(self) -> None:
+        """コアが読み込まれていればファイナライズする。"""
+        if self._wrapper is not None:
+            self._wrapper.finalize()
+
+    def reinitialize(self) -> None:
+        """コアが読み込まれていれば初期化し直し、読み込まれた全てのモデルを解放する。"""
+        if self._wrapper is not None:
+            self._wrapper.reinitialize()
+
+    def load_model(self, style_id: int) -> None:
+        """コアを読み込み、コアにモデルを読み込む。"""
+        self._loaded().load_model(style_id)
+
+    def unload_model(self, style_id: int) -> None:
+        """コアが読み込まれていれば、指定されたスタイルのモデルを解放する。"""
+        if self._wrapper is not None:
+            self._wrapper.unload_model(style_id)
+
+    def is_model_loaded(self, style_id: int) -> bool:
+        """コアに指定されたモデルが読み込まれているか確認する。コアが読み込まれていなければ False を返す。"""
+        if self._wrapper is None:
+            return False
+        return self._wrapper.is_model_loaded(style_id)
+
+    def assert_core_success(self, result: bool) -> None:
+        """コアの失敗を表すコードが現れた場合に Python 例外へ変換する。"""
+        self._loaded().assert_core_success(result)
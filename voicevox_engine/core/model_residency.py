@@ -0,0 +1,316 @@
+"""コアに読み込まれた音声合成モデルの常駐管理"""
+
+import statistics
+import threading
+import time
+import warnings
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Final
+
+import psutil
+
+from ..metas.metas import StyleId
+from .core_wrapper import CoreWrapper, OldCoreError
+
+# コアの再初期化によるモデルの一括解放の最短間隔（秒）のデフォルト値
+_DEFAULT_MIN_RECYCLE_INTERVAL_SEC: Final = 300.0
+
+# モデルの大きさの概算に用いる、直近の読み込みでのメモリ使用量の増加の記録数
+_N_LOAD_SAMPLES: Final = 32
+
+
+@dataclass(frozen=True)
+class ResidentStyleStats:
+    """常駐しているスタイルの情報"""
+
+    style_id: StyleId
+    # モデルが使うメモリの概算（バイト）。他のスタイルとモデルを共有する場合は 0
+    approx_bytes: int
+    idle_seconds: float  # 最後に利用されてからの経過時間（秒）
+    pinned: bool  # 追い出しの対象外か否か
+
+
+@dataclass(frozen=True)
+class ModelResidencyStats:
+    """音声合成モデルの常駐状況"""
+
+    # モデルが使うメモリの上限（バイト）。None の場合は無制限
+    memory_budget_bytes: int | None
+    resident_bytes: int  # 常駐しているモデルが使うメモリの概算（バイト）
+    evictions: int  # モデルを個別に解放した回数
+    recycles: int  # モデルを解放するためにコアを再初期化した回数
+    styles: list[ResidentStyleStats]
+
+
+@dataclass
+class _ResidentStyle:
+    """常駐しているスタイルの記録"""
+
+    owns_model: bool  # このスタイルの読み込みによってモデルが読み込まれたか否か
+    last_used: float  # 最後に利用された時刻 (`time.monotonic()`)
+
+
+def _process_memory_usage() -> int:
+    """このプロセスの物理メモリ使用量（バイト）を取得する。"""
+    return int(psutil.Process().memory_info().rss)
+
+
+class ModelResidencyManager:
+    """
+    コアに読み込まれた音声合成モデルの常駐管理。
+
+    読み込まれたスタイルごとに、モデルを読み込んだか否かと最終利用時刻を記録する。
+    モデルの大きさは、読み込み前後のメモリ使用量の差の中央値で概算する。
+    差は他のスレッドのメモリ確保の影響を受けるため、中央値によって外れ値を除く。
+    上限が設定されている場合、上限を超えないよう最も長く利用されていないスタイルから追い出す。
+    コアがモデルの個別の解放に対応していなければ、コアを再初期化して固定されたスタイル以外のモデルをまとめて解放する。
+    再初期化は全てのモデルを読み込み直させるため、min_recycle_interval_sec 秒に 1 回までとし、それまでは上限の超過を許容する。
+    コアを操作するメソッドは、コアを排他的に利用するためのロックを獲得した状態で呼ぶ。
+    """
+
+    def __init__(
+        self,
+        core: CoreWrapper,
+        memory_budget_bytes: int | None = None,
+        memory_usage: Callable[[], int] = _process_memory_usage,
+        min_recycle_interval_sec: float = _DEFAULT_MIN_RECYCLE_INTERVAL_SEC,
+    ) -> None:
+        """
+        常駐管理を生成する。
+
+        Parameters
+        ----------
+        core : CoreWrapper
+            管理対象のコア
+        memory_budget_bytes : int | None
+            モデルが使うメモリの上限（バイト）。None の場合は追い出さない
+        memory_usage : Callable[[], int]
+            モデルの大きさの概算に用いる、メモリ使用量（バイト）を取得する関数
+        min_recycle_interval_sec : float
+            コアの再初期化によるモデルの一括解放の最短間隔（秒）
+        """
+        if memory_budget_bytes is not None and memory_budget_bytes < 0:
+            raise ValueError("memory_budget_bytes は 0 以上である必要があります。")
+
+        self._core = core
+        self._memory_budget_bytes = memory_budget_bytes
+        self._memory_usage = memory_usage
+        self._min_recycle_interval_sec = min_recycle_interval_sec
+
+        # NOTE: 記録の読み書きを保護する。コアの操作は呼び出し元のロックで保護される
+        self._lock = threading.Lock()
+        self._styles: dict[StyleId, _ResidentStyle] = {}
+        self._pinned: set[StyleId] = set()
+        self._load_samples: deque[int] = deque(maxlen=_N_LOAD_SAMPLES)
+        self._evictions = 0
+        self._recycles = 0
+        self._last_recycle: float | None = None  # 直近に再初期化した時刻
+
+    def ensure_loaded(self, style_id: StyleId, reload: bool = False) -> None:
+        """
+        スタイルのモデルを読み込み、利用されたことを記録する。
+
+        コアが古くモデルの読み込み状態を扱えない場合は何もしない。
+
+        Parameters
+        ----------
+        style_id : StyleId
+            スタイルID
+        reload : bool
+            True の場合、既に読み込まれていても読み込み直す
+        """
+        try:
+            loaded = self._core.is_model_loaded(style_id)
+        except OldCoreError:
+            return
+
+        if loaded and not reload:
+            now = time.monotonic()
+            with self._lock:
+                resident = self._styles.get(style_id)
+                if resident is None:
+                    # NOTE: 同じモデルを共有する他のスタイルや起動時の一括読み込みによって読み込まれている
+                    self._styles[style_id] = _ResidentStyle(False, now)
+                else:
+                    resident.last_used = now
+            return
+
+        # 読み込むモデルの大きさを見積もり、上限に収まるよう事前に追い出す
+        self._evict(self._estimate_model_bytes(), exclude=style_id, allow_recycle=True)
+        self._load(style_id)
+        # 見積もりを超えて上限を超過した場合は、個別に解放できる範囲で追い出す
+        self._evict(0, exclude=style_id, allow_recycle=False)
+
+    def pin(self, style_id: StyleId) -> None:
+        """スタイルを追い出しの対象外とし、モデルを読み込む。"""
+        with self._lock:
+            self._pinned.add(style_id)
+        self.ensure_loaded(style_id)
+
+    def unpin(self, style_id: StyleId) -> None:
+        """スタイルを追い出しの対象に戻す。"""
+        with self._lock:
+            self._pinned.discard(style_id)
+
+    def is_resident(self, style_id: StyleId) -> bool:
+        """スタイルのモデルが常駐していると記録されているか否かを返す。"""
+        with self._lock:
+            return style_id in self._styles
+
+    def _load(self, style_id: StyleId) -> None:
+        """スタイルのモデルを読み込み、その大きさを記録する。"""
+        before = self._memory_usage()
+        try:
+            self._core.load_model(style_id)
+        except OldCoreError:
+            return
+        loaded_bytes = self._memory_usage() - before
+        with self._lock:
+            if loaded_bytes > 0:
+                self._load_samples.append(loaded_bytes)
+            self._styles[style_id] = _ResidentStyle(True, time.monotonic())
+
+    def _model_bytes_locked(self) -> int:
+        """モデル 1 つあたりの大きさの概算を取得する。`_lock` を獲得した状態で呼ぶ。"""
+        if len(self._load_samples) == 0:
+            return 0
+        return statistics.median_low(self._load_samples)
+
+    def _resident_bytes_locked(self) -> int:
+        """常駐しているモデルが使うメモリの概算を取得する。`_lock` を獲得した状態で呼ぶ。"""
+        n_models = sum(1 for s in self._styles.values() if s.owns_model)
+        return n_models * self._model_bytes_locked()
+
+    def _estimate_model_bytes(self) -> int:
+        """これから読み込むモデルの大きさを見積もる。"""
+        with self._lock:
+            return self._model_bytes_locked()
+
+    def _evict(
+        self, incoming_bytes: int, exclude: StyleId, allow_recycle: bool
+    ) -> None:
+        """モデルの合計が上限に収まるまで、最も長く利用されていないスタイルから追い出す。"""
+        if self._memory_budget_bytes is None:
+            return
+        while True:
+            with self._lock:
+                resident_bytes = self._resident_bytes_locked()
+                if resident_bytes + incoming_bytes <= self._memory_budget_bytes:
+                    return
+                candidates = [
+                    (resident.last_used, style_id)
+                    for style_id, resident in self._styles.items()
+                    if style_id != exclude and style_id not in self._pinned
+                ]
+            if len(candidates) == 0:
+                return
+            _, victim = min(candidates)
+
+            try:
+                self._core.unload_model(victim)
+            except OldCoreError:
+                if allow_recycle:
+                    self._recycle()
+                return
+            with self._lock:
+                self._evictions += 1
+            self._forget_unloaded()
+
+    def _recycle(self) -> None:
+        """
+        コアを再初期化して全てのモデルを解放し、固定されたスタイルのモデルを読み込み直す。
+
+        直近の再初期化から min_recycle_interval_sec 秒が経っていない場合は何もしない。
+        """
+        now = time.monotonic()
+        with self._lock:
+            last_recycle = self._last_recycle
+        if (
+            last_recycle is not None
+            and now - last_recycle < self._min_recycle_interval_sec
+        ):
+            return
+        if last_recycle is None:
+            msg = (
+                "コアがモデルの個別の解放に対応していないため、"
+                "コアの再初期化によってモデルをまとめて解放します。"
+                "再初期化の後は各スタイルのモデルが読み込み直されます。"
+            )
+            warnings.warn(msg, stacklevel=1)
+        try:
+            self._core.reinitialize()
+        except OldCoreError:
+            return
+        with self._lock:
+            self._styles.clear()
+            self._recycles += 1
+            self._last_recycle = now
+            pinned = sorted(self._pinned)
+        for style_id in pinned:
+            self._load(style_id)
+
+    def _forget_unloaded(self) -> None:
+        """モデルが解放されたスタイルの記録を消す。モデルを共有するスタイルも合わせて解放されうる。"""
+        with self._lock:
+            style_ids = list(self._styles)
+        unloaded = [s for s in style_ids if not self._core.is_model_loaded(s)]
+        with self._lock:
+            for style_id in unloaded:
+                self._styles.pop(style_id, None)
+
+    def stats(self) -> ModelResidencyStats:
+        """音声合成モデルの常駐状況を取得する。"""
+        now = time.monotonic()
+        with self._lock:
+            model_bytes = self._model_bytes_locked()
+            styles = [
+                ResidentStyleStats(
+                    style_id=style_id,
+                    approx_bytes=model_bytes if resident.owns_model else 0,
+                    idle_seconds=now - resident.last_used,
+                    pinned=style_id in self._pinned,
+                )
+                for style_id, resident in sorted(self._styles.items())
+            ]
+            return ModelResidencyStats(
+                memory_budget_bytes=self._memory_budget_bytes,
+                resident_bytes=sum(s.approx_bytes for s in styles),
+                evictions=self._evictions,
+                recycles=self._recycles,
+                styles=styles,
+            )
+
+
+def merge_residency_stats(stats_list: list[ModelResidencyStats]) -> ModelResidencyStats:
+    """
+    複数のコアのインスタンスの常駐状況を 1 つにまとめる。
+
+    スタイルごとの大きさは合計し、経過時間は最も短いものとし、いずれかで固定されていれば固定されているとする。
+    """
+    if len(stats_list) == 1:
+        return stats_list[0]
+
+    budgets = [s.memory_budget_bytes for s in stats_list]
+    styles: dict[StyleId, ResidentStyleStats] = {}
+    for stats in stats_list:
+        for style in stats.styles:
+            merged = styles.get(style.style_id)
+            if merged is not None:
+                style = ResidentStyleStats(
+                    style_id=style.style_id,
+                    approx_bytes=merged.approx_bytes + style.approx_bytes,
+                    idle_seconds=min(merged.idle_seconds, style.idle_seconds),
+                    pinned=merged.pinned or style.pinned,
+                )
+            styles[style.style_id] = style
+    return ModelResidencyStats(
+        memory_budget_bytes=(
+            None if any(b is None for b in budgets) else sum(b or 0 for b in budgets)
+        ),
+        resident_bytes=sum(s.resident_bytes for s in stats_list),
+        evictions=sum(s.evictions for s in stats_list),
+        recycles=sum(s.recycles for s in stats_list),
+        styles=[styles[style_id] for style_id in sorted(styles)],
+    )
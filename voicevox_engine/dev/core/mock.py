@@ -241,11 +241,21 @@ class MockCoreWrapper(CoreWrapper):
         # 「コアのファイナライズが常に成功する」として扱う
         pass
 
+    def reinitialize(self) -> None:
+        """コアをファイナライズして初期化し直し、読み込まれた全てのモデルを解放する。"""
+        # 「コアの再初期化が常に成功する」として扱う
+        pass
+
     def load_model(self, style_id: int) -> None:
         """コアにモデルを読み込む。"""
         # 「モデルの読み込みが常に成功する」として扱う
         pass
 
+    def unload_model(self, style_id: int) -> None:
+        """コアから指定されたスタイルのモデルを解放する。"""
+        # 「モデルの解放が常に成功する」として扱う
+        pass
+
     def is_model_loaded(self, style_id: int) -> bool:
         """コアに指定されたモデルが読み込まれているか確認する。"""
         # 「モデルが常に読み込まれている」として扱う
@@ -1,6 +1,7 @@
 """TTSEngine のモック"""
 
 import copy
+from collections.abc import Iterator
 from typing import Final
 
 import numpy as np
@@ -8,6 +9,7 @@ from numpy.typing import NDArray
 from pyopenjtalk import tts
 
 from ...metas.metas import StyleId
+from ...metrics import stage_timer
 from ...model import AudioQuery
 from ...tts_pipeline.audio_postprocessing import raw_wave_to_output_wave
 from ...tts_pipeline.tts_engine import (
@@ -40,10 +42,22 @@ class MockTTSEngine(TTSEngine):
         flatten_moras = to_flatten_moras(query.accent_phrases)
         kana_text = "".join([mora.text for mora in flatten_moras])
 
-        raw_wave, sr_raw_wave = self.forward(kana_text)
-        wave = raw_wave_to_output_wave(query, raw_wave, sr_raw_wave)
+        with stage_timer("decode", style_id, self._core.version):
+            raw_wave, sr_raw_wave = self.forward(kana_text)
+        with stage_timer("postprocess", style_id, self._core.version):
+            wave = raw_wave_to_output_wave(query, raw_wave, sr_raw_wave)
         return wave
 
+    def synthesize_wave_stream(
+        self,
+        query: AudioQuery,
+        style_id: StyleId,
+        enable_interrogative_upspeak: bool,
+    ) -> Iterator[NDArray[np.float32]]:
+        """音声合成用のクエリに含まれる読み仮名に基づいてOpenJTalkで音声波形を生成し、一括で返す。"""
+        wave = self.synthesize_wave(query, style_id, enable_interrogative_upspeak)
+        return iter([wave])
+
     def forward(self, text: str) -> tuple[NDArray[np.float32], int]:
         """文字列から pyopenjtalk を用いて音声を合成する。"""
         OJT_SAMPLING_RATE: Final = 48000
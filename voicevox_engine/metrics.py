@@ -0,0 +1,396 @@
+"""処理段階ごとの所要時間などの計測値の集計と、Prometheus テキスト形式での出力、およびリクエストごとの処理段階の記録"""
+
+import bisect
+import math
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field, fields, is_dataclass
+from typing import Any, Final
+
+# 処理段階の所要時間のヒストグラムのバケット境界（秒）
+_DEFAULT_BUCKETS: Final = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+_STAGE_DURATION_METRIC: Final = "voicevox_stage_duration_seconds"
+_STAGE_FAILURES_METRIC: Final = "voicevox_stage_failures_total"
+
+# (処理段階, スタイルID, コアのバージョン)。不明なラベルは空文字列とする
+_StageKey = tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class MetricSample:
+    """出力する計測値 1 つ"""
+
+    name: str
+    value: float
+    labels: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class _Histogram:
+    """処理段階ごとの所要時間のヒストグラム"""
+
+    # 各バケットの（累積ではない）観測回数。末尾は最大の境界を超えた観測回数
+    bucket_counts: list[int]
+    count: int = 0
+    sum: float = 0.0
+
+
+def flatten_stats(
+    prefix: str, stats: Any, labels: dict[str, str] | None = None
+) -> list[MetricSample]:
+    """
+    統計情報のデータクラスの数値・真偽値のフィールドを計測値へ変換する。
+
+    値が None のフィールドと、辞書・リストなどの入れ子のフィールドは変換しない。
+
+    Parameters
+    ----------
+    prefix : str
+        計測値名の接頭辞。計測値名は `{prefix}_{フィールド名}` となる
+    stats : Any
+        統計情報のデータクラスのインスタンス
+    labels : dict[str, str] | None
+        全ての計測値に付与するラベル
+    """
+    if not is_dataclass(stats) or isinstance(stats, type):
+        raise TypeError("stats はデータクラスのインスタンスである必要があります。")
+    samples = []
+    for stats_field in fields(stats):
+        value = getattr(stats, stats_field.name)
+        if isinstance(value, bool | int | float):
+            samples.append(
+                MetricSample(
+                    f"{prefix}_{stats_field.name}", float(value), dict(labels or {})
+                )
+            )
+    return samples
+
+
+class MetricsRegistry:
+    """
+    計測値の集計器。
+
+    処理段階ごとの所要時間をヒストグラムとして集計し、登録された収集関数が返す統計情報と合わせて Prometheus テキスト形式で出力する。
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = _DEFAULT_BUCKETS) -> None:
+        """
+        集計器を生成する。
+
+        Parameters
+        ----------
+        buckets : tuple[float, ...]
+            所要時間のヒストグラムのバケット境界（秒）。昇順である必要がある
+        """
+        if list(buckets) != sorted(buckets) or len(buckets) == 0:
+            raise ValueError("buckets は空でない昇順の列である必要があります。")
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms: dict[_StageKey, _Histogram] = {}
+        self._failures: dict[_StageKey, int] = {}
+        self._collectors: list[Callable[[], list[MetricSample]]] = []
+
+    def observe_stage(
+        self,
+        stage: str,
+        seconds: float,
+        style_id: int | None = None,
+        core_version: str | None = None,
+        failed: bool = False,
+    ) -> None:
+        """処理段階の所要時間を記録する。失敗した場合は所要時間ではなく失敗回数として記録する。"""
+        key = (
+            stage,
+            "" if style_id is None else str(style_id),
+            core_version or "",
+        )
+        with self._lock:
+            if failed:
+                self._failures[key] = self._failures.get(key, 0) + 1
+                return
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = _Histogram([0] * (len(self._buckets) + 1))
+                self._histograms[key] = histogram
+            histogram.bucket_counts[bisect.bisect_left(self._buckets, seconds)] += 1
+            histogram.count += 1
+            histogram.sum += seconds
+
+    def register_collector(self, collect: Callable[[], list[MetricSample]]) -> None:
+        """出力時に呼ばれ、その時点の統計情報を計測値として返す収集関数を登録する。"""
+        with self._lock:
+            self._collectors.append(collect)
+
+    def render(self) -> str:
+        """全ての計測値を Prometheus テキスト形式 (version 0.0.4) で出力する。"""
+        with self._lock:
+            histograms = {
+                key: _Histogram(list(h.bucket_counts), h.count, h.sum)
+                for key, h in self._histograms.items()
+            }
+            failures = dict(self._failures)
+            collectors = list(self._collectors)
+
+        lines = [
+            f"# HELP {_STAGE_DURATION_METRIC} 処理段階ごとの所要時間（秒）",
+            f"# TYPE {_STAGE_DURATION_METRIC} histogram",
+        ]
+        for key, histogram in sorted(histograms.items()):
+            labels = _stage_labels(key)
+            cumulative = 0
+            for bound, count in zip(
+                self._buckets, histogram.bucket_counts, strict=False
+            ):
+                cumulative += count
+                lines.append(
+                    _format_sample(
+                        f"{_STAGE_DURATION_METRIC}_bucket",
+                        cumulative,
+                        {**labels, "le": _format_value(bound)},
+                    )
+                )
+            lines.append(
+                _format_sample(
+                    f"{_STAGE_DURATION_METRIC}_bucket",
+                    histogram.count,
+                    {**labels, "le": "+Inf"},
+                )
+            )
+            lines.append(
+                _format_sample(f"{_STAGE_DURATION_METRIC}_sum", histogram.sum, labels)
+            )
+            lines.append(
+                _format_sample(
+                    f"{_STAGE_DURATION_METRIC}_count", histogram.count, labels
+                )
+            )
+
+        lines.append(f"# HELP {_STAGE_FAILURES_METRIC} 処理段階ごとの失敗回数")
+        lines.append(f"# TYPE {_STAGE_FAILURES_METRIC} counter")
+        for key, count in sorted(failures.items()):
+            lines.append(
+                _format_sample(_STAGE_FAILURES_METRIC, count, _stage_labels(key))
+            )
+
+        # NOTE: 同名の計測値は連続して出力する必要がある
+        grouped: dict[str, list[MetricSample]] = {}
+        for collect in collectors:
+            for sample in collect():
+                grouped.setdefault(sample.name, []).append(sample)
+        for name, samples in grouped.items():
+            lines.append(f"# TYPE {name} untyped")
+            for sample in samples:
+                lines.append(_format_sample(name, sample.value, sample.labels))
+
+        return "\n".join(lines) + "\n"
+
+
+def _stage_labels(key: _StageKey) -> dict[str, str]:
+    """処理段階の記録のキーからラベルを生成する。空のラベルは省略する。"""
+    stage, style_id, core_version = key
+    labels = {"stage": stage}
+    if style_id:
+        labels["style_id"] = style_id
+    if core_version:
+        labels["core_version"] = core_version
+    return labels
+
+
+def _format_value(value: float) -> str:
+    """計測値を Prometheus テキスト形式の数値表記へ変換する。"""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer() and abs(value) < 2**53:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    """ラベル値を Prometheus テキスト形式でエスケープする。"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_sample(name: str, value: float, labels: dict[str, str]) -> str:
+    """計測値 1 つを Prometheus テキスト形式の 1 行へ変換する。"""
+    if len(labels) == 0:
+        return f"{name} {_format_value(value)}"
+    label_text = ",".join(
+        f'{key}="{_escape_label_value(label)}"' for key, label in labels.items()
+    )
+    return f"{name}{{{label_text}}} {_format_value(value)}"
+
+
+@dataclass(frozen=True)
+class StageSpan:
+    """リクエスト内で実行された処理段階 1 つの記録"""
+
+    stage: str
+    style_id: int | None
+    core_version: str | None
+    start_seconds: float  # リクエストの処理開始からこの処理段階の開始までの時間（秒）
+    seconds: float  # 処理段階の所要時間（秒）
+    failed: bool  # 例外で中断されたか否か
+
+
+class RequestTrace:
+    """
+    1 つのリクエストの処理中に実行された処理段階の記録。
+
+    リクエストを処理するスレッドから並行して記録されうる。
+    """
+
+    def __init__(self) -> None:
+        """リクエストの処理開始時に生成する。"""
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._spans: list[StageSpan] = []
+
+    @property
+    def elapsed_seconds(self) -> float:
+        """リクエストの処理開始からの経過時間（秒）。"""
+        return time.perf_counter() - self._start
+
+    def record(
+        self,
+        stage: str,
+        start: float,
+        seconds: float,
+        style_id: int | None,
+        core_version: str | None,
+        failed: bool,
+    ) -> None:
+        """`time.perf_counter()` の値 `start` に開始した処理段階を記録する。"""
+        span = StageSpan(
+            stage, style_id, core_version, start - self._start, seconds, failed
+        )
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self) -> list[StageSpan]:
+        """記録された処理段階を開始順に取得する。"""
+        with self._lock:
+            return sorted(self._spans, key=lambda span: span.start_seconds)
+
+    def server_timing(self) -> str:
+        """
+        処理段階ごとの所要時間の合計を `Server-Timing` ヘッダーの値として生成する。
+
+        同じ処理段階が複数回実行された場合は所要時間を合計し、回数を説明として付与する。
+        """
+        durations: dict[str, float] = {}
+        counts: dict[str, int] = {}
+        for span in self.spans():
+            durations[span.stage] = durations.get(span.stage, 0.0) + span.seconds
+            counts[span.stage] = counts.get(span.stage, 0) + 1
+        metrics = []
+        for stage, seconds in durations.items():
+            metric = f"{stage};dur={seconds * 1000:.3f}"
+            if counts[stage] > 1:
+                metric += f';desc="x{counts[stage]}"'
+            metrics.append(metric)
+        return ", ".join(metrics)
+
+
+_current_trace: ContextVar[RequestTrace | None] = ContextVar(
+    "_current_trace", default=None
+)
+
+
+@contextmanager
+def trace_request() -> Iterator[RequestTrace]:
+    """コンテキスト内（およびそこから生成されたタスク）で実行された処理段階を記録する。"""
+    trace = RequestTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+# NOTE: 無効時の計測のコストを抑えるため、計測しないコンテキストマネージャーを使い回す
+_NULL_TIMER: Final[AbstractContextManager[None]] = nullcontext()
+
+_registry: MetricsRegistry | None = None
+
+
+def enable_metrics() -> MetricsRegistry:
+    """計測を有効化し、計測値の集計器を返す。既に有効であれば既存の集計器を返す。"""
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry()
+    return _registry
+
+
+def disable_metrics() -> None:
+    """計測を無効化し、集計済みの計測値を破棄する。"""
+    global _registry
+    _registry = None
+
+
+@contextmanager
+def _timer(
+    registry: MetricsRegistry | None,
+    trace: RequestTrace | None,
+    stage: str,
+    style_id: int | None,
+    core_version: str | None,
+) -> Iterator[None]:
+    """コンテキスト内の処理の所要時間を計測し、集計器とリクエストの記録へ記録する。"""
+    start = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        if registry is not None:
+            registry.observe_stage(stage, seconds, style_id, core_version, failed)
+        if trace is not None:
+            trace.record(stage, start, seconds, style_id, core_version, failed)
+
+
+def stage_timer(
+    stage: str, style_id: int | None = None, core_version: str | None = None
+) -> AbstractContextManager[None]:
+    """
+    処理段階の所要時間を計測するコンテキストマネージャーを返す。
+
+    計測が無効で、かつリクエストの処理段階を記録していない場合は何もしないコンテキストマネージャーを返す。
+
+    Parameters
+    ----------
+    stage : str
+        処理段階の名前
+    style_id : int | None
+        処理対象のスタイルID。スタイルによらない処理では None
+    core_version : str | None
+        処理に用いるコアのバージョン。コアによらない処理では None
+    """
+    registry = _registry
+    trace = _current_trace.get()
+    if registry is None and trace is None:
+        return _NULL_TIMER
+    return _timer(registry, trace, stage, style_id, core_version)
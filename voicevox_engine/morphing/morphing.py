@@ -17,6 +17,7 @@ from voicevox_engine.metas.metas_store import Character
 from voicevox_engine.morphing.model import MorphableTargetInfo
 
 from ..metas.metas import StyleId
+from ..metrics import stage_timer
 from ..model import AudioQuery
 from ..tts_pipeline.tts_engine import TTSEngine
 
@@ -132,13 +133,16 @@ def synthesis_morphing_parameter(
 
     fs = query.outputSamplingRate
     frame_period = 1.0
-    base_f0, base_time_axis = pw.harvest(base_wave, fs, frame_period=frame_period)
-    base_spectrogram = pw.cheaptrick(base_wave, base_f0, base_time_axis, fs)
-    base_aperiodicity = pw.d4c(base_wave, base_f0, base_time_axis, fs)
+    with stage_timer("morphing_analysis", base_style_id, engine.core_version):
+        base_f0, base_time_axis = pw.harvest(base_wave, fs, frame_period=frame_period)
+        base_spectrogram = pw.cheaptrick(base_wave, base_f0, base_time_axis, fs)
+        base_aperiodicity = pw.d4c(base_wave, base_f0, base_time_axis, fs)
 
-    target_f0, morph_time_axis = pw.harvest(target_wave, fs, frame_period=frame_period)
-    target_spectrogram = pw.cheaptrick(target_wave, target_f0, morph_time_axis, fs)
-    target_spectrogram.resize(base_spectrogram.shape)
+        target_f0, morph_time_axis = pw.harvest(
+            target_wave, fs, frame_period=frame_period
+        )
+        target_spectrogram = pw.cheaptrick(target_wave, target_f0, morph_time_axis, fs)
+        target_spectrogram.resize(base_spectrogram.shape)
 
     return _MorphingParameter(
         fs=fs,
@@ -181,23 +185,25 @@ def synthesize_morphed_wave(
     if morph_rate < 0.0 or morph_rate > 1.0:
         raise ValueError("morph_rateは0.0から1.0の範囲で指定してください")
 
-    morph_spectrogram = (
-        morph_param.base_spectrogram * (1.0 - morph_rate)
-        + morph_param.target_spectrogram * morph_rate
-    )
-
-    _y_h: NDArray[np.float64] = pw.synthesize(
-        morph_param.base_f0,
-        morph_spectrogram,
-        morph_param.base_aperiodicity,
-        morph_param.fs,
-        morph_param.frame_period,
-    )
-    y_h = _y_h.astype(np.float32)
+    with stage_timer("morphing_synthesis"):
+        morph_spectrogram = (
+            morph_param.base_spectrogram * (1.0 - morph_rate)
+            + morph_param.target_spectrogram * morph_rate
+        )
+
+        _y_h: NDArray[np.float64] = pw.synthesize(
+            morph_param.base_f0,
+            morph_spectrogram,
+            morph_param.base_aperiodicity,
+            morph_param.fs,
+            morph_param.frame_period,
+        )
+        y_h = _y_h.astype(np.float32)
 
     # TODO: tts_engine.py でのリサンプル処理と共通化する
     if output_fs != morph_param.fs:
-        y_h = resample(y_h, morph_param.fs, output_fs)
+        with stage_timer("morphing_resample"):
+            y_h = resample(y_h, morph_param.fs, output_fs)
 
     if output_stereo:
         y_h = np.array([y_h, y_h]).T
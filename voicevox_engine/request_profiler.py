@@ -0,0 +1,210 @@
+"""一部のリクエストを対象とした、スタックのサンプリングによる API ごとのプロファイリング"""
+
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import MutableMapping
+from dataclasses import dataclass
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any, Final
+
+_DEFAULT_INTERVAL_SEC: Final = 0.005
+
+# API ごとに記録するスタックの種類数の上限。超えた分は 1 つのスタックとしてまとめる
+_MAX_STACKS_PER_ENDPOINT: Final = 10000
+_TRUNCATED_STACK: Final = "[truncated]"
+
+
+@dataclass(frozen=True)
+class RequestProfilerStats:
+    """リクエストのプロファイラーの統計情報"""
+
+    sample_rate: float  # プロファイリングの対象とするリクエストの割合。0 の場合は無効
+    interval_sec: float  # スタックを採取する間隔（秒）
+    profiled_requests: int  # これまでにプロファイリングの対象としたリクエスト数
+    samples: int  # これまでに採取したスタック数
+    output_dir: Path  # プロファイルの書き出し先ディレクトリ
+
+
+@dataclass
+class _ProfiledRequest:
+    """プロファイリングの対象として処理中のリクエスト"""
+
+    scope: MutableMapping[
+        str, Any
+    ]  # ASGI のスコープ。ルーティング後にエンドポイントが設定される
+
+
+def _endpoint_of(scope: MutableMapping[str, Any]) -> tuple[str, CodeType] | None:
+    """リクエストを処理する API の名前と関数のコードを取得する。ルーティング前は None を返す。"""
+    endpoint = scope.get("endpoint")
+    code = getattr(endpoint, "__code__", None)
+    if code is None:
+        return None
+    route = scope.get("route")
+    path = getattr(route, "path", scope["path"])
+    return f"{scope['method']} {path}", code
+
+
+def _frame_name(code: CodeType) -> str:
+    """スタックの 1 フレームを collapsed stack 形式の名前へ変換する。"""
+    return f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def _profile_file_name(endpoint: str) -> str:
+    """プロファイルのファイル名を API の名前から生成する。"""
+    return re.sub(r"[^0-9A-Za-z]+", "_", endpoint).strip("_") + ".collapsed"
+
+
+class RequestProfiler:
+    """
+    一部のリクエストを対象とした、スタックのサンプリングによるプロファイラー。
+
+    対象のリクエストの処理中だけ、全スレッドのスタックを一定間隔で採取する。
+    対象のリクエストを処理する API の関数を含むスタックを、API ごとに collapsed stack 形式
+    （`関数;関数;... 回数`、flamegraph.pl や speedscope で可視化できる）で集計し、リクエストの処理完了時にファイルへ書き出す。
+    同じ API を処理中の対象外のリクエストのスタックも区別せずに集計される。
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        sample_rate: float = 0.0,
+        interval_sec: float = _DEFAULT_INTERVAL_SEC,
+    ) -> None:
+        """
+        プロファイラーを生成する。
+
+        Parameters
+        ----------
+        output_dir : Path
+            プロファイルの書き出し先ディレクトリ
+        sample_rate : float
+            プロファイリングの対象とするリクエストの割合。0 の場合は無効
+        interval_sec : float
+            スタックを採取する間隔（秒）
+        """
+        if interval_sec <= 0:
+            raise ValueError("interval_sec は正の値である必要があります。")
+        self._output_dir = output_dir
+        self._interval_sec = interval_sec
+        self._sample_rate = 0.0
+        self.set_sample_rate(sample_rate)
+
+        self._cond = threading.Condition()
+        self._inflight: dict[int, _ProfiledRequest] = {}
+        self._next_request_id = 0
+        self._stacks: dict[str, Counter[str]] = {}
+        self._profiled_requests = 0
+        self._samples = 0
+        self._sampler: threading.Thread | None = None
+        self._write_lock = threading.Lock()
+
+    def set_sample_rate(self, sample_rate: float) -> None:
+        """プロファイリングの対象とするリクエストの割合を変更する。0 の場合は無効にする。"""
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate は 0 以上 1 以下である必要があります。")
+        self._sample_rate = sample_rate
+
+    def should_profile(self) -> bool:
+        """新しいリクエストをプロファイリングの対象とするか否かを抽選する。"""
+        # NOTE: 無効時のコストを抑えるため、乱数の生成より先に割合を確認する
+        sample_rate = self._sample_rate
+        return sample_rate > 0.0 and random.random() < sample_rate
+
+    def begin(self, scope: MutableMapping[str, Any]) -> int:
+        """リクエストのプロファイリングを開始し、終了時に渡す ID を返す。"""
+        with self._cond:
+            request_id = self._next_request_id
+            self._next_request_id += 1
+            self._inflight[request_id] = _ProfiledRequest(scope)
+            self._profiled_requests += 1
+            if self._sampler is None:
+                self._sampler = threading.Thread(
+                    target=self._run_sampler, name="request_profiler", daemon=True
+                )
+                self._sampler.start()
+            self._cond.notify_all()
+        return request_id
+
+    def end(self, request_id: int) -> None:
+        """リクエストのプロファイリングを終了し、その API のプロファイルを書き出す。"""
+        with self._cond:
+            request = self._inflight.pop(request_id)
+        endpoint = _endpoint_of(request.scope)
+        if endpoint is not None:
+            self._write_profile(endpoint[0])
+
+    def stats(self) -> RequestProfilerStats:
+        """プロファイラーの統計情報を取得する。"""
+        with self._cond:
+            return RequestProfilerStats(
+                sample_rate=self._sample_rate,
+                interval_sec=self._interval_sec,
+                profiled_requests=self._profiled_requests,
+                samples=self._samples,
+                output_dir=self._output_dir,
+            )
+
+    def _run_sampler(self) -> None:
+        """対象のリクエストの処理中、一定間隔でスタックを採取し続ける。"""
+        while True:
+            with self._cond:
+                while len(self._inflight) == 0:
+                    self._cond.wait()
+                requests = list(self._inflight.values())
+            self._sample(requests)
+            time.sleep(self._interval_sec)
+
+    def _sample(self, requests: list[_ProfiledRequest]) -> None:
+        """全スレッドのスタックを採取し、対象のリクエストを処理する API の関数を含むものを集計する。"""
+        targets: dict[CodeType, str] = {}
+        for request in requests:
+            endpoint = _endpoint_of(request.scope)
+            if endpoint is not None:
+                targets[endpoint[1]] = endpoint[0]
+        if len(targets) == 0:
+            return
+
+        sampler_id = threading.get_ident()
+        collected: list[tuple[str, str]] = []
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == sampler_id:
+                continue
+            codes = []
+            current: FrameType | None = frame
+            while current is not None:
+                codes.append(current.f_code)
+                current = current.f_back
+            endpoint_name = next((targets[c] for c in codes if c in targets), None)
+            if endpoint_name is not None:
+                stack = ";".join(_frame_name(code) for code in reversed(codes))
+                collected.append((endpoint_name, stack))
+
+        with self._cond:
+            for endpoint_name, stack in collected:
+                stacks = self._stacks.setdefault(endpoint_name, Counter())
+                if stack not in stacks and len(stacks) >= _MAX_STACKS_PER_ENDPOINT:
+                    stack = _TRUNCATED_STACK
+                stacks[stack] += 1
+                self._samples += 1
+
+    def _write_profile(self, endpoint_name: str) -> None:
+        """これまでに集計した API のプロファイルを collapsed stack 形式でファイルへ書き出す。"""
+        with self._cond:
+            stacks = self._stacks.get(endpoint_name)
+            if stacks is None:
+                return
+            lines = [f"{stack} {count}\n" for stack, count in stacks.most_common()]
+
+        path = self._output_dir / _profile_file_name(endpoint_name)
+        # NOTE: 書き出し途中のファイルを読まれないよう、一時ファイルを経由して置き換える
+        tmp_path = path.with_name(path.name + ".tmp")
+        with self._write_lock:
+            self._output_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text("".join(lines), encoding="utf-8")
+            tmp_path.replace(path)
@@ -0,0 +1,102 @@
+"""テキスト解析結果（アクセント句系列）のキャッシュ"""
+
+import copy
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Final
+
+from .model import AccentPhrase
+
+_DEFAULT_MAX_ENTRIES: Final = 1024
+
+# (テキスト, 英単語のカタカナ変換フラグ, ユーザー辞書の世代)
+_CacheKey = tuple[str, bool, int]
+
+
+@dataclass(frozen=True)
+class AccentPhraseCacheStats:
+    """テキスト解析結果キャッシュの統計情報"""
+
+    hits: int  # キャッシュにヒットした回数
+    misses: int  # キャッシュにヒットしなかった回数
+    evictions: int  # 上限を超えたため追い出された解析結果の数
+    entries: int  # キャッシュされた解析結果の数
+    generation: int  # ユーザー辞書の世代
+
+
+class AccentPhraseCache:
+    """
+    テキストから生成された、コアによる音素長・モーラ音高の更新前のアクセント句系列のキャッシュ。
+
+    テキスト解析結果は OpenJTalk が読み込んでいる辞書に依存するため、辞書の更新時には `invalidate()` で世代を進めて全ての解析結果を破棄する。
+    """
+
+    def __init__(self, max_entries: int = _DEFAULT_MAX_ENTRIES) -> None:
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[_CacheKey, list[AccentPhrase]] = OrderedDict()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def generation(self) -> int:
+        """ユーザー辞書の世代。辞書が更新されるたびに増える。"""
+        return self._generation
+
+    def get(
+        self, text: str, enable_katakana_english: bool, generation: int
+    ) -> list[AccentPhrase] | None:
+        """キャッシュされたアクセント句系列の複製を取得する。キャッシュされていない場合は None を返す。"""
+        key = (text, enable_katakana_english, generation)
+        with self._lock:
+            accent_phrases = self._entries.get(key)
+            if accent_phrases is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        # NOTE: 呼び出し側で音素長・モーラ音高が書き換えられるため複製を返す
+        return copy.deepcopy(accent_phrases)
+
+    def put(
+        self,
+        text: str,
+        enable_katakana_english: bool,
+        generation: int,
+        accent_phrases: list[AccentPhrase],
+    ) -> None:
+        """アクセント句系列の複製をキャッシュする。解析中に辞書が更新されていた場合はキャッシュしない。"""
+        accent_phrases = copy.deepcopy(accent_phrases)
+        key = (text, enable_katakana_english, generation)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = accent_phrases
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self) -> None:
+        """辞書の更新に合わせて世代を進め、全ての解析結果を破棄する。"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> AccentPhraseCacheStats:
+        """キャッシュの統計情報を取得する。"""
+        with self._lock:
+            return AccentPhraseCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                generation=self._generation,
+            )
+
+
+# NOTE: OpenJTalk の辞書はプロセス内で共有されるため、キャッシュもプロセス内で共有する
+accent_phrase_cache: Final = AccentPhraseCache()
@@ -1,8 +1,10 @@
 """音声波形を加工する。"""
 
+from collections.abc import Iterable, Iterator
+
 import numpy as np
 from numpy.typing import NDArray
-from soxr import resample
+from soxr import ResampleStream, resample
 
 from ..model import AudioQuery
 from .model import (
@@ -20,6 +22,28 @@ def raw_wave_to_output_wave(
     return wave
 
 
+def raw_wave_chunks_to_output_wave_chunks(
+    query: AudioQuery, wave_chunks: Iterable[NDArray[np.float32]], sr_wave: int
+) -> Iterator[NDArray[np.float32]]:
+    """逐次生成される生音声波形の断片に音声合成用のクエリを適用し、出力音声波形の断片を逐次生成する"""
+    # NOTE: 断片の境界で不連続にならないよう、リサンプラーの状態を断片間で引き継ぐ
+    resampler: ResampleStream | None = None
+    if sr_wave != query.outputSamplingRate:
+        resampler = ResampleStream(
+            sr_wave, query.outputSamplingRate, 1, dtype="float32"
+        )
+
+    for wave in wave_chunks:
+        wave = _apply_volume_scale(wave, query)
+        if resampler is not None:
+            wave = resampler.resample_chunk(wave.astype(np.float32))
+        yield _apply_output_stereo(wave, query)
+
+    if resampler is not None:
+        wave = resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+        yield _apply_output_stereo(wave, query)
+
+
 def _apply_volume_scale(
     wave: NDArray[np.float32], query: AudioQuery | FrameAudioQuery
 ) -> NDArray[np.float32]:
@@ -1,6 +1,7 @@
 """音素"""
 
-from typing import Literal
+from collections.abc import Sequence
+from typing import Final, Literal
 
 import numpy as np
 from numpy.typing import NDArray
@@ -58,6 +59,9 @@ _PHONEME_LIST += ("u", "v", "w", "y", "z")
 # 音素リストの要素数
 _NUM_PHONEME = len(_PHONEME_LIST)
 
+# 音素から音素ID (音素リスト内でのindex) への対応表
+_PHONEME_TO_ID: Final[dict[str, int]] = {p: i for i, p in enumerate(_PHONEME_LIST)}
+
 _UNVOICED_MORA_TAIL_PHONEMES = ["A", "I", "U", "E", "O", "cl", "pau"]
 _MORA_TAIL_PHONEMES = ["a", "i", "u", "e", "o", "N"] + _UNVOICED_MORA_TAIL_PHONEMES
 
@@ -67,6 +71,7 @@ class Phoneme:
 
     _PHONEME_LIST = _PHONEME_LIST
     _NUM_PHONEME = _NUM_PHONEME
+    _PHONEME_TO_ID = _PHONEME_TO_ID
 
     def __init__(self, phoneme: str):
         # 無音をポーズに変換
@@ -80,7 +85,11 @@ class Phoneme:
     @property
     def id(self) -> int:
         """音素ID (音素リスト内でのindex) を取得する"""
-        return self._PHONEME_LIST.index(self._phoneme)
+        phoneme_id = self._PHONEME_TO_ID.get(self._phoneme)
+        if phoneme_id is None:
+            msg = f"{self._phoneme!r} is not in tuple of phonemes"
+            raise ValueError(msg)
+        return phoneme_id
 
     @property
     def onehot(self) -> NDArray[np.float32]:
@@ -96,3 +105,32 @@ class Phoneme:
     def is_unvoiced_mora_tail(self) -> bool:
         """この音素は無声のモーラ末尾音素（無声母音・促音・無音）である"""
         return self._phoneme in _UNVOICED_MORA_TAIL_PHONEMES
+
+
+def phonemes_to_ids(phonemes: Sequence[str]) -> NDArray[np.int64]:
+    """
+    音素系列を音素ID系列へ一括で変換する。
+
+    無音 `sil` を含む音素は `Phoneme` と同様にポーズ `pau` として扱う。
+
+    Raises
+    ------
+    ValueError
+        音素リストに含まれない音素が与えられた場合
+    """
+    lookup = _PHONEME_TO_ID.get
+    ids = [lookup(phoneme) for phoneme in phonemes]
+    if None in ids:
+        # NOTE: 対応表に無い音素は稀なので、無音の変換と不正音素の検出は `Phoneme` に任せる
+        ids = [
+            phoneme_id if phoneme_id is not None else Phoneme(phoneme).id
+            for phoneme_id, phoneme in zip(ids, phonemes, strict=True)
+        ]
+    return np.array(ids, dtype=np.int64)
+
+
+def ids_to_onehot_matrix(phoneme_ids: NDArray[np.int64]) -> NDArray[np.float32]:
+    """音素ID系列を音素onehotベクトル系列へ変換する。shape = (系列長, 音素数)"""
+    onehot = np.zeros((len(phoneme_ids), _NUM_PHONEME), dtype=np.float32)
+    onehot[np.arange(len(phoneme_ids)), phoneme_ids] = 1.0
+    return onehot
@@ -9,6 +9,7 @@ from ..core.core_adapter import CoreAdapter, DeviceSupport
 from ..core.core_initializer import CoreManager
 from ..core.core_wrapper import CoreWrapper
 from ..metas.metas import StyleId
+from ..metrics import stage_timer
 from ..utility.core_version_utility import MOCK_CORE_VERSION, get_latest_version
 from .audio_postprocessing import raw_wave_to_output_wave
 from .model import (
@@ -19,7 +20,7 @@ from .model import (
     Score,
 )
 from .mora_mapping import mora_kana_to_mora_phonemes
-from .phoneme import Phoneme
+from .phoneme import Phoneme, phonemes_to_ids
 
 
 class SongInvalidInputError(Exception):
@@ -33,19 +34,16 @@ def _frame_query_to_sf_decoder_feature(
 ) -> tuple[NDArray[np.int64], NDArray[np.float32], NDArray[np.float32]]:
     """歌声合成用のクエリからフレームごとの音素・音高・音量を得る"""
     # 各データを分解・numpy配列に変換する
-    phonemes = []
-    phoneme_lengths = []
-
-    for phoneme in query.phonemes:
-        if phoneme.phoneme not in Phoneme._PHONEME_LIST:
-            msg = f"phoneme {phoneme.phoneme} is not valid"
+    phonemes = [phoneme.phoneme for phoneme in query.phonemes]
+    for phoneme in phonemes:
+        if phoneme not in Phoneme._PHONEME_TO_ID:
+            msg = f"phoneme {phoneme} is not valid"
             raise SongInvalidInputError(msg)
 
-        phonemes.append(Phoneme(phoneme.phoneme).id)
-        phoneme_lengths.append(phoneme.frame_length)
-
-    phonemes_array = np.array(phonemes, dtype=np.int64)
-    phoneme_lengths_array = np.array(phoneme_lengths, dtype=np.int64)
+    phonemes_array = phonemes_to_ids(phonemes)
+    phoneme_lengths_array = np.array(
+        [phoneme.frame_length for phoneme in query.phonemes], dtype=np.int64
+    )
 
     frame_phonemes = np.repeat(phonemes_array, phoneme_lengths_array)
     f0s = np.array(query.f0, dtype=np.float32)
@@ -206,9 +204,9 @@ def _calc_phoneme_lengths(
 class SongEngine:
     """音声合成器（core）の管理/実行/プロキシと音声合成フロー"""
 
-    def __init__(self, core: CoreWrapper):
+    def __init__(self, core: CoreWrapper | CoreAdapter):
         super().__init__()
-        self._core = CoreAdapter(core)
+        self._core = core if isinstance(core, CoreAdapter) else CoreAdapter(core)
 
     @property
     def default_sampling_rate(self) -> int:
@@ -228,14 +226,15 @@ class SongEngine:
         """歌声合成用の楽譜・スタイルIDに基づいてフレームごとの音素・音高・音量を生成する"""
         notes = score.notes
 
-        (
-            note_lengths_array,
-            note_consonants_array,
-            note_vowels_array,
-            phonemes_array,
-            phoneme_keys_array,
-            phoneme_note_ids,
-        ) = _notes_to_keys_and_phonemes(notes)
+        with stage_timer("score_analysis", style_id, self._core.version):
+            (
+                note_lengths_array,
+                note_consonants_array,
+                note_vowels_array,
+                phonemes_array,
+                phoneme_keys_array,
+                phoneme_note_ids,
+            ) = _notes_to_keys_and_phonemes(notes)
 
         # コアを用いて子音長を生成する
         consonant_lengths = self._core.safe_predict_sing_consonant_length_forward(
@@ -295,9 +294,7 @@ class SongEngine:
             _,
         ) = _notes_to_keys_and_phonemes(notes)
 
-        phonemes_array = np.array(
-            [Phoneme(p.phoneme).id for p in phonemes], dtype=np.int64
-        )
+        phonemes_array = phonemes_to_ids([p.phoneme for p in phonemes])
         phoneme_lengths = np.array([p.frame_length for p in phonemes], dtype=np.int64)
 
         # notesから生成した音素系列と、FrameAudioQueryが持つ音素系列が一致しているか確認
@@ -346,9 +343,7 @@ class SongEngine:
             _,
         ) = _notes_to_keys_and_phonemes(notes)
 
-        phonemes_array = np.array(
-            [Phoneme(p.phoneme).id for p in phonemes], dtype=np.int64
-        )
+        phonemes_array = phonemes_to_ids([p.phoneme for p in phonemes])
         phoneme_lengths = np.array([p.frame_length for p in phonemes], dtype=np.int64)
         f0_array = np.array(f0s, dtype=np.float32)
 
@@ -385,11 +380,13 @@ class SongEngine:
         style_id: StyleId,
     ) -> NDArray[np.float32]:
         """歌声合成用のクエリ・スタイルIDに基づいて音声波形を生成する"""
-        phoneme, f0, volume = _frame_query_to_sf_decoder_feature(query)
+        with stage_timer("sf_decoder_feature", style_id, self._core.version):
+            phoneme, f0, volume = _frame_query_to_sf_decoder_feature(query)
         raw_wave, sr_raw_wave = self._core.safe_sf_decode_forward(
             phoneme, f0, volume, style_id
         )
-        wave = raw_wave_to_output_wave(query, raw_wave, sr_raw_wave)
+        with stage_timer("postprocess", style_id, self._core.version):
+            wave = raw_wave_to_output_wave(query, raw_wave, sr_raw_wave)
         return wave
 
 
@@ -448,5 +445,5 @@ def make_song_engines_from_cores(core_manager: CoreManager) -> SongEngineManager
 
             song_engines.register_engine(MockSongEngine(), ver)
         else:
-            song_engines.register_engine(SongEngine(core.core), ver)
+            song_engines.register_engine(SongEngine(core), ver)
     return song_engines
@@ -79,15 +79,38 @@ _OJT_CONSONANTS: Final[tuple[Consonant, ...]] = (
 )
 _OJT_UNKNOWNS: Final[tuple[_OJT_UNKNOWN]] = ("xx",)
 _OJT_PHONEMES: Final = _OJT_VOWELS + _OJT_CONSONANTS + _OJT_UNKNOWNS
+_OJT_PHONEME_SET: Final = frozenset(_OJT_PHONEMES)
 
 
 def _is_ojt_phoneme(
     p: str,
 ) -> TypeGuard[Vowel | Sil | Consonant | _OJT_UNKNOWN]:
-    return p in _OJT_PHONEMES
+    return p in _OJT_PHONEME_SET
+
+
+# フルコンテキストラベルのうち VOICEVOX ENGINE で利用する属性を抽出するパターン
+# フルコンテキストラベルの仕様は、http://hts.sp.nitech.ac.jp/?Download の HTS-2.3のJapanese tar.bz2 (126 MB)をダウンロードして、data/lab_format.pdfを見るとリストが見つかります。
+# VOICEVOX ENGINE で利用されている属性: p3 phoneme / a2 moraIdx / f1 n_mora / f2 pos_accent / f3 疑問形 / f5 アクセント句Idx / i3 BreathGroupIdx
+# NOTE: 各属性は区切り文字を含まないため、区切り文字以外の文字の連続として照合し、バックトラックを避ける
+# NOTE: 利用しない属性は区切り文字の位置のみを検証し、キャプチャしない
+_LABEL_PATTERN: Final = re.compile(
+    r"^[^^\n]+\^[^-\n]+-(?P<p3>[^+\n]+)\+[^=\n]+=[^/\n]+"
+    r"/A:[^+\n]+\+(?P<a2>[^+\n]+)\+[^/\n]+"
+    r"/B:[^-\n]+-[^_\n]+_[^/\n]+"
+    r"/C:[^_\n]+_[^+\n]+\+[^/\n]+"
+    r"/D:[^+\n]+\+[^_\n]+_[^/\n]+"
+    r"/E:[^_\n]+_[^!\n]+![^_\n]+_[^-\n]+-[^/\n]+"
+    r"/F:(?P<f1>[^_\n]+)_(?P<f2>[^#\n]+)#(?P<f3>[^_\n]+)_[^@\n]+@(?P<f5>[^_\n]+)_[^|\n]+\|[^_\n]+_[^/\n]+"
+    r"/G:[^_\n]+_[^%\n]+%[^_\n]+_[^_\n]+_[^/\n]+"
+    r"/H:[^_\n]+_[^/\n]+"
+    r"/I:[^-\n]+-[^@\n]+@(?P<i3>[^+\n]+)\+[^&\n]+&[^-\n]+-[^|\n]+\|[^+\n]+\+[^/\n]+"
+    r"/J:[^_\n]+_[^/\n]+"
+    r"/K:[^+\n]+\+[^-\n]+-[^/\n]+$",
+    re.MULTILINE,
+)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class _Label:
     """フルコンテキストラベルのサブセット。"""
 
@@ -103,29 +126,27 @@ class _Label:
     @classmethod
     def from_feature(cls, feature: str) -> Self:
         """OpenJTalk feature から _Label インスタンスを生成する"""
-        # フルコンテキストラベルの仕様は、http://hts.sp.nitech.ac.jp/?Download の HTS-2.3のJapanese tar.bz2 (126 MB)をダウンロードして、data/lab_format.pdfを見るとリストが見つかります。
-        # VOICEVOX ENGINE で利用されている属性: p3 phoneme / a2 moraIdx / f1 n_mora / f2 pos_accent / f3 疑問形 / f5 アクセント句Idx / i3 BreathGroupIdx
-        result = re.search(
-            r"^(?P<p1>.+?)\^(?P<p2>.+?)\-(?P<p3>.+?)\+(?P<p4>.+?)\=(?P<p5>.+?)"
-            r"/A\:(?P<a1>.+?)\+(?P<a2>.+?)\+(?P<a3>.+?)"
-            r"/B\:(?P<b1>.+?)\-(?P<b2>.+?)\_(?P<b3>.+?)"
-            r"/C\:(?P<c1>.+?)\_(?P<c2>.+?)\+(?P<c3>.+?)"
-            r"/D\:(?P<d1>.+?)\+(?P<d2>.+?)\_(?P<d3>.+?)"
-            r"/E\:(?P<e1>.+?)\_(?P<e2>.+?)\!(?P<e3>.+?)\_(?P<e4>.+?)\-(?P<e5>.+?)"
-            r"/F\:(?P<f1>.+?)\_(?P<f2>.+?)\#(?P<f3>.+?)\_(?P<f4>.+?)\@(?P<f5>.+?)\_(?P<f6>.+?)\|(?P<f7>.+?)\_(?P<f8>.+?)"
-            r"/G\:(?P<g1>.+?)\_(?P<g2>.+?)\%(?P<g3>.+?)\_(?P<g4>.+?)\_(?P<g5>.+?)"
-            r"/H\:(?P<h1>.+?)\_(?P<h2>.+?)"
-            r"/I\:(?P<i1>.+?)\-(?P<i2>.+?)\@(?P<i3>.+?)\+(?P<i4>.+?)\&(?P<i5>.+?)\-(?P<i6>.+?)\|(?P<i7>.+?)\+(?P<i8>.+?)"
-            r"/J\:(?P<j1>.+?)\_(?P<j2>.+?)"
-            r"/K\:(?P<k1>.+?)\+(?P<k2>.+?)\-(?P<k3>.+?)$",
-            feature,
-        )
+        result = _LABEL_PATTERN.fullmatch(feature)
         if result is None:
             raise ValueError(feature)
-        contexts = result.groupdict()
+        return cls._from_match(result)
+
+    @classmethod
+    def from_features(cls, features: list[str]) -> list[Self]:
+        """OpenJTalk feature 系列から _Label 系列を一括で生成する"""
+        # NOTE: 改行で連結した feature 系列を一度の走査で解析し、1 行 1 ラベルとして取り出す
+        matches = list(_LABEL_PATTERN.finditer("\n".join(features)))
+        if len(matches) != len(features):
+            # 不正な feature を特定して例外を送出させる
+            return [cls.from_feature(feature) for feature in features]
+        return [cls._from_match(match) for match in matches]
+
+    @classmethod
+    def _from_match(cls, result: re.Match[str]) -> Self:
+        """フルコンテキストラベルのパターンに一致した結果から _Label インスタンスを生成する"""
+        p, _mora_index, f1, _accent_position, f3, f5, i3 = result.groups()
 
         # 音素をバリデーションする
-        p = contexts["p3"]
         if _is_ojt_phoneme(p):
             if p == "xx":
                 raise OjtUnknownPhonemeError()
@@ -133,14 +154,12 @@ class _Label:
             raise NonOjtPhonemeError()
 
         # NOTE: pau と sil はアクセント句に属さないため、モーラインデックスが無い
-        _mora_index = contexts["a2"]
         if _mora_index == "xx":
             mora_index = None
         else:
             mora_index = int(_mora_index)
 
         # NOTE: pau と sil はアクセント句に属さないため、アクセント位置が無い
-        _accent_position = contexts["f2"]
         if _accent_position == "xx":
             accent_position = None
         else:
@@ -148,12 +167,12 @@ class _Label:
 
         return cls(
             phoneme=p,
-            is_pause=contexts["f1"] == "xx",
+            is_pause=f1 == "xx",
             mora_index=mora_index,
             accent_position=accent_position,
-            is_interrogative=contexts["f3"] == "1",
-            accent_phrase_index=contexts["f5"],
-            breath_group_index=contexts["i3"],
+            is_interrogative=f3 == "1",
+            accent_phrase_index=f5,
+            breath_group_index=i3,
         )
 
 
@@ -240,7 +259,7 @@ def full_context_labels_to_accent_phrases(
     full_context_labels: list[str],
 ) -> list[AccentPhrase]:
     """フルコンテキストラベルからアクセント句系列を生成する"""
-    all_labels = map(_Label.from_feature, full_context_labels)
+    all_labels = _Label.from_features(full_context_labels)
 
     pause_group_labels_list = [
         list(labels)
@@ -1,8 +1,10 @@
 """テキスト音声合成エンジン"""
 
 import copy
-import math
-from typing import Any, Final, Literal, TypeAlias
+from collections.abc import Iterator
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Final, Literal, Self, TypeAlias
 
 import numpy as np
 from numpy.typing import NDArray
@@ -10,10 +12,16 @@ from numpy.typing import NDArray
 from ..core.core_adapter import CoreAdapter, DeviceSupport
 from ..core.core_initializer import CoreManager
 from ..core.core_wrapper import CoreWrapper
+from ..core.model_residency import ModelResidencyStats
 from ..metas.metas import StyleId
+from ..metrics import stage_timer
 from ..model import AudioQuery
 from ..utility.core_version_utility import MOCK_CORE_VERSION, get_latest_version
-from .audio_postprocessing import raw_wave_to_output_wave
+from .accent_phrase_cache import accent_phrase_cache
+from .audio_postprocessing import (
+    raw_wave_chunks_to_output_wave_chunks,
+    raw_wave_to_output_wave,
+)
 from .kana_converter import parse_kana
 from .model import (
     AccentPhrase,
@@ -21,8 +29,9 @@ from .model import (
 )
 from .mora_mapping import mora_phonemes_to_mora_kana
 from .njd_feature_processor import text_to_full_context_labels
-from .phoneme import Phoneme
+from .phoneme import Phoneme, ids_to_onehot_matrix, phonemes_to_ids
 from .text_analyzer import full_context_labels_to_accent_phrases
+from .wave_cache import WaveCache, make_wave_cache_key
 
 # 疑問文語尾定数
 UPSPEAK_LENGTH = 0.15
@@ -68,11 +77,6 @@ def _create_one_hot(accent_phrase: AccentPhrase, index: int) -> NDArray[np.int64
     return onehot.astype(np.int64)
 
 
-def _generate_silence_mora(length: float) -> Mora:
-    """音の長さを指定して無音モーラを生成する。"""
-    return Mora(text="　", vowel="sil", vowel_length=length, pitch=0.0)
-
-
 def _apply_interrogative_upspeak(
     accent_phrases: list[AccentPhrase], enable_interrogative_upspeak: bool
 ) -> list[AccentPhrase]:
@@ -100,32 +104,95 @@ def _apply_interrogative_upspeak(
     return accent_phrases
 
 
-def _apply_prepost_silence(moras: list[Mora], query: AudioQuery) -> list[Mora]:
+def _generate_separator_mora() -> Mora:
+    """アクセント句系列の連結時に系列間へ挟む、音素長と音高を0で初期化した無音モーラを生成する。"""
+    return Mora(
+        text="、",
+        consonant=None,
+        consonant_length=None,
+        vowel="pau",
+        vowel_length=0,
+        pitch=0,
+    )
+
+
+@dataclass
+class _MoraColumns:
+    """
+    モーラ系列の列指向表現。
+
+    各配列の i 番目の要素が i 番目のモーラに対応する。子音が無いモーラの子音長は 0 として扱う。
+    """
+
+    consonant_ids: NDArray[np.int64]  # 子音の音素 ID。子音が無い場合は -1
+    consonant_lengths: NDArray[np.float64]  # 子音の長さ
+    vowel_ids: NDArray[np.int64]  # 母音の音素 ID
+    vowel_lengths: NDArray[np.float64]  # 母音の長さ
+    pitches: NDArray[np.float64]  # 音高
+    is_pause: NDArray[np.bool_]  # 母音が無音 `pau` か否か
+
+    @classmethod
+    def from_moras(cls, moras: list[Mora]) -> Self:
+        """モーラ系列から列指向表現を生成する。"""
+        has_consonant = np.array([bool(m.consonant) for m in moras], dtype=np.bool_)
+        consonant_ids = np.full(len(moras), -1, dtype=np.int64)
+        consonant_ids[has_consonant] = phonemes_to_ids(
+            [m.consonant for m in moras if m.consonant]
+        )
+        return cls(
+            consonant_ids=consonant_ids,
+            consonant_lengths=np.array(
+                [m.consonant_length or 0.0 for m in moras], dtype=np.float64
+            ),
+            vowel_ids=phonemes_to_ids([m.vowel for m in moras]),
+            vowel_lengths=np.array([m.vowel_length for m in moras], dtype=np.float64),
+            pitches=np.array([m.pitch for m in moras], dtype=np.float64),
+            is_pause=np.array([m.vowel == "pau" for m in moras], dtype=np.bool_),
+        )
+
+    def phoneme_mask(self) -> NDArray[np.bool_]:
+        """(子音, 母音) の組ごとに音素が存在するか否かを得る。shape = (モーラ数, 2)"""
+        has_consonant = self.consonant_ids != -1
+        return np.stack([has_consonant, np.ones_like(has_consonant)], axis=1)
+
+    def phoneme_ids(self) -> NDArray[np.int64]:
+        """モーラ系列を平坦化した音素ID系列を得る。"""
+        phoneme_ids = np.stack([self.consonant_ids, self.vowel_ids], axis=1)
+        return phoneme_ids[self.phoneme_mask()]
+
+
+def _apply_prepost_silence(moras: _MoraColumns, query: AudioQuery) -> _MoraColumns:
     """モーラ系列へ音声合成用のクエリがもつ前後無音（`prePhonemeLength` & `postPhonemeLength`）を付加する"""
-    pre_silence_moras = [_generate_silence_mora(query.prePhonemeLength)]
-    post_silence_moras = [_generate_silence_mora(query.postPhonemeLength)]
-    moras = pre_silence_moras + moras + post_silence_moras
-    return moras
+    silence_id = Phoneme("sil").id
+    return _MoraColumns(
+        consonant_ids=np.r_[-1, moras.consonant_ids, -1],
+        consonant_lengths=np.r_[0.0, moras.consonant_lengths, 0.0],
+        vowel_ids=np.r_[silence_id, moras.vowel_ids, silence_id],
+        vowel_lengths=np.r_[
+            query.prePhonemeLength, moras.vowel_lengths, query.postPhonemeLength
+        ],
+        pitches=np.r_[0.0, moras.pitches, 0.0],
+        # NOTE: 前後無音の母音は `sil` であり `pau` ではない
+        is_pause=np.r_[False, moras.is_pause, False],
+    )
 
 
-def _apply_speed_scale(moras: list[Mora], query: AudioQuery) -> list[Mora]:
+def _apply_speed_scale(moras: _MoraColumns, query: AudioQuery) -> _MoraColumns:
     """モーラ系列へ音声合成用のクエリがもつ話速スケール（`speedScale`）を適用する"""
-    for mora in moras:
-        mora.vowel_length /= query.speedScale
-        if mora.consonant_length:
-            mora.consonant_length /= query.speedScale
+    moras.vowel_lengths /= query.speedScale
+    moras.consonant_lengths /= query.speedScale
     return moras
 
 
 def _count_frame_per_unit(
-    moras: list[Mora],
+    moras: _MoraColumns,
 ) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
     """
     音素あたり・モーラあたりのフレーム長を算出する
 
     Parameters
     ----------
-    moras : list[Mora]
+    moras : _MoraColumns
         モーラ系列
 
     Returns
@@ -135,67 +202,53 @@ def _count_frame_per_unit(
     frame_per_mora : NDArray[np.int64]
         モーラあたりのフレーム長。端数丸め。shape = (Mora,)
     """
-    frame_per_phoneme: list[int] = []
-    frame_per_mora: list[int] = []
-    for mora in moras:
-        vowel_frames = _to_frame(mora.vowel_length)
-        consonant_frames = (
-            _to_frame(mora.consonant_length) if mora.consonant_length is not None else 0
-        )
-        mora_frames = (
-            vowel_frames + consonant_frames
-        )  # 音素ごとにフレーム長を算出し、和をモーラのフレーム長とする
+    vowel_frames = _to_frame(moras.vowel_lengths)
+    consonant_frames = _to_frame(moras.consonant_lengths)
 
-        if mora.consonant:
-            frame_per_phoneme += [consonant_frames]
-        frame_per_phoneme += [vowel_frames]
-        frame_per_mora += [mora_frames]
+    # 音素ごとにフレーム長を算出し、和をモーラのフレーム長とする
+    frame_per_mora = vowel_frames + consonant_frames
 
-    return (
-        np.array(frame_per_phoneme, dtype=np.int64),
-        np.array(frame_per_mora, dtype=np.int64),
-    )
+    # (子音, 母音) の順に並べ、子音が無いモーラの子音を除く
+    frame_per_phoneme = np.stack([consonant_frames, vowel_frames], axis=1)
+    return frame_per_phoneme[moras.phoneme_mask()], frame_per_mora
 
 
-def _to_frame(sec: float) -> int:
+def _to_frame(sec: NDArray[np.float64]) -> NDArray[np.int64]:
     FRAMERATE = 93.75  # 24000 / 256 [frame/sec]
     # NOTE: `round` は偶数丸め。移植時に取扱い注意。詳細は voicevox_engine#552
     sec_rounded: NDArray[np.float64] = np.round(sec * FRAMERATE)
-    return sec_rounded.astype(np.int32).item()
+    return sec_rounded.astype(np.int32).astype(np.int64)
 
 
-def _apply_pitch_scale(moras: list[Mora], query: AudioQuery) -> list[Mora]:
+def _apply_pitch_scale(moras: _MoraColumns, query: AudioQuery) -> _MoraColumns:
     """モーラ系列へ音声合成用のクエリがもつ音高スケール（`pitchScale`）を適用する"""
-    for mora in moras:
-        mora.pitch *= 2**query.pitchScale
+    moras.pitches *= 2**query.pitchScale
     return moras
 
 
-def _apply_pause_length(moras: list[Mora], query: AudioQuery) -> list[Mora]:
+def _apply_pause_length(moras: _MoraColumns, query: AudioQuery) -> _MoraColumns:
     """モーラ系列へ音声合成用のクエリがもつ無音時間（`pauseLength`）を適用する"""
     if query.pauseLength is not None:
-        for mora in moras:
-            if mora.vowel == "pau":
-                mora.vowel_length = query.pauseLength
+        moras.vowel_lengths[moras.is_pause] = query.pauseLength
     return moras
 
 
-def _apply_pause_length_scale(moras: list[Mora], query: AudioQuery) -> list[Mora]:
+def _apply_pause_length_scale(moras: _MoraColumns, query: AudioQuery) -> _MoraColumns:
     """モーラ系列へ音声合成用のクエリがもつ無音時間スケール（`pauseLengthScale`）を適用する"""
-    for mora in moras:
-        if mora.vowel == "pau":
-            mora.vowel_length *= query.pauseLengthScale
+    moras.vowel_lengths[moras.is_pause] *= query.pauseLengthScale
     return moras
 
 
-def _apply_intonation_scale(moras: list[Mora], query: AudioQuery) -> list[Mora]:
+def _apply_intonation_scale(moras: _MoraColumns, query: AudioQuery) -> _MoraColumns:
     """モーラ系列へ音声合成用のクエリがもつ抑揚スケール（`intonationScale`）を適用する"""
     # 有声音素 (f0>0) の平均値に対する乖離度をスケール
-    voiced = list(filter(lambda mora: mora.pitch > 0, moras))
-    mean_f0 = np.mean(list(map(lambda mora: mora.pitch, voiced))).item()
-    if mean_f0 != math.nan:  # 空リスト -> NaN
-        for mora in voiced:
-            mora.pitch = (mora.pitch - mean_f0) * query.intonationScale + mean_f0
+    voiced = moras.pitches > 0
+    if voiced.any():
+        voiced_pitches = moras.pitches[voiced]
+        mean_f0 = np.mean(voiced_pitches)
+        moras.pitches[voiced] = (
+            voiced_pitches - mean_f0
+        ) * query.intonationScale + mean_f0
     return moras
 
 
@@ -203,7 +256,7 @@ def _query_to_decoder_feature(
     query: AudioQuery,
 ) -> tuple[NDArray[np.float32], NDArray[np.float32]]:
     """音声合成用のクエリからフレームごとの音素 (shape=(フレーム長, 音素数)) と音高 (shape=(フレーム長,)) を得る"""
-    moras = to_flatten_moras(query.accent_phrases)
+    moras = _MoraColumns.from_moras(to_flatten_moras(query.accent_phrases))
 
     # 設定を適用する
     moras = _apply_prepost_silence(moras, query)
@@ -213,24 +266,65 @@ def _query_to_decoder_feature(
     moras = _apply_pitch_scale(moras, query)
     moras = _apply_intonation_scale(moras, query)
 
-    # 表現を変更する（音素クラス → 音素 onehot ベクトル、モーラクラス → 音高スカラ）
-    phoneme = np.stack([p.onehot for p in _to_flatten_phonemes(moras)])
-    f0 = np.array([mora.pitch for mora in moras], dtype=np.float32)
-
     # 時間スケールを変更する（音素・モーラ → フレーム）
     frame_per_phoneme, frame_per_mora = _count_frame_per_unit(moras)
-    phoneme = np.repeat(phoneme, frame_per_phoneme, axis=0)
-    f0 = np.repeat(f0, frame_per_mora)
+    frame_phoneme_ids = np.repeat(moras.phoneme_ids(), frame_per_phoneme)
+
+    # 表現を変更する（音素 ID → 音素 onehot ベクトル、モーラ音高 → フレーム音高）
+    phoneme = ids_to_onehot_matrix(frame_phoneme_ids)
+    f0 = np.repeat(moras.pitches.astype(np.float32), frame_per_mora)
 
     return phoneme, f0
 
 
+# ストリーミング合成で区間の前後に付加する、継ぎ目を滑らかにするための文脈フレーム長
+_STREAM_CONTEXT_FRAMES: Final = 32
+
+
+def _split_frames_at_pauses(phoneme: NDArray[np.float32]) -> list[tuple[int, int]]:
+    """
+    フレームごとの音素を文中の無音区間の中央で分割し、各区間の開始・終了フレームを得る。
+
+    Parameters
+    ----------
+    phoneme : NDArray[np.float32]
+        フレームごとの音素 onehot。shape = (フレーム長, 音素数)
+
+    Returns
+    -------
+    sections : list[tuple[int, int]]
+        区間ごとの開始フレームと終了フレーム（終了フレームを含まない）
+    """
+    n_frame = phoneme.shape[0]
+    is_pause = phoneme[:, Phoneme("pau").id] == 1
+    edges = np.diff(np.r_[False, is_pause, False].astype(np.int8))
+    pause_starts = np.flatnonzero(edges == 1)
+    pause_ends = np.flatnonzero(edges == -1)
+
+    # 前後無音は区切りに使わない
+    boundaries = [
+        (start + end) // 2
+        for start, end in zip(pause_starts, pause_ends, strict=True)
+        if 0 < start and end < n_frame
+    ]
+    frames = [0, *boundaries, n_frame]
+    return [
+        (start, end)
+        for start, end in zip(frames[:-1], frames[1:], strict=True)
+        if start < end
+    ]
+
+
 class TTSEngine:
     """音声合成器（core）の管理/実行/プロキシと音声合成フロー"""
 
-    def __init__(self, core: CoreWrapper):
+    def __init__(
+        self, core: CoreWrapper | CoreAdapter, wave_cache: WaveCache | None = None
+    ):
         super().__init__()
-        self._core = CoreAdapter(core)
+        # NOTE: 同じコアを利用するエンジン間で排他制御と推論呼び出しのスケジューリングを共有するため、アダプターを受け取れる
+        self._core = core if isinstance(core, CoreAdapter) else CoreAdapter(core)
+        self._wave_cache = wave_cache
 
     @property
     def default_sampling_rate(self) -> int:
@@ -242,6 +336,11 @@ class TTSEngine:
         """合成時に各デバイスが利用可能か否かの一覧を取得する。"""
         return self._core.supported_devices
 
+    @property
+    def core_version(self) -> str:
+        """合成に用いるコアのバージョンを取得する。"""
+        return self._core.version
+
     def update_length(
         self, accent_phrases: list[AccentPhrase], style_id: StyleId
     ) -> list[AccentPhrase]:
@@ -252,8 +351,8 @@ class TTSEngine:
         # 音素系列を抽出する
         phonemes = _to_flatten_phonemes(moras)
 
-        # 音素クラスから音素IDスカラへ表現を変換する
-        phoneme_ids = np.array([p.id for p in phonemes], dtype=np.int64)
+        # 音素IDスカラへ表現を変換する
+        phoneme_ids = _MoraColumns.from_moras(moras).phoneme_ids()
 
         # 音素ごとの長さを生成する
         phoneme_lengths = self._core.safe_yukarin_s_forward(phoneme_ids, style_id)
@@ -307,12 +406,9 @@ class TTSEngine:
         moras = to_flatten_moras(accent_phrases)
 
         # モーラ系列から子音ID系列・母音ID系列を抽出する
-        consonant_id_ints = [
-            Phoneme(mora.consonant).id if mora.consonant else -1 for mora in moras
-        ]
-        consonant_ids = np.array(consonant_id_ints, dtype=np.int64)
-        vowels = [Phoneme(mora.vowel) for mora in moras]
-        vowel_ids = np.array([p.id for p in vowels], dtype=np.int64)
+        mora_columns = _MoraColumns.from_moras(moras)
+        consonant_ids = mora_columns.consonant_ids
+        vowel_ids = mora_columns.vowel_ids
 
         # コアを用いてモーラ音高を生成する
         f0 = self._core.safe_yukarin_sa_forward(
@@ -326,8 +422,8 @@ class TTSEngine:
         )
 
         # 母音が無声であるモーラは音高を 0 とする
-        for i, p in enumerate(vowels):
-            if p.is_unvoiced_mora_tail():
+        for i, mora in enumerate(moras):
+            if Phoneme(mora.vowel).is_unvoiced_mora_tail():
                 f0[i] = 0
 
         # 更新する
@@ -344,6 +440,49 @@ class TTSEngine:
         accent_phrases = self.update_pitch(accent_phrases, style_id)
         return accent_phrases
 
+    def update_length_and_pitch_batch(
+        self, accent_phrases_list: list[list[AccentPhrase]], style_id: StyleId
+    ) -> list[list[AccentPhrase]]:
+        """複数のアクセント句系列に含まれる音素の長さとモーラの音高を、音素長・音高の推論をそれぞれ 1 回にまとめてスタイルに合わせて更新する。"""
+        # NOTE: 系列間に無音モーラを挟んで 1 つのアクセント句系列へ連結する。
+        #       無音モーラは各系列を単独で推論する際に付加される前後無音と同じ入力となる。
+        # NOTE: 連結後の系列は各系列とモーラを共有するため、連結後の系列の更新が各系列へ反映される
+        joined_accent_phrases: list[AccentPhrase] = []
+        for accent_phrases in accent_phrases_list:
+            if len(joined_accent_phrases) > 0 and len(accent_phrases) > 0:
+                last_accent_phrase = joined_accent_phrases[-1]
+                if last_accent_phrase.pause_mora is None:
+                    joined_accent_phrases[-1] = last_accent_phrase.model_copy(
+                        update={"pause_mora": _generate_separator_mora()}
+                    )
+            joined_accent_phrases += accent_phrases
+
+        self.update_length_and_pitch(joined_accent_phrases, style_id)
+        return accent_phrases_list
+
+    def _analyze_text(
+        self, text: str, enable_katakana_english: bool
+    ) -> list[AccentPhrase]:
+        """テキストを解析してアクセント句系列を生成する。音素長・モーラ音高は未設定である。"""
+        # NOTE: 解析中に辞書が更新された場合に古い解析結果をキャッシュしないよう、解析前に世代を取得する
+        generation = accent_phrase_cache.generation
+        accent_phrases = accent_phrase_cache.get(
+            text, enable_katakana_english, generation
+        )
+        if accent_phrases is None:
+            with stage_timer("text_analysis", core_version=self._core.version):
+                full_context_labels = text_to_full_context_labels(
+                    text, enable_katakana_english=enable_katakana_english
+                )
+            with stage_timer("label_parsing", core_version=self._core.version):
+                accent_phrases = full_context_labels_to_accent_phrases(
+                    full_context_labels
+                )
+            accent_phrase_cache.put(
+                text, enable_katakana_english, generation, accent_phrases
+            )
+        return accent_phrases
+
     def create_accent_phrases(
         self,
         text: str,
@@ -351,13 +490,22 @@ class TTSEngine:
         enable_katakana_english: bool,
     ) -> list[AccentPhrase]:
         """テキストからアクセント句系列を生成し、スタイルIDに基づいてその音素長・モーラ音高を更新する"""
-        full_context_labels = text_to_full_context_labels(
-            text, enable_katakana_english=enable_katakana_english
-        )
-        accent_phrases = full_context_labels_to_accent_phrases(full_context_labels)
+        accent_phrases = self._analyze_text(text, enable_katakana_english)
         accent_phrases = self.update_length_and_pitch(accent_phrases, style_id)
         return accent_phrases
 
+    def create_accent_phrases_batch(
+        self,
+        texts: list[str],
+        style_id: StyleId,
+        enable_katakana_english: bool,
+    ) -> list[list[AccentPhrase]]:
+        """複数のテキストからそれぞれアクセント句系列を生成し、スタイルIDに基づいてそれらの音素長・モーラ音高をまとめて更新する"""
+        accent_phrases_list = [
+            self._analyze_text(text, enable_katakana_english) for text in texts
+        ]
+        return self.update_length_and_pitch_batch(accent_phrases_list, style_id)
+
     def create_accent_phrases_from_kana(
         self, kana: str, style_id: StyleId
     ) -> list[AccentPhrase]:
@@ -373,17 +521,85 @@ class TTSEngine:
         enable_interrogative_upspeak: bool,
     ) -> NDArray[np.float32]:
         """音声合成用のクエリ・スタイルID・疑問文語尾自動調整フラグに基づいて音声波形を生成する"""
+        if self._wave_cache is not None:
+            cache_key = make_wave_cache_key(
+                query, style_id, self._core.version, enable_interrogative_upspeak
+            )
+            cached_wave = self._wave_cache.get(cache_key)
+            if cached_wave is not None:
+                return cached_wave
+
         # モーフィング時などに同一参照のqueryで複数回呼ばれる可能性があるので、元の引数のqueryに破壊的変更を行わない
         query = copy.deepcopy(query)
         query.accent_phrases = _apply_interrogative_upspeak(
             query.accent_phrases, enable_interrogative_upspeak
         )
 
-        phoneme, f0 = _query_to_decoder_feature(query)
+        with stage_timer("decoder_feature", style_id, self._core.version):
+            phoneme, f0 = _query_to_decoder_feature(query)
         raw_wave, sr_raw_wave = self._core.safe_decode_forward(phoneme, f0, style_id)
-        wave = raw_wave_to_output_wave(query, raw_wave, sr_raw_wave)
+        with stage_timer("postprocess", style_id, self._core.version):
+            wave = raw_wave_to_output_wave(query, raw_wave, sr_raw_wave)
+
+        if self._wave_cache is not None:
+            wave = self._wave_cache.put(cache_key, wave)
         return wave
 
+    def synthesize_wave_stream(
+        self,
+        query: AudioQuery,
+        style_id: StyleId,
+        enable_interrogative_upspeak: bool,
+    ) -> Iterator[NDArray[np.float32]]:
+        """
+        音声合成用のクエリ・スタイルID・疑問文語尾自動調整フラグに基づいて、文中の無音区間ごとに音声波形を逐次生成する。
+
+        各区間は前後の文脈を付加してデコードされ、文脈に相当する波形は破棄される。
+        不正な入力に対するエラーを呼び出し時点で送出するため、最初の区間は呼び出し時にデコードされる。
+        """
+        if self._wave_cache is not None:
+            cache_key = make_wave_cache_key(
+                query, style_id, self._core.version, enable_interrogative_upspeak
+            )
+            cached_wave = self._wave_cache.get(cache_key)
+            if cached_wave is not None:
+                return iter([cached_wave])
+
+        query = copy.deepcopy(query)
+        query.accent_phrases = _apply_interrogative_upspeak(
+            query.accent_phrases, enable_interrogative_upspeak
+        )
+        with stage_timer("decoder_feature", style_id, self._core.version):
+            phoneme, f0 = _query_to_decoder_feature(query)
+        n_frame = phoneme.shape[0]
+        sections = _split_frames_at_pauses(phoneme)
+        if len(sections) == 0:
+            empty_wave = np.zeros(0, dtype=np.float32)
+            sr_wave = self._core.default_sampling_rate
+            return iter([raw_wave_to_output_wave(query, empty_wave, sr_wave)])
+
+        def decode_section(start: int, end: int) -> NDArray[np.float32]:
+            context_start = max(start - _STREAM_CONTEXT_FRAMES, 0)
+            context_end = min(end + _STREAM_CONTEXT_FRAMES, n_frame)
+            raw_wave, _ = self._core.safe_decode_forward(
+                phoneme[context_start:context_end],
+                f0[context_start:context_end],
+                style_id,
+            )
+            sample_per_frame = raw_wave.shape[0] // (context_end - context_start)
+            wave_start = (start - context_start) * sample_per_frame
+            wave_end = (end - context_start) * sample_per_frame
+            return raw_wave[wave_start:wave_end]
+
+        first_raw_wave = decode_section(*sections[0])
+        raw_waves = chain(
+            [first_raw_wave],
+            (decode_section(start, end) for start, end in sections[1:]),
+        )
+        return raw_wave_chunks_to_output_wave_chunks(
+            query, raw_waves, self._core.default_sampling_rate
+        )
+
     def initialize_synthesis(self, style_id: StyleId, skip_reinit: bool) -> None:
         """指定されたスタイル ID に関する合成機能を初期化する。既に初期化されていた場合は引数に応じて再初期化する。"""
         self._core.initialize_style_id_synthesis(style_id, skip_reinit=skip_reinit)
@@ -392,6 +608,19 @@ class TTSEngine:
         """指定されたスタイル ID に関する合成機能が初期化済みか否かを取得する。"""
         return self._core.is_initialized_style_id_synthesis(style_id)
 
+    def pin_synthesis(self, style_id: StyleId) -> None:
+        """指定されたスタイル ID に関する合成機能を初期化し、メモリ上限による解放の対象外にする。"""
+        self._core.pin_style_id_synthesis(style_id)
+
+    def unpin_synthesis(self, style_id: StyleId) -> None:
+        """指定されたスタイル ID に関する合成機能を、メモリ上限による解放の対象に戻す。"""
+        self._core.unpin_style_id_synthesis(style_id)
+
+    @property
+    def model_residency(self) -> ModelResidencyStats:
+        """音声合成モデルの常駐状況を取得する。"""
+        return self._core.residency_stats()
+
 
 class TTSEngineNotFound(Exception):
     """TTSEngine が見つからないエラー"""
@@ -439,7 +668,9 @@ class TTSEngineManager:
             raise TTSEngineNotFound(version=version)
 
 
-def make_tts_engines_from_cores(core_manager: CoreManager) -> TTSEngineManager:
+def make_tts_engines_from_cores(
+    core_manager: CoreManager, wave_cache: WaveCache | None = None
+) -> TTSEngineManager:
     """コア一覧からTTSエンジン一覧を生成する"""
     tts_engines = TTSEngineManager()
     for ver, core in core_manager.items():
@@ -448,5 +679,5 @@ def make_tts_engines_from_cores(core_manager: CoreManager) -> TTSEngineManager:
 
             tts_engines.register_engine(MockTTSEngine(), ver)
         else:
-            tts_engines.register_engine(TTSEngine(core.core), ver)
+            tts_engines.register_engine(TTSEngine(core, wave_cache), ver)
     return tts_engines
@@ -0,0 +1,81 @@
+"""音声波形を WAV 形式へエンコードする。"""
+
+import io
+import struct
+from typing import Any, Final
+
+import numpy as np
+import soundfile
+from numpy.typing import NDArray
+
+from ..metrics import stage_timer
+
+_BITS_PER_SAMPLE: Final = 16
+
+# NOTE: 全体長が未確定のストリームであることを示す慣例的な値
+_UNKNOWN_CHUNK_SIZE: Final = 0xFFFFFFFF
+
+
+def encode_wav(wave: NDArray[np.floating[Any]], sampling_rate: int) -> memoryview:
+    """
+    音声波形を 16bit PCM の WAV 形式へメモリ上でエンコードする。
+
+    Parameters
+    ----------
+    wave : NDArray[np.floating[Any]]
+        音声波形。shape = (サンプル長,) あるいは (サンプル長, チャンネル数)
+    sampling_rate : int
+        サンプリングレート
+
+    Returns
+    -------
+    wav : memoryview
+        WAV 形式のバイト列。エンコード先バッファの複製を避けるためビューとして返す
+    """
+    with stage_timer("wav_encoding"):
+        buffer = io.BytesIO()
+        soundfile.write(buffer, wave, sampling_rate, format="WAV")
+    return buffer.getbuffer()
+
+
+def wav_header_for_stream(sampling_rate: int, stereo: bool) -> bytes:
+    """
+    全体長が未確定な 16bit PCM 音声ストリーム用の WAV ヘッダーを生成する。
+
+    RIFF チャンクと data チャンクのサイズには未確定を示す最大値が設定される。
+    """
+    n_channels = 2 if stereo else 1
+    block_align = n_channels * _BITS_PER_SAMPLE // 8
+    byte_rate = sampling_rate * block_align
+    return (
+        struct.pack("<4sI4s", b"RIFF", _UNKNOWN_CHUNK_SIZE, b"WAVE")
+        + struct.pack(
+            "<4sIHHIIHH",
+            b"fmt ",
+            16,
+            1,  # リニア PCM
+            n_channels,
+            sampling_rate,
+            byte_rate,
+            block_align,
+            _BITS_PER_SAMPLE,
+        )
+        + struct.pack("<4sI", b"data", _UNKNOWN_CHUNK_SIZE)
+    )
+
+
+def wave_to_pcm_bytes(wave: NDArray[np.float32], sampling_rate: int) -> bytes:
+    """音声波形を 16bit リトルエンディアンの PCM バイト列へ変換する。"""
+    if wave.shape[0] == 0:
+        return b""
+    # NOTE: 数値変換を WAV 出力（`soundfile.write`）と揃えるため soundfile で変換する
+    buffer = io.BytesIO()
+    soundfile.write(
+        buffer,
+        wave,
+        sampling_rate,
+        format="RAW",
+        subtype="PCM_16",
+        endian="LITTLE",
+    )
+    return buffer.getvalue()
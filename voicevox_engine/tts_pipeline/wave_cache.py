@@ -0,0 +1,287 @@
+"""音声波形のキャッシュ"""
+
+import hashlib
+import json
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import uuid4
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..metas.metas import StyleId
+from ..model import AudioQuery
+
+# キャッシュキーの形式のバージョン。キーの生成方法を変更した場合は更新する。
+_KEY_FORMAT_VERSION = 1
+
+# ディスクキャッシュのファイル拡張子
+_DISK_CACHE_SUFFIX = ".npy"
+# ディスクキャッシュへ書き込み中の一時ファイルの拡張子
+_DISK_CACHE_TMP_SUFFIX = ".tmp"
+
+
+def make_wave_cache_key(
+    query: AudioQuery,
+    style_id: StyleId,
+    core_version: str,
+    enable_interrogative_upspeak: bool,
+) -> str:
+    """音声合成の入力から、内容に対して一意なキャッシュキーを生成する。"""
+    # NOTE: `kana` は読み取り専用であり合成結果に影響しないため除外する
+    canonical = json.dumps(
+        [
+            _KEY_FORMAT_VERSION,
+            query.model_dump(mode="json", exclude={"kana"}),
+            style_id,
+            core_version,
+            enable_interrogative_upspeak,
+        ],
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class WaveCacheStats:
+    """音声波形キャッシュの統計情報"""
+
+    memory_hits: int  # メモリ上のキャッシュにヒットした回数
+    disk_hits: int  # ディスク上のキャッシュにヒットした回数
+    misses: int  # キャッシュにヒットしなかった回数
+    memory_evictions: int  # メモリ上のキャッシュから追い出された波形の数
+    disk_evictions: int  # ディスク上のキャッシュから追い出された波形の数
+    memory_entries: int  # メモリ上にキャッシュされた波形の数
+    memory_bytes: int  # メモリ上にキャッシュされた波形の総バイト数
+    disk_entries: int  # ディスク上にキャッシュされた波形の数
+    disk_bytes: int  # ディスク上にキャッシュされた波形の総バイト数
+
+
+class WaveCache:
+    """
+    音声波形のキャッシュ。
+
+    メモリ上のキャッシュとディスク上のキャッシュの 2 層からなり、いずれも総バイト数の上限を超えると最も長く使われていない波形から追い出す。
+    キャッシュされた波形は書き込み不可の配列として返される。
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int,
+        disk_dir: Path | None = None,
+        max_disk_bytes: int = 0,
+    ) -> None:
+        """
+        音声波形のキャッシュを生成する。
+
+        Parameters
+        ----------
+        max_memory_bytes : int
+            メモリ上にキャッシュする波形の総バイト数の上限
+        disk_dir : Path | None
+            ディスクキャッシュの保存先ディレクトリ。None の場合はディスクキャッシュを使わない
+        max_disk_bytes : int
+            ディスク上にキャッシュする波形の総バイト数の上限
+        """
+        self._max_memory_bytes = max_memory_bytes
+        self._disk_dir = disk_dir
+        self._max_disk_bytes = max_disk_bytes
+
+        self._lock = threading.Lock()
+
+        # 使われた順に並ぶ（末尾が最新）キャッシュキーと波形・バイト数の対応表
+        self._memory: OrderedDict[str, NDArray[np.float32]] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        # ディスクへ書き込み中のキャッシュキー
+        self._disk_writing: set[str] = set()
+        # 追い出され、ディスクからの削除を待つキャッシュキー
+        self._disk_removing: set[str] = set()
+
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._memory_evictions = 0
+        self._disk_evictions = 0
+
+        if self._disk_dir is not None:
+            self._disk_dir.mkdir(parents=True, exist_ok=True)
+            self._load_disk_index()
+
+    def _load_disk_index(self) -> None:
+        """
+        ディスクキャッシュの保存先ディレクトリから既存の波形を読み込み、最終使用時刻の順に並べる。
+
+        書き込みの途中で中断されて残った一時ファイルは削除する。
+        """
+        assert self._disk_dir is not None
+        for tmp_path in self._disk_dir.glob(f"*{_DISK_CACHE_TMP_SUFFIX}"):
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                continue
+        entries: list[tuple[float, str, int]] = []
+        for path in self._disk_dir.glob(f"*{_DISK_CACHE_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._remove_disk(self._evict_disk())
+
+    def _disk_path(self, key: str) -> Path:
+        assert self._disk_dir is not None
+        return self._disk_dir / f"{key}{_DISK_CACHE_SUFFIX}"
+
+    def get(self, key: str) -> NDArray[np.float32] | None:
+        """キャッシュキーに対応する波形を取得する。キャッシュされていない場合は None を返す。"""
+        with self._lock:
+            wave = self._memory.get(key)
+            if wave is not None:
+                self._memory.move_to_end(key)
+                self._memory_hits += 1
+                return wave
+            if key not in self._disk:
+                self._misses += 1
+                return None
+
+        # NOTE: ディスクの読み込み中に他のスレッドのキャッシュ操作を妨げないよう、ロックの外で読み込む
+        wave = self._read_disk(key)
+
+        with self._lock:
+            if wave is None:
+                # 読み込めない波形はキャッシュから除外する
+                size = self._disk.pop(key, None)
+                if size is not None:
+                    self._disk_bytes -= size
+                self._misses += 1
+                return None
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self._disk_hits += 1
+            self._put_memory(key, wave)
+            return wave
+
+    def put(self, key: str, wave: NDArray[np.float32]) -> NDArray[np.float32]:
+        """キャッシュキーに対応する波形をキャッシュし、キャッシュされた（書き込み不可の）波形を返す。"""
+        wave = np.array(wave, copy=True)
+        wave.setflags(write=False)
+        with self._lock:
+            self._put_memory(key, wave)
+            # NOTE: 削除待ちの波形を書き込むと、書き込んだファイルが削除されうるため書き込まない
+            if (
+                self._disk_dir is None
+                or key in self._disk
+                or key in self._disk_writing
+                or key in self._disk_removing
+            ):
+                return wave
+            # 同じ波形を複数のスレッドが重複して書き込まないよう、書き込み中として予約する
+            self._disk_writing.add(key)
+
+        # NOTE: ディスクへの書き込み中に他のスレッドのキャッシュ操作を妨げないよう、ロックの外で書き込む
+        size = self._write_disk(key, wave)
+
+        with self._lock:
+            self._disk_writing.discard(key)
+            if size is None or key in self._disk:
+                return wave
+            self._disk[key] = size
+            self._disk_bytes += size
+            evicted = self._evict_disk()
+        self._remove_disk(evicted)
+        return wave
+
+    def _put_memory(self, key: str, wave: NDArray[np.float32]) -> None:
+        """波形をメモリ上のキャッシュへ追加し、上限を超えた分を追い出す。"""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        # 上限を超える巨大な波形はメモリ上にキャッシュしない
+        if wave.nbytes > self._max_memory_bytes:
+            return
+        self._memory[key] = wave
+        self._memory_bytes += wave.nbytes
+        while self._memory_bytes > self._max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+            self._memory_evictions += 1
+
+    def _read_disk(self, key: str) -> NDArray[np.float32] | None:
+        """ディスク上のキャッシュから波形を読み込む。読み込めない場合は None を返す。"""
+        path = self._disk_path(key)
+        try:
+            wave: NDArray[np.float32] = np.load(path, allow_pickle=False)
+            # 最終使用時刻を更新し、再起動後も追い出し順序を保つ
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        wave.setflags(write=False)
+        return wave
+
+    def _write_disk(self, key: str, wave: NDArray[np.float32]) -> int | None:
+        """波形をディスク上のキャッシュへ書き込み、そのバイト数を返す。書き込めない場合は None を返す。"""
+        path = self._disk_path(key)
+        # NOTE: 書き込み途中のファイルが読まれないよう、一時ファイルへ書き込んでから置き換える
+        tmp_path = path.with_name(f"{key}-{uuid4()}{_DISK_CACHE_TMP_SUFFIX}")
+        try:
+            with open(tmp_path, mode="wb") as f:
+                np.save(f, wave, allow_pickle=False)
+            os.replace(tmp_path, path)
+            return path.stat().st_size
+        except OSError:
+            msg = "音声波形のディスクキャッシュへの書き込みに失敗しました。"
+            warnings.warn(msg, stacklevel=1)
+            tmp_path.unlink(missing_ok=True)
+            return None
+
+    def _evict_disk(self) -> list[str]:
+        """
+        ディスク上のキャッシュの索引から上限を超えた分を追い出し、削除すべきキャッシュキーを返す。
+
+        追い出したキャッシュキーは、`_remove_disk()` で削除されるまで削除待ちとして予約される。
+        """
+        evicted: list[str] = []
+        while self._disk_bytes > self._max_disk_bytes and len(self._disk) > 0:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self._disk_evictions += 1
+            self._disk_removing.add(key)
+            evicted.append(key)
+        return evicted
+
+    def _remove_disk(self, keys: list[str]) -> None:
+        """ディスク上のキャッシュから波形のファイルを削除し、削除待ちの予約を解除する。"""
+        for key in keys:
+            try:
+                self._disk_path(key).unlink(missing_ok=True)
+            except OSError:
+                msg = "音声波形のディスクキャッシュの削除に失敗しました。"
+                warnings.warn(msg, stacklevel=1)
+        with self._lock:
+            self._disk_removing.difference_update(keys)
+
+    def stats(self) -> WaveCacheStats:
+        """キャッシュの統計情報を取得する。"""
+        with self._lock:
+            return WaveCacheStats(
+                memory_hits=self._memory_hits,
+                disk_hits=self._disk_hits,
+                misses=self._misses,
+                memory_evictions=self._memory_evictions,
+                disk_evictions=self._disk_evictions,
+                memory_entries=len(self._memory),
+                memory_bytes=self._memory_bytes,
+                disk_entries=len(self._disk),
+                disk_bytes=self._disk_bytes,
+            )
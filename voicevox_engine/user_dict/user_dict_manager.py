@@ -11,6 +11,7 @@ from uuid import UUID, uuid4
 import pyopenjtalk
 from pydantic import TypeAdapter
 
+from ..tts_pipeline.accent_phrase_cache import accent_phrase_cache
 from ..utility.path_utility import get_save_dir, resource_root
 from .model import UserDictWord
 from .user_dict_word import (
@@ -216,6 +217,9 @@ class UserDictionary:
                 str(tmp_compiled_path.resolve(strict=True))
             )  # NOTE: resolveによりコンパイル実行時でも相対パスを正しく認識できる
 
+            # 古い辞書に基づくテキスト解析結果を破棄
+            accent_phrase_cache.invalidate()
+
         except Exception as e:
             raise e
 
@@ -0,0 +1,46 @@
+"""ZIP 形式に関する utility"""
+
+import zipfile
+from collections.abc import Iterable, Iterator
+
+
+class _ChunkSink:
+    """書き込まれたバイト列を取り出されるまで保持する、シーク不可能な書き込み先"""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes, /) -> int:
+        """バイト列を書き込む。"""
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        """何もしない。`zipfile` から呼ばれるため定義する。"""
+        pass
+
+    def close(self) -> None:
+        """何もしない。`zipfile` から呼ばれるため定義する。"""
+        pass
+
+    def pop(self) -> bytes:
+        """これまでに書き込まれたバイト列を取り出す。"""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries: Iterable[tuple[str, bytes | memoryview]]) -> Iterator[bytes]:
+    """
+    ファイル名とデータの組を順に ZIP 形式へ書き込み、書き込まれたバイト列を逐次生成する。
+
+    ZIP 全体を一時ファイルやメモリ上へ構築せず、エントリを書き込むたびにそのバイト列を生成する。
+    シーク不可能な書き込み先を用いるため、各エントリのサイズと CRC はデータ記述子に記録される。
+    """
+    sink = _ChunkSink()
+    # NOTE: 書き込み先がシーク不可能なことを `zipfile` が検出し、ストリーミング用の形式で書き込む
+    with zipfile.ZipFile(sink, mode="w") as zip_file:
+        for name, data in entries:
+            zip_file.writestr(name, data)
+            yield sink.pop()
+    yield sink.pop()